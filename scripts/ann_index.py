@@ -0,0 +1,167 @@
+"""
+근사 최근접 이웃(ANN) 인덱스 - IVF (inverted file), 순수 NumPy
+
+1. 정규화한 임베딩으로 구면 k-means를 돌려 nlist개의 중심(centroid)을 만듭니다.
+2. 각 글을 가장 가까운 중심의 리스트에 넣고, 리스트 순서대로 벡터를 재배열합니다.
+3. 검색할 때는 쿼리와 가까운 nprobe개 리스트의 벡터만 내적으로 비교합니다.
+   (그 리스트들의 후보가 k개보다 적으면 다음으로 가까운 리스트를 이어서 봅니다)
+
+어떤 쿼리 벡터(다른 글, 자유 텍스트 임베딩, 초안 등)든 임의의 k로 검색할 수 있습니다.
+
+저장 파일: public/data/ann-index.npz
+  - centroids: (nlist, D) float32
+  - offsets:   (nlist + 1,) 리스트 경계
+  - rows:      리스트 순서로 정렬된 원래 행 번호
+  - vectors:   rows 순서로 재배열한 정규화 벡터 (float16)
+  - ids:       원래 행 순서의 post_id
+"""
+
+from pathlib import Path
+
+import numpy as np
+
+from similarity import normalize
+
+ANN_INDEX_NPZ = 'ann-index.npz'
+DEFAULT_NPROBE = 8
+
+
+def default_nlist(n):
+    """리스트 수 기본값 (~4·√N)"""
+    return max(1, min(n, int(4 * np.sqrt(n))))
+
+
+def spherical_kmeans(vectors, nlist, n_iter=20, sample_size=None, block_size=4096, seed=0):
+    """정규화 벡터에 대한 구면 k-means -> (nlist, D) 중심
+
+    sample_size개만 샘플링해서 학습하므로 N이 커져도 비용이 제한됩니다.
+    """
+    rng = np.random.default_rng(seed)
+    n = len(vectors)
+    sample_size = sample_size or min(n, nlist * 64)
+    sample = vectors[rng.choice(n, size=min(n, sample_size), replace=False)]
+    sample = np.asarray(sample, dtype=np.float32)
+    centroids = sample[rng.choice(len(sample), size=nlist, replace=False)].copy()
+
+    for _ in range(n_iter):
+        assign = assign_lists(sample, centroids, block_size)
+        sums = np.zeros_like(centroids)
+        np.add.at(sums, assign, sample)
+        counts = np.bincount(assign, minlength=nlist)
+
+        # 빈 리스트는 임의의 샘플로 다시 채움
+        empty = np.flatnonzero(counts == 0)
+        if len(empty):
+            sums[empty] = sample[rng.choice(len(sample), size=len(empty), replace=False)]
+        centroids = normalize(sums)
+
+    return centroids
+
+
+def assign_lists(vectors, centroids, block_size=4096):
+    """각 벡터의 가장 가까운 중심 번호"""
+    assign = np.empty(len(vectors), dtype=np.int64)
+    for start in range(0, len(vectors), block_size):
+        block = np.asarray(vectors[start:start + block_size], dtype=np.float32)
+        assign[start:start + block_size] = np.argmax(block @ centroids.T, axis=1)
+    return assign
+
+
+class IVFIndex:
+    """IVF 인덱스 (내적 = 코사인 유사도)"""
+
+    def __init__(self, centroids, offsets, rows, vectors, post_ids):
+        self.centroids = np.asarray(centroids, dtype=np.float32)
+        self.offsets = offsets
+        self.rows = rows
+        self.vectors = vectors
+        self.post_ids = list(post_ids)
+        self.row_of = {post_id: i for i, post_id in enumerate(self.post_ids)}
+        # 원래 행 -> 재배열 위치 (글 id로 검색할 때 사용)
+        self.position = np.empty(len(rows), dtype=np.int64)
+        self.position[rows] = np.arange(len(rows))
+
+    @property
+    def nlist(self):
+        return len(self.centroids)
+
+    @classmethod
+    def build(cls, embeddings, post_ids, nlist=None, n_iter=20, seed=0,
+              dtype=np.float16):
+        normed = normalize(embeddings)
+        nlist = nlist or default_nlist(len(normed))
+        centroids = spherical_kmeans(normed, nlist, n_iter=n_iter, seed=seed)
+        assign = assign_lists(normed, centroids)
+
+        rows = np.argsort(assign, kind='stable')
+        counts = np.bincount(assign, minlength=nlist)
+        offsets = np.concatenate([[0], np.cumsum(counts)]).astype(np.int64)
+        vectors = normed[rows].astype(dtype)
+        return cls(centroids, offsets, rows, vectors, post_ids)
+
+    def save(self, path):
+        path = Path(path)
+        tmp_path = path.with_suffix('.tmp.npz')
+        np.savez(
+            tmp_path,
+            centroids=self.centroids,
+            offsets=self.offsets,
+            rows=self.rows,
+            vectors=self.vectors,
+            ids=np.array(self.post_ids, dtype=str),
+        )
+        tmp_path.replace(path)
+
+    @classmethod
+    def load(cls, path):
+        data = np.load(path, allow_pickle=False)
+        return cls(
+            data['centroids'], data['offsets'], data['rows'],
+            data['vectors'], [str(i) for i in data['ids']],
+        )
+
+    def search(self, query, k=10, nprobe=DEFAULT_NPROBE, exclude=None):
+        """쿼리 벡터와 가장 비슷한 k개 -> [(post_id, score), ...]
+
+        exclude: 결과에서 뺄 원래 행 번호 (자기 자신 등)
+        """
+        query = np.asarray(query, dtype=np.float32).ravel()
+        query = query / (np.linalg.norm(query) or 1.0)
+
+        # 중심 순서대로 nprobe개를 보고, 후보가 k개보다 적으면 k개가 모일 때까지 더 봄
+        order = np.argsort(-(self.centroids @ query), kind='stable')
+        sizes = np.diff(self.offsets)[order]
+        needed = k + (exclude is not None)
+        enough = np.searchsorted(np.cumsum(sizes), needed) + 1
+        probe = order[:min(self.nlist, max(nprobe, enough))]
+
+        positions = np.concatenate([
+            np.arange(self.offsets[c], self.offsets[c + 1]) for c in probe
+        ])
+        if exclude is not None:
+            positions = positions[self.rows[positions] != exclude]
+        if len(positions) == 0:
+            return []
+
+        scores = self.vectors[positions].astype(np.float32) @ query
+        k = min(k, len(positions))
+        top = np.argpartition(-scores, k - 1)[:k]
+        top = top[np.argsort(-scores[top], kind='stable')]
+        return [(self.post_ids[self.rows[positions[i]]], float(scores[i])) for i in top]
+
+    def search_id(self, post_id, k=10, nprobe=DEFAULT_NPROBE):
+        """저장된 글과 비슷한 k개 (자기 자신 제외)"""
+        row = self.row_of.get(post_id)
+        if row is None:
+            return []
+        query = self.vectors[self.position[row]]
+        return self.search(query, k=k, nprobe=nprobe, exclude=row)
+
+
+def exact_search(normed, query, k=10, exclude=None):
+    """브루트포스 정답 (벤치마크용) -> 행 번호 배열"""
+    scores = normed @ np.asarray(query, dtype=np.float32)
+    if exclude is not None:
+        scores[exclude] = -np.inf
+    top = np.argpartition(-scores, k - 1)[:k]
+    return top[np.argsort(-scores[top], kind='stable')]
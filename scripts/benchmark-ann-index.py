@@ -0,0 +1,77 @@
+#!/usr/bin/env python3
+"""
+ANN 인덱스 벤치마크 - recall@10 / 지연 시간 (브루트포스 대비)
+
+사용법:
+  python scripts/benchmark-ann-index.py                  # public/data/embeddings.npy 사용
+  python scripts/benchmark-ann-index.py --synthetic 20000  # 합성 데이터
+  python scripts/benchmark-ann-index.py --nprobe 1 4 8 16 --queries 500
+"""
+
+import argparse
+import time
+from pathlib import Path
+
+import numpy as np
+
+from ann_index import IVFIndex, exact_search
+from benchmark_utils import percentile_ms, synthetic_embeddings
+from embedding_store import load_embeddings
+from similarity import normalize
+
+PROJECT_DIR = Path(__file__).parent.parent
+OUTPUT_DIR = PROJECT_DIR / 'public/data'
+
+
+def main():
+    parser = argparse.ArgumentParser(description='ANN 인덱스 recall/지연 벤치마크')
+    parser.add_argument('--synthetic', type=int, default=0, help='합성 데이터 글 수')
+    parser.add_argument('--queries', type=int, default=300)
+    parser.add_argument('--k', type=int, default=10)
+    parser.add_argument('--nlist', type=int, default=None)
+    parser.add_argument('--nprobe', type=int, nargs='+', default=[1, 2, 4, 8, 16, 32])
+    args = parser.parse_args()
+
+    if args.synthetic:
+        embeddings = synthetic_embeddings(args.synthetic)
+        post_ids = [str(i) for i in range(len(embeddings))]
+    else:
+        post_ids, embeddings = load_embeddings(OUTPUT_DIR)
+        embeddings = np.asarray(embeddings, dtype=np.float32)
+    normed = normalize(embeddings)
+    n = len(post_ids)
+
+    print(f"📐 {n}개 글, {embeddings.shape[1]}차원")
+
+    start = time.perf_counter()
+    index = IVFIndex.build(embeddings, post_ids, nlist=args.nlist)
+    print(f"   인덱스 생성: {time.perf_counter() - start:.2f}s (nlist={index.nlist})")
+
+    rng = np.random.default_rng(1)
+    queries = rng.choice(n, size=min(args.queries, n), replace=False)
+
+    exact = {}
+    latencies = []
+    for row in queries:
+        t = time.perf_counter()
+        exact[row] = exact_search(normed, normed[row], k=args.k, exclude=row)
+        latencies.append(time.perf_counter() - t)
+    print(f"\n   브루트포스     p50 {percentile_ms(latencies, 50):.3f}ms  "
+          f"p95 {percentile_ms(latencies, 95):.3f}ms")
+
+    for nprobe in args.nprobe:
+        latencies = []
+        hits = 0
+        for row in queries:
+            t = time.perf_counter()
+            result = index.search_id(post_ids[row], k=args.k, nprobe=nprobe)
+            latencies.append(time.perf_counter() - t)
+            truth = {post_ids[j] for j in exact[row]}
+            hits += len(truth & {post_id for post_id, _ in result})
+        recall = hits / (len(queries) * args.k)
+        print(f"   nprobe={nprobe:<4} recall@{args.k} {recall:.3f}  "
+              f"p50 {percentile_ms(latencies, 50):.3f}ms  p95 {percentile_ms(latencies, 95):.3f}ms")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,77 @@
+#!/usr/bin/env python3
+"""
+임베딩 인코더 벤치마크 - 워커 수 / 배치 크기 / 길이 정렬별 posts/sec, 피크 RSS
+
+설정마다 새 프로세스에서 인코딩하므로 피크 RSS가 설정끼리 섞이지 않습니다.
+빌드 머신 크기(코어 수, 메모리)를 정할 때 씁니다.
+
+사용법:
+  python scripts/benchmark-encoder.py                          # BLOG_DB_PATH 의 글 전체
+  python scripts/benchmark-encoder.py --limit 2000 --workers 1 2 4 --batch-size 32 64
+  python scripts/benchmark-encoder.py --synthetic 20000 --stub  # 모델 없이 스텁 인코더
+"""
+
+import argparse
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import get_context
+
+import numpy as np
+
+from blog_data import connect, iter_posts
+from embedding_store import TEXT_LIMIT, embedding_text
+from embeddings import load_model, load_stub_model
+from parallel_encode import encode_parallel, format_report
+
+
+def synthetic_texts(n, seed=0):
+    """제목 + 본문 앞부분 길이가 제각각인 텍스트 (짧은 글이 많은 분포)"""
+    rng = np.random.default_rng(seed)
+    lengths = np.minimum(rng.lognormal(5.0, 0.8, size=n).astype(int) + 20, TEXT_LIMIT + 40)
+    return [f"글 {i}\n\n" + '가' * int(length) for i, length in enumerate(lengths)]
+
+
+def db_texts(db_path, limit=None):
+    """파이프라인 embeddings 단계와 같은 입력 (최신순)"""
+    conn = connect(db_path)
+    try:
+        texts = [embedding_text(p.title, p.content) for p in iter_posts(conn) if p.content]
+    finally:
+        conn.close()
+    return texts[:limit] if limit else texts
+
+
+def run_config(texts, stub, workers, batch_size, sort):
+    model_factory = load_stub_model if stub else load_model
+    _, report = encode_parallel(texts, model_factory, workers=workers,
+                                batch_size=batch_size, sort=sort)
+    return report
+
+
+def main():
+    parser = argparse.ArgumentParser(description='임베딩 인코더 처리량/메모리 벤치마크')
+    parser.add_argument('--db', default=None, help='SQLite DB 경로 (기본: BLOG_DB_PATH)')
+    parser.add_argument('--limit', type=int, default=None, help='앞에서부터 이만큼만 인코딩')
+    parser.add_argument('--synthetic', type=int, default=0, help='합성 텍스트 수')
+    parser.add_argument('--stub', action='store_true', help='모델 대신 스텁 인코더')
+    parser.add_argument('--workers', type=int, nargs='+', default=[1, 2, 4])
+    parser.add_argument('--batch-size', type=int, nargs='+', default=[64])
+    parser.add_argument('--no-unsorted', action='store_true',
+                        help='정렬하지 않은 기준선(pub_date 순) 생략')
+    args = parser.parse_args()
+
+    texts = synthetic_texts(args.synthetic) if args.synthetic else db_texts(args.db, args.limit)
+    print(f"📐 {len(texts)}개 텍스트 (평균 {np.mean([len(t) for t in texts]):.0f}자)")
+
+    configs = [(1, batch_size, False) for batch_size in args.batch_size] if not args.no_unsorted else []
+    configs += [(workers, batch_size, True)
+                for workers in args.workers for batch_size in args.batch_size]
+
+    spawn = get_context('spawn')
+    for workers, batch_size, sort in configs:
+        with ProcessPoolExecutor(max_workers=1, mp_context=spawn) as runner:
+            report = runner.submit(run_config, texts, args.stub, workers, batch_size, sort).result()
+        print(f"   {format_report(report)}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,118 @@
+#!/usr/bin/env python3
+"""
+근사 중복 탐지 벤치마크 - MinHash + LSH vs 전체 쌍 정확한 Jaccard
+
+같은 shingle 집합으로 모든 쌍의 Jaccard 를 직접 계산한 결과(브루트포스)를 정답으로 두고
+LSH 가 찾은 쌍의 재현율 / 정밀도, 비교한 후보 쌍 수, 시간을 비교합니다.
+브루트포스는 N² 이라 글 수가 많으면 오래 걸립니다 (--limit 으로 조절).
+
+사용법:
+  python scripts/benchmark-near-duplicates.py                   # 합성 글 1000개 (중복/연작 포함)
+  python scripts/benchmark-near-duplicates.py --synthetic 3000 --workers 1 4
+  python scripts/benchmark-near-duplicates.py --db --limit 2000 # BLOG_DB_PATH 의 최신 글
+"""
+
+import argparse
+import time
+from itertools import combinations
+
+import numpy as np
+
+from benchmark_utils import synthetic_vocab
+from blog_data import connect, iter_posts
+from near_duplicates import (
+    DUPLICATE_THRESHOLD, MIN_SHINGLES, SERIES_THRESHOLD, _EMPTY, compute_signatures,
+    estimate_jaccard, lsh_candidates, shingles,
+)
+
+
+def synthetic_texts(n, seed=0, words=300):
+    """무작위 글 + 단어 일부를 바꾼 사본(중복) + 앞부분을 공유하는 연작"""
+    rng = np.random.default_rng(seed)
+    vocab = synthetic_vocab(rng, 5000)
+
+    def random_words(count):
+        return list(rng.choice(vocab, size=count))
+
+    texts = []
+    while len(texts) < n:
+        base = random_words(words)
+        texts.append(' '.join(base))
+        kind = rng.random()
+        if kind < 0.1:  # 재게시: 단어 2~5% 교체
+            for _ in range(rng.integers(1, 4)):
+                copy = list(base)
+                for i in rng.choice(words, size=int(words * rng.uniform(0.02, 0.05)), replace=False):
+                    copy[i] = rng.choice(vocab)
+                texts.append(' '.join(copy))
+        elif kind < 0.15:  # 연작: 앞 70% 공유
+            shared = base[:int(words * 0.7)]
+            for _ in range(rng.integers(1, 3)):
+                texts.append(' '.join(shared + random_words(words - len(shared))))
+    return texts[:n]
+
+
+def db_texts(limit):
+    conn = connect()
+    try:
+        texts = [post.content for post in iter_posts(conn) if post.content]
+    finally:
+        conn.close()
+    return texts[:limit]
+
+
+def brute_force(texts, threshold):
+    """모든 쌍의 정확한 Jaccard -> {(i, j): jaccard} (threshold 이상)"""
+    sets = [set(shingles(text).tolist()) for text in texts]
+    valid = [i for i, s in enumerate(sets) if len(s) >= MIN_SHINGLES]
+    found = {}
+    for i, j in combinations(valid, 2):
+        a, b = sets[i], sets[j]
+        inter = len(a & b)
+        if inter:
+            jaccard = inter / (len(a) + len(b) - inter)
+            if jaccard >= threshold:
+                found[(i, j)] = jaccard
+    return found
+
+
+def main():
+    parser = argparse.ArgumentParser(description='MinHash + LSH 근사 중복 탐지 벤치마크')
+    parser.add_argument('--synthetic', type=int, default=1000, help='합성 글 수')
+    parser.add_argument('--db', action='store_true', help='합성 글 대신 BLOG_DB_PATH 의 글')
+    parser.add_argument('--limit', type=int, default=2000, help='--db 일 때 앞에서부터 글 수')
+    parser.add_argument('--workers', type=int, nargs='+', default=[1, 4])
+    args = parser.parse_args()
+
+    texts = db_texts(args.limit) if args.db else synthetic_texts(args.synthetic)
+    n = len(texts)
+    print(f"📐 {n}개 글 (평균 {np.mean([len(t) for t in texts]):.0f}자), 전체 쌍 {n * (n - 1) // 2}개")
+
+    for workers in args.workers:
+        start = time.perf_counter()
+        signatures, sizes = compute_signatures(texts, workers=workers)
+        print(f"   서명 workers={workers}: {time.perf_counter() - start:.2f}s")
+    signatures[sizes < MIN_SHINGLES] = _EMPTY
+
+    start = time.perf_counter()
+    pairs = lsh_candidates(signatures)
+    estimates = estimate_jaccard(signatures, pairs)
+    lsh_time = time.perf_counter() - start
+    print(f"   LSH 후보 {len(pairs)}쌍 ({lsh_time:.2f}s)")
+
+    start = time.perf_counter()
+    truth = brute_force(texts, min(SERIES_THRESHOLD, DUPLICATE_THRESHOLD))
+    print(f"   브루트포스 {time.perf_counter() - start:.2f}s")
+
+    for label, threshold in (('중복', DUPLICATE_THRESHOLD), ('연작', SERIES_THRESHOLD)):
+        expected = {pair for pair, jaccard in truth.items() if jaccard >= threshold}
+        found = {(int(i), int(j)) for (i, j), est in zip(pairs, estimates) if est >= threshold}
+        hits = len(expected & found)
+        recall = hits / len(expected) if expected else 1.0
+        precision = hits / len(found) if found else 1.0
+        print(f"   {label} (Jaccard >= {threshold}): 정답 {len(expected)}쌍, LSH {len(found)}쌍, "
+              f"재현율 {recall:.3f}, 정밀도 {precision:.3f}")
+
+
+if __name__ == '__main__':
+    main()
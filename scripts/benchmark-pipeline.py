@@ -0,0 +1,233 @@
+#!/usr/bin/env python3
+"""
+정적 데이터 빌드 벤치마크 - 합성 DB 크기별 실행 시간 / 피크 메모리 / 출력 크기
+
+합성 posts / summaries SQLite DB(.cache/bench/)를 만들고, 크기마다 아래 작업을
+각각 새 프로세스에서 실행합니다 (피크 RSS가 작업끼리 섞이지 않도록).
+  - static:     generate-from-sqlite.py 와 같은 static 단계
+  - stats:      Firestore stats 문서 집계 (업로드 없이 stats.json 으로 저장)
+  - similarity: embeddings 단계 (스텁 인코더 -> 유사도 매트릭스 / ANN / 양자화 인덱스)
+출력과 캐시는 임시 폴더에 쓰므로 public/data 와 .cache 의 실제 산출물은 건드리지 않습니다.
+
+결과는 기준선(--baseline, 기본 scripts/benchmark-baseline.json, 저장소에 커밋됨)과 비교합니다.
+  - 시간 / 피크 메모리가 --tolerance 이상 늘면 회귀
+  - JSON 출력의 해시가 다르면 결과 변경
+회귀나 결과 변경이 있으면 종료 코드 1 을 돌려줍니다.
+
+사용법:
+  python scripts/benchmark-pipeline.py                          # 10k, 50k, 200k
+  python scripts/benchmark-pipeline.py --sizes 10000 --cases static stats
+  python scripts/benchmark-pipeline.py --sizes 10000 --save-baseline
+  python scripts/benchmark-pipeline.py --report bench.json      # 결과 JSON 저장
+"""
+
+import argparse
+import contextlib
+import hashlib
+import io
+import json
+import sqlite3
+import sys
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import get_context
+from pathlib import Path
+
+import numpy as np
+
+from benchmark_utils import synthetic_vocab
+from blog_data import CACHE_DIR, HIDDEN_CATEGORIES, connect, iter_posts, write_json
+from metrics import peak_rss_mb
+from pipeline import run_pipeline, stats_documents
+from static_data import StaticDataBuilder
+
+BENCH_DIR = CACHE_DIR / 'bench'
+BASELINE_PATH = Path(__file__).parent / 'benchmark-baseline.json'  # 저장소에 커밋된 기준선
+DEFAULT_SIZES = (10000, 50000, 200000)
+CASES = ('static', 'stats', 'similarity')
+DEFAULT_TOLERANCE = 0.2
+GENERATOR_VERSION = 1  # 합성 DB 생성 규칙이 바뀌면 올림 (기존 DB 재생성)
+
+MAIN_CATEGORIES = ['사유', '기술', '정치', '경제', '역사', '과학', '문화', '일상', '재검토 글들']
+
+
+def synthetic_db_path(n, seed=0):
+    return BENCH_DIR / f'synthetic-{n}-s{seed}-v{GENERATOR_VERSION}.db'
+
+
+def make_synthetic_db(path, n, seed=0, vocab_size=20000):
+    """실제 DB와 같은 스키마의 합성 posts / summaries 테이블
+
+    본문 길이는 로그정규 분포(중앙값 ~1500자, 일부는 빈 본문), 단어는 Zipf 분포,
+    날짜는 2007~2026년, 일부 글은 숨김 카테고리, 약 60%의 글에 요약이 있습니다.
+    """
+    rng = np.random.default_rng(seed)
+    vocab = np.array(synthetic_vocab(rng, vocab_size))
+    categories = [f'{main}/{sub}' for main in MAIN_CATEGORIES for sub in ('일반', '메모', '번역')]
+    categories += MAIN_CATEGORIES + [f'{hidden}/보관' for hidden in HIDDEN_CATEGORIES]
+
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = path.with_suffix('.tmp')
+    if tmp_path.exists():
+        tmp_path.unlink()
+    conn = sqlite3.connect(tmp_path)
+    conn.execute('''CREATE TABLE posts (id INTEGER PRIMARY KEY, post_id TEXT, title TEXT,
+                    category TEXT, pub_date TEXT, content TEXT, char_count INTEGER)''')
+    conn.execute('CREATE TABLE summaries (post_id TEXT, summary TEXT, keywords TEXT)')
+
+    start = np.datetime64('2007-01-01T00:00')
+    span = int((np.datetime64('2026-06-30T00:00') - start) / np.timedelta64(1, 'm'))
+    for batch_start in range(0, n, 10000):
+        count = min(10000, n - batch_start)
+        words = np.minimum(rng.zipf(1.3, size=(count, 6)), vocab_size) - 1
+        body_words = np.clip(rng.lognormal(5.6, 0.9, size=count), 0, 4000).astype(int)
+        body_words[rng.random(count) < 0.03] = 0
+        minutes = rng.integers(0, span, size=count)
+        cats = rng.integers(0, len(categories), size=count)
+        posts, summaries = [], []
+        for i in range(count):
+            row_id = batch_start + i
+            ranks = np.minimum(rng.zipf(1.3, size=body_words[i]), vocab_size) - 1
+            content = ' '.join(vocab[ranks])
+            pub_date = str(start + np.timedelta64(int(minutes[i]), 'm')).replace('T', ' ')
+            post_id = str(220000000000 + row_id)
+            posts.append((row_id, post_id, ' '.join(vocab[words[i]]), categories[cats[i]],
+                          pub_date, content, len(content)))
+            if content and rng.random() < 0.6:
+                summaries.append((post_id, ' '.join(vocab[ranks[:40]]),
+                                  ', '.join(vocab[ranks[:5]])))
+        conn.executemany('INSERT INTO posts VALUES (?, ?, ?, ?, ?, ?, ?)', posts)
+        conn.executemany('INSERT INTO summaries VALUES (?, ?, ?)', summaries)
+    conn.commit()
+    conn.close()
+    tmp_path.replace(path)
+    return path
+
+
+def ensure_db(n, seed=0):
+    path = synthetic_db_path(n, seed)
+    if not path.exists():
+        print(f"   합성 DB 생성 중... ({n}개 글)")
+        t = time.perf_counter()
+        make_synthetic_db(path, n, seed)
+        print(f"   ✅ {path.name} ({path.stat().st_size / (1024 * 1024):.0f}MB, "
+              f"{time.perf_counter() - t:.1f}s)")
+    return path
+
+
+def output_summary(output_dir):
+    """출력 파일 총 크기와 JSON 출력 해시 (.npy/.npz/.bin 은 BLAS에 따라 비트가 달라질 수 있어 제외)"""
+    files = sorted(p for p in Path(output_dir).rglob('*') if p.is_file())
+    digest = hashlib.sha1()
+    for path in files:
+        if path.suffix == '.json':
+            digest.update(str(path.relative_to(output_dir)).encode('utf-8'))
+            digest.update(path.read_bytes())
+    return sum(p.stat().st_size for p in files), digest.hexdigest()
+
+
+def run_case(case, db_path, verbose=False):
+    """새 프로세스에서 작업 하나 실행 -> {seconds, peak_rss_mb, output_bytes, digest}"""
+    with tempfile.TemporaryDirectory() as tmp:
+        tmp = Path(tmp)
+        output_dir = tmp / 'data'
+        output_dir.mkdir()
+        log = contextlib.nullcontext() if verbose else contextlib.redirect_stdout(io.StringIO())
+        start = time.perf_counter()
+        with log:
+            if case == 'static':
+                run_pipeline(['static'], db_path=db_path, output_dir=output_dir, force=True,
+                             state_path=tmp / 'state.json',
+                             options={'metrics_path': tmp / 'run.json'})
+            elif case == 'stats':
+                builder = StaticDataBuilder(tmp / 'static')
+                conn = connect(db_path)
+                try:
+                    for post in iter_posts(conn):
+                        builder.add(post)
+                finally:
+                    conn.close()
+                monthly_stats, category_hierarchy = stats_documents(builder)
+                builder.discard()
+                write_json(output_dir / 'stats.json',
+                           {'monthly': monthly_stats, 'categories': category_hierarchy},
+                           ensure_ascii=False)
+            else:
+                run_pipeline(['embeddings'], db_path=db_path, output_dir=output_dir, force=True,
+                             state_path=tmp / 'state.json',
+                             options={'encoder': 'stub', 'cache_dir': tmp / 'cache', 'full': True,
+                                      'metrics_path': tmp / 'run.json'})
+        seconds = time.perf_counter() - start
+        output_bytes, digest = output_summary(output_dir)
+    return {
+        'seconds': seconds,
+        'peak_rss_mb': peak_rss_mb(),
+        'output_bytes': output_bytes,
+        'digest': digest,
+    }
+
+
+def compare(result, baseline, tolerance):
+    """기준선 대비 문제 목록"""
+    problems = []
+    for key, label in (('seconds', '시간'), ('peak_rss_mb', '피크 메모리')):
+        if result[key] > baseline[key] * (1 + tolerance):
+            problems.append(f"{label} {baseline[key]:.1f} -> {result[key]:.1f} "
+                            f"(+{100 * (result[key] / baseline[key] - 1):.0f}%)")
+    if result['digest'] != baseline['digest']:
+        problems.append(f"출력 변경 ({baseline['output_bytes']} -> {result['output_bytes']}바이트)")
+    return problems
+
+
+def main():
+    parser = argparse.ArgumentParser(description='합성 DB로 정적 데이터 빌드 벤치마크')
+    parser.add_argument('--sizes', type=int, nargs='+', default=list(DEFAULT_SIZES))
+    parser.add_argument('--cases', nargs='+', choices=CASES, default=list(CASES))
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--baseline', type=Path, default=BASELINE_PATH)
+    parser.add_argument('--save-baseline', action='store_true', help='이번 결과를 기준선으로 저장')
+    parser.add_argument('--tolerance', type=float, default=DEFAULT_TOLERANCE,
+                        help='시간/메모리 회귀 판정 비율 (기본 0.2 = 20%%)')
+    parser.add_argument('--report', type=Path, default=None, help='결과 JSON 경로')
+    parser.add_argument('--verbose', action='store_true', help='파이프라인 출력 표시')
+    args = parser.parse_args()
+
+    baseline = {}
+    if args.baseline.exists():
+        with open(args.baseline, 'r', encoding='utf-8') as f:
+            baseline = json.load(f)
+
+    results = {}
+    failed = False
+    spawn = get_context('spawn')
+    for n in args.sizes:
+        print(f"\n📐 {n}개 글")
+        db_path = ensure_db(n, args.seed)
+        print(f"   {'작업':<12}{'시간(s)':>10}{'피크(MB)':>10}{'출력(MB)':>10}  기준선")
+        for case in args.cases:
+            with ProcessPoolExecutor(max_workers=1, mp_context=spawn) as runner:
+                result = runner.submit(run_case, case, str(db_path), args.verbose).result()
+            key = f'{n}/{case}'
+            results[key] = result
+
+            if key in baseline:
+                problems = compare(result, baseline[key], args.tolerance)
+                status = '⚠️ ' + ', '.join(problems) if problems else '✅'
+                failed = failed or bool(problems)
+            else:
+                status = '-'
+            print(f"   {case:<12}{result['seconds']:>10.2f}{result['peak_rss_mb']:>10.0f}"
+                  f"{result['output_bytes'] / (1024 * 1024):>10.1f}  {status}")
+
+    if args.report:
+        write_json(args.report, results, indent=2)
+    if args.save_baseline:
+        write_json(args.baseline, {**baseline, **results}, indent=2)
+        print(f"\n💾 기준선 저장: {args.baseline}")
+    elif failed:
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
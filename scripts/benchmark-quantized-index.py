@@ -0,0 +1,89 @@
+#!/usr/bin/env python3
+"""
+양자화 인덱스 벤치마크 - 메모리 / 지연 시간 / similarity-matrix.json Top-10 일치율
+
+사용법:
+  python scripts/benchmark-quantized-index.py                    # public/data 산출물 사용
+  python scripts/benchmark-quantized-index.py --synthetic 20000  # 합성 데이터 (정답은 브루트포스)
+  python scripts/benchmark-quantized-index.py --method pq int8 --rerank 0 20 50 100 200
+"""
+
+import argparse
+import json
+import time
+from pathlib import Path
+
+import numpy as np
+
+from ann_index import exact_search
+from benchmark_utils import percentile_ms, synthetic_embeddings
+from embedding_store import load_embeddings
+from quantized_index import DEFAULT_SUBSPACES, QUANTIZATION_METHODS, QuantizedIndex
+from similarity import normalize
+
+PROJECT_DIR = Path(__file__).parent.parent
+OUTPUT_DIR = PROJECT_DIR / 'public/data'
+
+
+def main():
+    parser = argparse.ArgumentParser(description='양자화 인덱스 메모리/지연/일치율 벤치마크')
+    parser.add_argument('--synthetic', type=int, default=0, help='합성 데이터 글 수')
+    parser.add_argument('--queries', type=int, default=300)
+    parser.add_argument('--k', type=int, default=10)
+    parser.add_argument('--method', nargs='+', choices=QUANTIZATION_METHODS, default=list(QUANTIZATION_METHODS))
+    parser.add_argument('--subspaces', type=int, default=DEFAULT_SUBSPACES, help='PQ 부분 공간 수')
+    parser.add_argument('--rerank', type=int, nargs='+', default=[0, 20, 50, 100, 200])
+    args = parser.parse_args()
+
+    if args.synthetic:
+        embeddings = synthetic_embeddings(args.synthetic)
+        post_ids = [str(i) for i in range(len(embeddings))]
+        exact = embeddings
+    else:
+        post_ids, exact = load_embeddings(OUTPUT_DIR)
+        embeddings = np.asarray(exact, dtype=np.float32)
+    n, dim = embeddings.shape
+    print(f"📐 {n}개 글, {dim}차원 (float32 {n * dim * 4 / (1024 * 1024):.1f}MB)")
+
+    rng = np.random.default_rng(1)
+    queries = rng.choice(n, size=min(args.queries, n), replace=False)
+
+    # 정답: 지금의 similarity-matrix.json Top-K (합성 데이터면 브루트포스)
+    truth = {}
+    matrix_path = OUTPUT_DIR / 'similarity-matrix.json'
+    if not args.synthetic and matrix_path.exists():
+        with open(matrix_path, 'r', encoding='utf-8') as f:
+            matrix = json.load(f)
+        for row in queries:
+            truth[row] = {item['id'] for item in matrix.get(post_ids[row], [])[:args.k]}
+        print("   정답: similarity-matrix.json")
+    else:
+        normed = normalize(embeddings)
+        for row in queries:
+            truth[row] = {post_ids[j] for j in exact_search(normed, normed[row], k=args.k, exclude=row)}
+        print("   정답: 브루트포스")
+
+    for method in args.method:
+        start = time.perf_counter()
+        index = QuantizedIndex.build(embeddings, post_ids, method=method, m=args.subspaces)
+        build_time = time.perf_counter() - start
+        index.exact = exact
+        print(f"\n   [{method}] 생성 {build_time:.2f}s, 코드 {index.nbytes / (1024 * 1024):.2f}MB "
+              f"(float32 대비 {n * dim * 4 / index.nbytes:.1f}배 작음)")
+
+        for rerank in args.rerank:
+            latencies = []
+            hits = total = 0
+            for row in queries:
+                t = time.perf_counter()
+                result = index.search_id(post_ids[row], k=args.k, rerank=rerank)
+                latencies.append(time.perf_counter() - t)
+                hits += len(truth[row] & {post_id for post_id, _ in result})
+                total += len(truth[row])
+            agreement = hits / total if total else 0.0
+            print(f"   rerank={rerank:<5} Top-{args.k} 일치율 {agreement:.3f}  "
+                  f"p50 {percentile_ms(latencies, 50):.3f}ms  p95 {percentile_ms(latencies, 95):.3f}ms")
+
+
+if __name__ == '__main__':
+    main()
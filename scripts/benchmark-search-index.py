@@ -0,0 +1,128 @@
+#!/usr/bin/env python3
+"""
+검색 인덱스 벤치마크 - 생성 시간 / 크기 / 질의 지연 (전체 문자열 스캔 대비)
+
+사용법:
+  python scripts/benchmark-search-index.py                    # BLOG_DB_PATH 의 글 + 요약
+  python scripts/benchmark-search-index.py --synthetic 50000  # 합성 한국어 문서
+  python scripts/benchmark-search-index.py --queries 500 -k 20
+"""
+
+import argparse
+import tempfile
+import time
+from pathlib import Path
+
+import numpy as np
+
+from benchmark_utils import percentile_ms, synthetic_vocab
+from blog_data import connect, iter_posts, iter_summaries
+from search_index import BODY_LIMIT, SearchIndex, SearchIndexBuilder
+
+
+def synthetic_documents(n, vocab_size=5000, seed=0):
+    """Zipf 분포로 뽑은 가짜 한국어 단어로 만든 (id, 제목, 본문)"""
+    rng = np.random.default_rng(seed)
+    vocab = synthetic_vocab(rng, vocab_size)
+    ranks = np.minimum(rng.zipf(1.3, size=n * 160), vocab_size) - 1
+    words = [vocab[r] for r in ranks]
+    for i in range(n):
+        chunk = words[i * 160:(i + 1) * 160]
+        yield str(i), ' '.join(chunk[:6]), ' '.join(chunk[6:])
+
+
+def db_documents(db_path):
+    """(id, 제목, 본문 앞부분, 요약 + 키워드) - 파이프라인 search 단계와 같은 입력"""
+    conn = connect(db_path)
+    try:
+        posts = [(p.post_id, p.title, p.content[:BODY_LIMIT]) for p in iter_posts(conn)]
+        summaries = list(iter_summaries(conn))
+    finally:
+        conn.close()
+    return posts, summaries
+
+
+def scan_search(texts, post_ids, query, k):
+    """인덱스 없이 전체 문자열을 훑는 기준선 (질의 단어 등장 횟수 합)"""
+    words = query.lower().split()
+    scored = []
+    for post_id, text in zip(post_ids, texts):
+        score = sum(text.count(word) for word in words)
+        if score:
+            scored.append((-score, post_id))
+    scored.sort()
+    return scored[:k]
+
+
+def main():
+    parser = argparse.ArgumentParser(description='검색 인덱스 생성/질의 벤치마크')
+    parser.add_argument('--synthetic', type=int, default=0, help='합성 문서 수')
+    parser.add_argument('--db', default=None, help='SQLite DB 경로 (기본: BLOG_DB_PATH)')
+    parser.add_argument('--queries', type=int, default=300)
+    parser.add_argument('-k', type=int, default=10)
+    args = parser.parse_args()
+
+    if args.synthetic:
+        posts, summaries = list(synthetic_documents(args.synthetic)), []
+    else:
+        posts, summaries = db_documents(args.db)
+    print(f"📚 {len(posts)}개 글, 요약 {len(summaries)}개")
+
+    start = time.perf_counter()
+    builder = SearchIndexBuilder()
+    for post_id, title, body in posts:
+        builder.add(post_id, title, body)
+    for post_id, summary, keywords in summaries:
+        builder.add_summary(post_id, summary, keywords)
+    index = builder.build()
+    build_time = time.perf_counter() - start
+    postings = int(index.df.sum())
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = Path(tmp) / 'search-index.npz'
+        index.save(path)
+        size = path.stat().st_size
+        start = time.perf_counter()
+        index = SearchIndex.load(path)
+        load_time = time.perf_counter() - start
+
+    print(f"   생성 {build_time:.2f}s, 로드 {load_time * 1000:.1f}ms")
+    print(f"   용어 {len(index.terms)}개, posting {postings}개, "
+          f"파일 {size / (1024 * 1024):.1f}MB ({size / max(postings, 1):.2f}B/posting)")
+
+    # 질의: 무작위 글 제목에서 단어 1~3개
+    rng = np.random.default_rng(1)
+    queries = []
+    for row in rng.choice(len(posts), size=min(args.queries, len(posts)), replace=False):
+        words = posts[row][1].split() or [posts[row][1]]
+        count = int(rng.integers(1, min(3, len(words)) + 1))
+        start_word = int(rng.integers(0, len(words) - count + 1))
+        queries.append(' '.join(words[start_word:start_word + count]))
+
+    latencies = []
+    for query in queries:
+        t = time.perf_counter()
+        index.search(query, k=args.k)
+        latencies.append(time.perf_counter() - t)
+    print(f"\n   인덱스 검색     p50 {percentile_ms(latencies, 50):.3f}ms  "
+          f"p95 {percentile_ms(latencies, 95):.3f}ms  p99 {percentile_ms(latencies, 99):.3f}ms")
+
+    texts = [f"{title} {body}".lower() for _, title, body in posts]
+    post_ids = [post_id for post_id, _, _ in posts]
+    scan = []
+    for query in queries[:50]:
+        t = time.perf_counter()
+        scan_search(texts, post_ids, query, args.k)
+        scan.append(time.perf_counter() - t)
+    print(f"   전체 스캔       p50 {percentile_ms(scan, 50):.3f}ms  "
+          f"p95 {percentile_ms(scan, 95):.3f}ms  (질의 {len(scan)}개)")
+    print(f"   -> p50 기준 {np.median(scan) / max(np.median(latencies), 1e-9):.0f}배 빠름")
+
+    for query in queries[:3]:
+        print(f"\n🔎 {query}")
+        for post_id, score in index.search(query, k=3):
+            print(f"   {post_id}  {score:.3f}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,30 @@
+"""
+benchmark-*.py 가 같이 쓰는 합성 데이터 / 지연 시간 도우미
+
+  - SYLLABLES, synthetic_vocab: 가짜 한국어 단어 (검색 / 중복 / 파이프라인 벤치마크)
+  - synthetic_embeddings: 주제별로 뭉친 합성 임베딩 (ANN / 양자화 인덱스 벤치마크)
+  - percentile_ms: 초 단위 측정값 -> 백분위 ms
+"""
+
+import numpy as np
+
+SYLLABLES = '가나다라마바사아자차카타파하거너더러머버서어저처커터퍼허고노도로모보소오조초코토포호구누두루무부수우주추쿠투푸후'
+
+
+def synthetic_vocab(rng, size):
+    """2~4음절 가짜 단어 size개 (같은 rng 상태면 같은 단어 목록)"""
+    lengths = rng.integers(2, 5, size=size)
+    return [''.join(rng.choice(list(SYLLABLES), size=length)) for length in lengths]
+
+
+def synthetic_embeddings(n, dim=384, n_topics=200, seed=0):
+    """주제별로 뭉친 합성 임베딩"""
+    rng = np.random.default_rng(seed)
+    topics = rng.standard_normal((n_topics, dim)).astype(np.float32)
+    labels = rng.integers(0, n_topics, size=n)
+    noise = rng.standard_normal((n, dim)).astype(np.float32)
+    return topics[labels] + 0.8 * noise
+
+
+def percentile_ms(samples, q):
+    return float(np.percentile(samples, q)) * 1000
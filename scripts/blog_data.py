@@ -0,0 +1,122 @@
+"""
+블로그 DB 공통 모듈
+
+모든 생성 스크립트가 같은 DB 경로, 같은 숨김 카테고리 규칙,
+같은 월/분기/카테고리 계산을 쓰도록 한 곳에 모았습니다.
+
+DB 경로는 BLOG_DB_PATH 환경변수로 바꿀 수 있습니다.
+"""
+
+import json
+import os
+import sqlite3
+from pathlib import Path
+from typing import NamedTuple
+
+SCRIPT_DIR = Path(__file__).parent
+PROJECT_DIR = SCRIPT_DIR.parent
+OUTPUT_DIR = PROJECT_DIR / 'public/data'
+CACHE_DIR = PROJECT_DIR / '.cache'
+
+DEFAULT_DB_PATH = Path.home() / 'Desktop/AI/indiebizOS/data/packages/installed/tools/blog/data/blog_insight.db'
+DB_PATH = Path(os.environ.get('BLOG_DB_PATH', DEFAULT_DB_PATH))
+
+# 숨길 카테고리 / 이름 바꿀 카테고리
+HIDDEN_CATEGORIES = ['임시보관함', '집자료들']
+CATEGORY_REMAP = {'재검토 글들': '미분류'}
+
+FETCH_SIZE = 1000
+
+
+class Post(NamedTuple):
+    id: int
+    post_id: str
+    title: str
+    category: str
+    pub_date: str
+    content: str
+    char_count: int
+
+
+def should_hide(category):
+    if not category:
+        return False
+    return any(category.startswith(hidden) for hidden in HIDDEN_CATEGORIES)
+
+
+def remap_category(category):
+    if not category:
+        return category
+    main_cat = category.split('/')[0] if '/' in category else category
+    if main_cat in CATEGORY_REMAP:
+        return category.replace(main_cat, CATEGORY_REMAP[main_cat])
+    return category
+
+
+def month_key(pub_date):
+    """'YYYY-MM' (날짜가 없으면 None)"""
+    return pub_date[:7] if pub_date else None
+
+
+def quarter_key(month):
+    """'YYYY-MM' -> 'YYYY-Qn'"""
+    year, mm = month.split('-')
+    return f"{year}-Q{(int(mm) - 1) // 3 + 1}"
+
+
+def split_category(category):
+    """'메인/서브' -> (메인, 서브), 서브가 없으면 (메인, None)"""
+    if '/' in category:
+        parts = category.split('/')
+        return parts[0], parts[1]
+    return category, None
+
+
+def connect(db_path=None):
+    db_path = Path(db_path or DB_PATH)
+    if not db_path.exists():
+        raise FileNotFoundError(f"DB 파일을 찾을 수 없습니다: {db_path}")
+    return sqlite3.connect(db_path)
+
+
+def iter_posts(conn, include_hidden=False, fetch_size=FETCH_SIZE):
+    """posts 테이블을 최신순으로 스트리밍 (카테고리는 remap 적용)"""
+    cursor = conn.cursor()
+    cursor.execute('''
+        SELECT id, post_id, title, category, pub_date, content, char_count
+        FROM posts
+        ORDER BY pub_date DESC
+    ''')
+    while True:
+        rows = cursor.fetchmany(fetch_size)
+        if not rows:
+            break
+        for row_id, post_id, title, category, pub_date, content, char_count in rows:
+            if not include_hidden and should_hide(category):
+                continue
+            yield Post(
+                row_id, str(post_id), title or '', remap_category(category) or '',
+                pub_date or '', content or '', char_count or 0,
+            )
+
+
+def iter_summaries(conn, fetch_size=FETCH_SIZE):
+    """summaries 테이블 스트리밍 -> (post_id, summary, keywords)"""
+    cursor = conn.cursor()
+    cursor.execute('SELECT post_id, summary, keywords FROM summaries')
+    while True:
+        rows = cursor.fetchmany(fetch_size)
+        if not rows:
+            break
+        for post_id, summary, keywords in rows:
+            yield str(post_id), summary or '', keywords or ''
+
+
+def write_json(path, data, **kwargs):
+    """임시 파일에 쓴 뒤 rename (읽는 쪽이 반쯤 쓰인 파일을 보지 않도록)"""
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = path.with_suffix(path.suffix + '.tmp')
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump(data, f, **kwargs)
+    tmp_path.replace(path)
@@ -0,0 +1,96 @@
+#!/usr/bin/env python3
+"""
+정적 데이터 통합 빌드
+
+DB를 한 번만 읽어서 모든 정적 데이터를 만듭니다.
+입력이 바뀌지 않은 단계는 건너뛰고, 단계별 소요 시간을 보여줍니다.
+
+사용법:
+  python scripts/build-all.py                        # static, embeddings, dedupe, layout, topics,
+                                                     # drift, network, search, keywords, timeline
+  python scripts/build-all.py --only static timeline
+  python scripts/build-all.py --only stats           # Firestore stats 업로드 (static 포함)
+  python scripts/build-all.py --force                # 모든 단계 강제 실행
+  python scripts/build-all.py --profile embeddings --trace-memory static
+                                                     # cProfile / tracemalloc (실행 리포트에 기록)
+  BLOG_DB_PATH=/path/to/blog.db python scripts/build-all.py
+"""
+
+import argparse
+
+from embedding_store import EMBEDDING_DTYPES
+from chunk_store import POOL_MODES
+from parallel_encode import DEFAULT_BATCH_SIZE
+from quantized_index import QUANTIZATION_METHODS
+from pipeline import DEFAULT_STAGES, STAGES, run_pipeline
+from similarity import DEFAULT_BLOCK_SIZE
+import network_graph
+import timeline
+
+
+def main():
+    parser = argparse.ArgumentParser(description='정적 데이터 통합 빌드')
+    parser.add_argument('--only', nargs='+', choices=sorted(STAGES), default=list(DEFAULT_STAGES),
+                        help='실행할 단계 (의존 단계는 자동 포함)')
+    parser.add_argument('--force', action='store_true', help='입력이 같아도 모든 단계 실행')
+    parser.add_argument('--db', default=None, help='SQLite DB 경로 (기본: BLOG_DB_PATH)')
+    parser.add_argument('--block-size', type=int, default=DEFAULT_BLOCK_SIZE)
+    parser.add_argument('--full', action='store_true', help='임베딩/레이아웃 캐시 무시')
+    parser.add_argument('--dtype', choices=EMBEDDING_DTYPES, default='float16')
+    parser.add_argument('--json', action='store_true', help='embeddings.json도 출력 (호환용)')
+    parser.add_argument('--quantization', choices=QUANTIZATION_METHODS, default='pq',
+                        help='quantized-index.npz 양자화 방식 (product quantization / int8)')
+    parser.add_argument('--chunks', choices=POOL_MODES, default=None,
+                        help='긴 글을 겹치는 청크로 나눠 인코딩하고 mean/max 풀링')
+    parser.add_argument('--encode-workers', type=int, default=1,
+                        help='임베딩 인코딩 프로세스 수 (워커마다 모델 1개)')
+    parser.add_argument('--batch-size', type=int, default=DEFAULT_BATCH_SIZE,
+                        help='임베딩 인코딩 배치 크기')
+    parser.add_argument('--dedupe-workers', type=int, default=1,
+                        help='근사 중복 탐지 MinHash 서명 계산 프로세스 수')
+    parser.add_argument('--topic-clusters', type=int, default=None,
+                        help='주제 군집 수 (기본: sqrt(글 수 / 2), 최대 150)')
+    parser.add_argument('--network-edges', choices=network_graph.EDGE_MODES, default='threshold',
+                        help='네트워크 간선: 임계값 전부 / mutual kNN / 최대 신장 숲')
+    parser.add_argument('--concurrency', type=int, default=timeline.DEFAULT_CONCURRENCY,
+                        help='타임라인 요약 동시 API 요청 수')
+    parser.add_argument('--rate-limit', type=int, default=timeline.DEFAULT_RATE_LIMIT,
+                        help='타임라인 요약 분당 API 요청 수')
+    parser.add_argument('--stub', action='store_true', help='API 대신 로컬 스텁으로 요약 (.cache/timeline-summaries-stub.json 에 씀)')
+    parser.add_argument('--metrics', default=None,
+                        help='실행 리포트 JSON 경로 (기본: .cache/runs/<시각>-pipeline.json)')
+    parser.add_argument('--profile', nargs='+', default=[], metavar='SPAN',
+                        help='cProfile로 감쌀 단계/구간 (예: embeddings, embeddings/similarity, db-read)')
+    parser.add_argument('--trace-memory', nargs='+', default=[], metavar='SPAN',
+                        help='tracemalloc으로 할당을 추적할 단계/구간')
+    args = parser.parse_args()
+
+    run_pipeline(
+        args.only,
+        db_path=args.db,
+        force=args.force,
+        options={
+            'block_size': args.block_size,
+            'full': args.full,
+            'layout_full': args.full,
+            'dtype': args.dtype,
+            'json': args.json,
+            'chunks': args.chunks,
+            'quantization': args.quantization,
+            'encode_workers': args.encode_workers,
+            'batch_size': args.batch_size,
+            'dedupe_workers': args.dedupe_workers,
+            'topic_clusters': args.topic_clusters,
+            'network_edges': args.network_edges,
+            'concurrency': args.concurrency,
+            'rate_limit': args.rate_limit,
+            'stub': args.stub,
+            'metrics_path': args.metrics,
+            'profile': args.profile,
+            'trace_memory': args.trace_memory,
+        },
+    )
+
+
+if __name__ == '__main__':
+    main()
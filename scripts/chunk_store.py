@@ -0,0 +1,212 @@
+"""
+긴 글 청크 임베딩 (겹치는 창 -> 문서 벡터 풀링)
+
+기본 임베딩 텍스트는 title + content[:500] 이라 긴 글은 첫 문단만 반영됩니다.
+청크 모드에서는 본문을 CHUNK_CHARS 글자 창으로 CHUNK_OVERLAP 만큼 겹쳐 자르고
+(글당 최대 MAX_CHUNKS개), 각 창을 "제목 + 창" 으로 인코딩한 뒤
+정규화한 청크 벡터를 mean/max 풀링해서 문서 벡터를 만듭니다.
+첫 청크는 기본 임베딩 텍스트와 같습니다.
+
+청크 캐시: .cache/chunk-embeddings-cache.npz
+  - ids / hashes: post_id, 청크 텍스트 전체의 해시
+  - counts:       글별 청크 수
+  - vectors:      청크 벡터 (float16, 글 순서대로 이어 붙임)
+  - model:        모델 이름 + 청크 설정 (바뀌면 캐시 무효)
+내용이 바뀐 글의 청크만 다시 인코딩합니다.
+
+공개용 출력 (public/data, 행 순서는 embeddings-ids.json 과 같음):
+  - chunk-embeddings.npy: (M, D) float16 정규화 청크 벡터
+  - chunk-offsets.npy:    int32[N + 1]  글 i의 청크 = [offsets[i], offsets[i+1])
+  - chunk-spans.npy:      int32[M, 2]   청크의 본문 내 글자 범위 [start, end)
+"""
+
+from pathlib import Path
+
+import numpy as np
+
+from embedding_store import CACHE_DIR, TEXT_LIMIT, _save_npy, content_hash
+
+CHUNK_CACHE_PATH = CACHE_DIR / 'chunk-embeddings-cache.npz'
+
+CHUNK_CHARS = TEXT_LIMIT
+CHUNK_OVERLAP = 100
+MAX_CHUNKS = 16
+POOL_MODES = ('mean', 'max')
+
+CHUNK_EMBEDDINGS_NPY = 'chunk-embeddings.npy'
+CHUNK_OFFSETS_NPY = 'chunk-offsets.npy'
+CHUNK_SPANS_NPY = 'chunk-spans.npy'
+
+
+def chunk_spans(content, size=CHUNK_CHARS, overlap=CHUNK_OVERLAP, max_chunks=MAX_CHUNKS):
+    """본문을 겹치는 창으로 자른 [(start, end), ...] (빈 본문도 창 1개)"""
+    content = content or ''
+    step = size - overlap
+    spans = [(0, min(size, len(content)))]
+    start = step
+    while start + overlap < len(content) and len(spans) < max_chunks:
+        spans.append((start, min(start + size, len(content))))
+        start += step
+    return spans
+
+
+def chunk_texts(title, content, spans):
+    """청크별 인코딩 텍스트 (제목 + 창)"""
+    return [f"{title}\n\n{(content or '')[start:end]}" for start, end in spans]
+
+
+def chunks_hash(texts):
+    return content_hash('\x1f'.join(texts))
+
+
+def pool_chunks(vectors, counts, mode='mean'):
+    """정규화한 청크 벡터 -> 글별 문서 벡터 (float32)"""
+    if mode not in POOL_MODES:
+        raise ValueError(f"지원하지 않는 풀링: {mode}")
+    offsets = np.concatenate([[0], np.cumsum(counts)])
+    vectors = np.asarray(vectors, dtype=np.float32)
+    if mode == 'mean':
+        return np.add.reduceat(vectors, offsets[:-1], axis=0) / np.asarray(counts)[:, None]
+    return np.maximum.reduceat(vectors, offsets[:-1], axis=0)
+
+
+class ChunkCache:
+    """post_id -> (해시, 청크 벡터 float16) 캐시"""
+
+    def __init__(self, model_name, path=CHUNK_CACHE_PATH):
+        self.model_name = f"{model_name}|chunks={CHUNK_CHARS}/{CHUNK_OVERLAP}/{MAX_CHUNKS}"
+        self.path = Path(path)
+        self.entries = {}
+        self._load()
+
+    def _load(self):
+        if not self.path.exists():
+            return
+        data = np.load(self.path, allow_pickle=False)
+        if str(data['model']) != self.model_name:
+            print(f"   ⚠️ 모델/청크 설정이 바뀌어 청크 캐시를 무시합니다 ({data['model']})")
+            return
+        offsets = np.concatenate([[0], np.cumsum(data['counts'])])
+        vectors = data['vectors']
+        for i, (post_id, digest) in enumerate(zip(data['ids'], data['hashes'])):
+            self.entries[str(post_id)] = (str(digest), vectors[offsets[i]:offsets[i + 1]])
+
+    def __len__(self):
+        return len(self.entries)
+
+    def diff(self, post_ids, hashes):
+        """캐시에 없거나 해시가 바뀐 글의 인덱스 목록"""
+        missing = []
+        for i, (post_id, digest) in enumerate(zip(post_ids, hashes)):
+            entry = self.entries.get(post_id)
+            if entry is None or entry[0] != digest:
+                missing.append(i)
+        return missing
+
+    def put(self, post_id, digest, vectors):
+        self.entries[post_id] = (digest, normalize_f16(vectors))
+
+    def get_chunks(self, post_ids):
+        """post_ids 순서대로 이어 붙인 (청크 벡터, 글별 청크 수)"""
+        counts = np.array([len(self.entries[post_id][1]) for post_id in post_ids], dtype=np.int32)
+        return np.concatenate([self.entries[post_id][1] for post_id in post_ids]), counts
+
+    def prune(self, post_ids):
+        """더 이상 존재하지 않는 글 제거"""
+        alive = set(post_ids)
+        for post_id in list(self.entries):
+            if post_id not in alive:
+                del self.entries[post_id]
+
+    def save(self):
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        ids = list(self.entries)
+        if ids:
+            vectors, counts = self.get_chunks(ids)
+        else:
+            vectors, counts = np.zeros((0, 0), dtype=np.float16), np.zeros(0, dtype=np.int32)
+        tmp_path = self.path.with_suffix('.tmp.npz')
+        np.savez(
+            tmp_path,
+            ids=np.array(ids, dtype=str),
+            hashes=np.array([self.entries[i][0] for i in ids], dtype=str),
+            counts=counts,
+            vectors=vectors,
+            model=np.array(self.model_name),
+        )
+        tmp_path.replace(self.path)
+
+
+def normalize_f16(vectors):
+    vectors = np.asarray(vectors, dtype=np.float32)
+    norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+    norms[norms == 0] = 1.0
+    return (vectors / norms).astype(np.float16)
+
+
+def save_chunks(output_dir, vectors, counts, spans):
+    """청크 산출물 저장 -> 생성한 파일 경로 목록"""
+    output_dir = Path(output_dir)
+    paths = [output_dir / CHUNK_EMBEDDINGS_NPY, output_dir / CHUNK_OFFSETS_NPY,
+             output_dir / CHUNK_SPANS_NPY]
+    offsets = np.concatenate([[0], np.cumsum(counts)]).astype(np.int32)
+    _save_npy(paths[0], np.asarray(vectors, dtype=np.float16))
+    _save_npy(paths[1], offsets)
+    _save_npy(paths[2], np.asarray(spans, dtype=np.int32).reshape(-1, 2))
+    return paths
+
+
+class ChunkIndex:
+    """청크 벡터 메모리 매핑 리더 (문단 단위 유사 검색)"""
+
+    def __init__(self, output_dir, post_ids):
+        output_dir = Path(output_dir)
+        self.vectors = np.load(output_dir / CHUNK_EMBEDDINGS_NPY, mmap_mode='r')
+        self.offsets = np.load(output_dir / CHUNK_OFFSETS_NPY)
+        self.spans = np.load(output_dir / CHUNK_SPANS_NPY)
+        self.post_ids = list(post_ids)
+        self.row_of = {post_id: i for i, post_id in enumerate(self.post_ids)}
+        self.post_of_chunk = np.repeat(np.arange(len(self.post_ids)), np.diff(self.offsets))
+
+    def __len__(self):
+        return len(self.vectors)
+
+    def chunks(self, post_id):
+        """글의 청크 행 번호 범위 (없으면 빈 range)"""
+        row = self.row_of.get(post_id)
+        if row is None:
+            return range(0)
+        return range(int(self.offsets[row]), int(self.offsets[row + 1]))
+
+    def search(self, query, k=10, exclude_post=None, block_size=65536):
+        """쿼리 벡터와 가장 비슷한 청크 k개
+        -> [(post_id, 청크 번호, (start, end), score), ...]
+        """
+        query = np.asarray(query, dtype=np.float32).ravel()
+        query = query / (np.linalg.norm(query) or 1.0)
+        scores = np.empty(len(self.vectors), dtype=np.float32)
+        for start in range(0, len(self.vectors), block_size):
+            block = np.asarray(self.vectors[start:start + block_size], dtype=np.float32)
+            scores[start:start + block_size] = block @ query
+        if exclude_post is not None and exclude_post in self.row_of:
+            excluded = self.chunks(exclude_post)
+            scores[excluded.start:excluded.stop] = -np.inf
+        k = min(k, int(np.isfinite(scores).sum()))
+        if k <= 0:
+            return []
+        top = np.argpartition(-scores, k - 1)[:k]
+        top = top[np.argsort(-scores[top], kind='stable')]
+        results = []
+        for i in top:
+            row = self.post_of_chunk[i]
+            start, end = self.spans[i]
+            results.append((self.post_ids[row], int(i - self.offsets[row]),
+                            (int(start), int(end)), float(scores[i])))
+        return results
+
+    def similar_passages(self, post_id, chunk_no, k=10):
+        """글의 chunk_no번째 청크와 비슷한 다른 글의 청크 k개"""
+        chunks = self.chunks(post_id)
+        if chunk_no >= len(chunks):
+            return []
+        return self.search(self.vectors[chunks[chunk_no]], k=k, exclude_post=post_id)
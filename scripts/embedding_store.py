@@ -0,0 +1,160 @@
+"""
+임베딩 캐시 (post_id + 내용 해시 기준)
+
+임베딩 텍스트(title + content[:500])의 해시가 같으면 이전에 계산한 벡터를
+그대로 재사용합니다. 새 글이나 내용이 바뀐 글만 다시 인코딩하면 됩니다.
+
+캐시 파일: .cache/embeddings-cache.npz
+  - ids:     post_id 배열
+  - hashes:  내용 해시 배열
+  - vectors: float32 임베딩 행렬
+  - model:   임베딩 모델 이름 (모델이 바뀌면 캐시 무효)
+
+공개용 바이너리 출력 (public/data):
+  - embeddings.npy:       (N, D) 행렬 (float16 기본, float32/int8 선택)
+  - embeddings-scale.npy: int8일 때 행별 스케일 (float32)
+  - embeddings-ids.json:  행 순서대로의 post_id 목록
+.npy는 np.load(mmap_mode='r')로 메모리 매핑해서 읽을 수 있습니다.
+"""
+
+import hashlib
+import json
+from pathlib import Path
+
+import numpy as np
+
+PROJECT_DIR = Path(__file__).parent.parent
+CACHE_DIR = PROJECT_DIR / '.cache'
+CACHE_PATH = CACHE_DIR / 'embeddings-cache.npz'
+
+TEXT_LIMIT = 500
+
+EMBEDDINGS_NPY = 'embeddings.npy'
+EMBEDDINGS_SCALE_NPY = 'embeddings-scale.npy'
+EMBEDDINGS_IDS_JSON = 'embeddings-ids.json'
+EMBEDDING_DTYPES = ('float16', 'float32', 'int8')
+
+
+def embedding_text(title, content):
+    """임베딩에 사용하는 텍스트 (제목 + 본문 앞 500자)"""
+    return f"{title}\n\n{(content or '')[:TEXT_LIMIT]}"
+
+
+def content_hash(text):
+    """임베딩 텍스트의 해시"""
+    return hashlib.sha1(text.encode('utf-8')).hexdigest()
+
+
+class EmbeddingCache:
+    """post_id -> (해시, 벡터) 캐시"""
+
+    def __init__(self, model_name, path=CACHE_PATH):
+        self.model_name = model_name
+        self.path = Path(path)
+        self.entries = {}
+        self._load()
+
+    def _load(self):
+        if not self.path.exists():
+            return
+        data = np.load(self.path, allow_pickle=False)
+        if str(data['model']) != self.model_name:
+            print(f"   ⚠️ 모델이 바뀌어 캐시를 무시합니다 ({data['model']})")
+            return
+        for post_id, digest, vector in zip(data['ids'], data['hashes'], data['vectors']):
+            self.entries[str(post_id)] = (str(digest), vector)
+
+    def __len__(self):
+        return len(self.entries)
+
+    def diff(self, post_ids, hashes):
+        """캐시에 없거나 해시가 바뀐 글의 인덱스 목록"""
+        missing = []
+        for i, (post_id, digest) in enumerate(zip(post_ids, hashes)):
+            entry = self.entries.get(post_id)
+            if entry is None or entry[0] != digest:
+                missing.append(i)
+        return missing
+
+    def put(self, post_id, digest, vector):
+        self.entries[post_id] = (digest, np.asarray(vector, dtype=np.float32))
+
+    def get_matrix(self, post_ids):
+        """post_ids 순서대로 쌓은 임베딩 행렬"""
+        return np.stack([self.entries[post_id][1] for post_id in post_ids])
+
+    def prune(self, post_ids):
+        """더 이상 존재하지 않는 글 제거"""
+        alive = set(post_ids)
+        for post_id in list(self.entries):
+            if post_id not in alive:
+                del self.entries[post_id]
+
+    def save(self):
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        ids = list(self.entries)
+        tmp_path = self.path.with_suffix('.tmp.npz')
+        np.savez(
+            tmp_path,
+            ids=np.array(ids, dtype=str),
+            hashes=np.array([self.entries[i][0] for i in ids], dtype=str),
+            vectors=self.get_matrix(ids) if ids else np.zeros((0, 0), dtype=np.float32),
+            model=np.array(self.model_name),
+        )
+        tmp_path.replace(self.path)
+
+
+def quantize_int8(embeddings):
+    """행별 대칭 int8 양자화 -> (codes, scales)"""
+    embeddings = np.asarray(embeddings, dtype=np.float32)
+    scales = np.abs(embeddings).max(axis=1) / 127.0
+    scales[scales == 0] = 1.0
+    codes = np.clip(np.rint(embeddings / scales[:, None]), -127, 127).astype(np.int8)
+    return codes, scales.astype(np.float32)
+
+
+def save_embeddings(output_dir, post_ids, embeddings, dtype='float16'):
+    """바이너리 임베딩 저장 -> 생성한 파일 경로 목록"""
+    if dtype not in EMBEDDING_DTYPES:
+        raise ValueError(f"지원하지 않는 dtype: {dtype}")
+    output_dir = Path(output_dir)
+    paths = [output_dir / EMBEDDINGS_NPY, output_dir / EMBEDDINGS_IDS_JSON]
+    scale_path = output_dir / EMBEDDINGS_SCALE_NPY
+
+    if dtype == 'int8':
+        codes, scales = quantize_int8(embeddings)
+        _save_npy(paths[0], codes)
+        _save_npy(scale_path, scales)
+        paths.append(scale_path)
+    else:
+        _save_npy(paths[0], np.asarray(embeddings, dtype=dtype))
+        if scale_path.exists():
+            scale_path.unlink()
+
+    tmp_path = paths[1].with_suffix('.json.tmp')
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump(list(post_ids), f)
+    tmp_path.replace(paths[1])
+    return paths
+
+
+def _save_npy(path, array):
+    tmp_path = path.with_suffix('.tmp.npy')
+    np.save(tmp_path, np.ascontiguousarray(array))
+    tmp_path.replace(path)
+
+
+def load_embeddings(output_dir, mmap=True, dequantize=True):
+    """바이너리 임베딩 로드 -> (post_ids, matrix)
+
+    mmap=True면 파일을 메모리 매핑합니다 (float16/float32는 복사 없음).
+    int8은 dequantize=True일 때 float32로 복원하고, False면 코드 그대로 반환합니다.
+    """
+    output_dir = Path(output_dir)
+    with open(output_dir / EMBEDDINGS_IDS_JSON, 'r', encoding='utf-8') as f:
+        post_ids = json.load(f)
+    matrix = np.load(output_dir / EMBEDDINGS_NPY, mmap_mode='r' if mmap else None)
+    if matrix.dtype == np.int8 and dequantize:
+        scales = np.load(output_dir / EMBEDDINGS_SCALE_NPY)
+        matrix = matrix.astype(np.float32) * scales[:, None]
+    return post_ids, matrix
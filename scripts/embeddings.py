@@ -0,0 +1,293 @@
+"""
+로컬 임베딩 생성 단계
+
+임베딩 캐시 확인 -> 바뀐 글만 인코딩 -> 바이너리 저장
+-> 유사도 매트릭스 (JSON + CSR) -> ANN 인덱스 -> 양자화 인덱스 순으로 진행합니다.
+
+pool 을 지정하면 청크 모드로 돌아갑니다 (chunk_store.py 참고).
+"""
+
+import hashlib
+import json
+import time
+from pathlib import Path
+
+import numpy as np
+
+from ann_index import ANN_INDEX_NPZ, IVFIndex
+from blog_data import CACHE_DIR
+from chunk_store import CHUNK_CACHE_PATH, ChunkCache, chunks_hash, pool_chunks, save_chunks
+import metrics
+from embedding_store import (
+    CACHE_PATH, EMBEDDINGS_NPY, EmbeddingCache, content_hash, load_embeddings, save_embeddings,
+)
+from parallel_encode import DEFAULT_BATCH_SIZE, encode_parallel, format_report
+from quantized_index import QUANTIZED_INDEX_NPZ, QuantizedIndex
+from similarity import (
+    DEFAULT_BLOCK_SIZE, SIMILARITY_BIN, duplicate_groups, save_similarity_csr, top_k_similar,
+    update_top_k_similar,
+)
+
+MODEL_NAME = 'paraphrase-multilingual-MiniLM-L12-v2'
+STUB_MODEL_NAME = 'stub-encoder'
+STUB_DIM = 384
+ENCODERS = ('model', 'stub')
+
+# 지난 빌드의 문서 벡터 방식 (바뀌면 유사도를 부분 갱신하지 않고 전체 계산)
+MODE_FILE = 'embeddings-mode.txt'
+# 지난 유사도 계산에 쓴 중복 묶음 {post_id: 대표} (묶음이 바뀐 글은 행을 다시 계산)
+GROUPS_FILE = 'similarity-groups.json'
+
+
+def load_model():
+    # sentence-transformers 설치 확인
+    try:
+        from sentence_transformers import SentenceTransformer
+    except ImportError:
+        print("sentence-transformers가 설치되어 있지 않습니다.")
+        print("설치 명령: pip install sentence-transformers")
+        exit(1)
+
+    print("   모델 로딩 중... (처음엔 다운로드 필요, ~500MB)")
+    return SentenceTransformer(MODEL_NAME)
+
+
+class StubModel:
+    """모델 없이 배치 모양만 흉내 내는 인코더 (벤치마크/오프라인용)
+
+    비용은 배치 최대 길이 x 배치 크기에 비례하고, 벡터는 텍스트 해시로 정해집니다.
+    """
+
+    def encode(self, texts, batch_size=DEFAULT_BATCH_SIZE, **kwargs):
+        vectors = np.zeros((len(texts), STUB_DIM), dtype=np.float32)
+        for start in range(0, len(texts), batch_size):
+            batch = texts[start:start + batch_size]
+            width = max(len(t) for t in batch)
+            padded = np.ones((len(batch), width, STUB_DIM // 4), dtype=np.float32)
+            pooled = padded.sum(axis=1)
+            for i, text in enumerate(batch):
+                seed = int(hashlib.sha1(text.encode('utf-8')).hexdigest()[:8], 16)
+                vectors[start + i] = np.random.default_rng(seed).standard_normal(STUB_DIM)
+                vectors[start + i, :STUB_DIM // 4] += pooled[i] / width
+        return vectors
+
+
+def load_stub_model():
+    return StubModel()
+
+
+def encoder_model(encoder):
+    """'model' / 'stub' -> (캐시에 기록할 모델 이름, 모델을 만드는 함수)"""
+    if encoder == 'stub':
+        return STUB_MODEL_NAME, load_stub_model
+    return MODEL_NAME, load_model
+
+
+def encode_texts(texts, workers=1, batch_size=DEFAULT_BATCH_SIZE, sort=True,
+                 model_factory=load_model):
+    """길이순 배치 + (workers > 1이면) 프로세스 풀로 인코딩, 원래 순서로 반환"""
+    def progress(done, total):
+        print(f"   인코딩: {done}/{total} ({100*done/total:.1f}%)")
+
+    with metrics.span('embeddings/encode', rows=len(texts)):
+        vectors, report = encode_parallel(
+            texts, model_factory, workers=workers, batch_size=batch_size, sort=sort,
+            progress=progress,
+        )
+    print(f"   {format_report(report)}")
+    return vectors
+
+
+def _post_embeddings(post_ids, texts, full, workers, batch_size, encoder, cache_dir):
+    """제목 + 본문 앞 500자 임베딩 -> (행렬, 다시 인코딩한 인덱스, 이전 캐시 크기, 캐시)
+
+    캐시는 저장하지 않고 돌려줍니다 (유사도 산출물을 쓴 뒤 build_embeddings 에서 저장).
+    """
+    print("\n1. 임베딩 캐시 확인 중...")
+    hashes = [content_hash(t) for t in texts]
+
+    model_name, model_factory = encoder_model(encoder)
+    cache = EmbeddingCache(model_name, path=Path(cache_dir) / CACHE_PATH.name)
+    cached_before = len(cache)
+    missing = list(range(len(post_ids))) if full else cache.diff(post_ids, hashes)
+    print(f"   ✅ 캐시 {cached_before}개, 새로 인코딩할 글 {len(missing)}개")
+
+    print("\n2. 임베딩 생성 중...")
+    if missing:
+        new_embeddings = encode_texts(
+            [texts[i] for i in missing], workers=workers, batch_size=batch_size,
+            model_factory=model_factory,
+        )
+        for i, vector in zip(missing, new_embeddings):
+            cache.put(post_ids[i], hashes[i], vector)
+    cache.prune(post_ids)
+    return cache.get_matrix(post_ids), missing, cached_before, cache
+
+
+def _chunk_embeddings(post_ids, chunks, spans, output_dir, pool, full, workers, batch_size,
+                      encoder, cache_dir):
+    """청크 임베딩 + 풀링 -> (문서 행렬, 다시 인코딩한 인덱스, 이전 캐시 크기, 캐시)"""
+    print("\n1. 청크 캐시 확인 중...")
+    hashes = [chunks_hash(texts) for texts in chunks]
+
+    model_name, model_factory = encoder_model(encoder)
+    cache = ChunkCache(model_name, path=Path(cache_dir) / CHUNK_CACHE_PATH.name)
+    cached_before = len(cache)
+    missing = list(range(len(post_ids))) if full else cache.diff(post_ids, hashes)
+    chunk_count = sum(len(chunks[i]) for i in missing)
+    print(f"   ✅ 캐시 {cached_before}개, 새로 인코딩할 글 {len(missing)}개 (청크 {chunk_count}개)")
+
+    print("\n2. 청크 임베딩 생성 중...")
+    if missing:
+        vectors = encode_texts(
+            [text for i in missing for text in chunks[i]], workers=workers, batch_size=batch_size,
+            model_factory=model_factory,
+        )
+        start = 0
+        for i in missing:
+            cache.put(post_ids[i], hashes[i], vectors[start:start + len(chunks[i])])
+            start += len(chunks[i])
+    cache.prune(post_ids)
+
+    vectors, counts = cache.get_chunks(post_ids)
+    paths = save_chunks(output_dir, vectors, counts, [span for post in spans for span in post])
+    size = sum(p.stat().st_size for p in paths) / (1024 * 1024)
+    print(f"   ✅ 청크 {len(vectors)}개 저장 (글당 평균 {counts.mean():.1f}개, {size:.1f}MB)")
+    return pool_chunks(vectors, counts, pool), missing, cached_before, cache
+
+
+def build_embeddings(post_ids, texts, output_dir, block_size=DEFAULT_BLOCK_SIZE,
+                     full=False, dtype='float16', write_json=False, workers=1,
+                     batch_size=DEFAULT_BATCH_SIZE, pool=None, spans=None, quantization='pq',
+                     encoder='model', cache_dir=CACHE_DIR, canonical=None):
+    """post_ids/texts (최신순) -> public/data 임베딩 산출물
+
+    pool('mean'/'max')을 주면 texts는 글별 청크 텍스트 목록, spans는 청크 글자 범위입니다.
+    encoder='stub'이면 모델 없이 StubModel로 인코딩합니다 (캐시는 모델 이름으로 분리됨).
+    canonical({post_id: 대표 post_id}, near-duplicates.json)을 주면 유사 글 목록에서
+    중복 묶음을 접어 묶음마다 하나씩, 서로 다른 이웃 k개를 남깁니다.
+    """
+    output_dir = Path(output_dir)
+    output_dir.mkdir(parents=True, exist_ok=True)
+    if not post_ids:
+        print("   ⚠️ 임베딩할 글이 없습니다.")
+        return None
+
+    # 캐시와 비교 -> 바뀐 글만 인코딩 (모델은 필요할 때만 로딩)
+    if pool:
+        embeddings, missing, cached_before, cache = _chunk_embeddings(
+            post_ids, texts, spans, output_dir, pool, full, workers, batch_size,
+            encoder, cache_dir,
+        )
+    else:
+        embeddings, missing, cached_before, cache = _post_embeddings(
+            post_ids, texts, full, workers, batch_size, encoder, cache_dir
+        )
+    print(f"   ✅ 임베딩 준비 완료! Shape: {embeddings.shape}")
+
+    mode = f'chunks-{pool}' if pool else 'first-500'
+    mode_path = Path(cache_dir) / MODE_FILE
+    previous_mode = mode_path.read_text().strip() if mode_path.exists() else mode
+    if previous_mode != mode:
+        print(f"   문서 벡터 방식 변경 ({previous_mode} -> {mode}), 유사도 전체 재계산")
+        cached_before = 0
+
+    # 임베딩 저장 (바이너리, 필요하면 JSON 호환 출력)
+    print("\n3. 임베딩 저장 중...")
+    with metrics.span('embeddings/serialize', rows=len(post_ids)):
+        npy_paths = save_embeddings(output_dir, post_ids, embeddings, dtype=dtype)
+    npy_size = sum(p.stat().st_size for p in npy_paths) / (1024 * 1024)
+
+    # json.load 와 공정하게 비교하도록 전체 행렬을 float32 로 읽어 들임
+    start = time.perf_counter()
+    _, mapped = load_embeddings(output_dir)
+    np.asarray(mapped, dtype=np.float32).sum()
+    npy_load = time.perf_counter() - start
+    print(f"   ✅ {EMBEDDINGS_NPY} 저장 완료! ({dtype}, {npy_size:.1f}MB, 로드 {npy_load*1000:.1f}ms)")
+
+    if write_json:
+        # 예전 형식 (소수점 5자리로 압축)
+        embeddings_data = []
+        for i, post_id in enumerate(post_ids):
+            embeddings_data.append({
+                'id': post_id,
+                'embedding': [round(float(v), 5) for v in embeddings[i]]
+            })
+
+        embeddings_path = output_dir / 'embeddings.json'
+        with open(embeddings_path, 'w', encoding='utf-8') as f:
+            json.dump(embeddings_data, f)
+
+        start = time.perf_counter()
+        with open(embeddings_path, 'r', encoding='utf-8') as f:
+            json.load(f)
+        json_load = time.perf_counter() - start
+
+        file_size = embeddings_path.stat().st_size / (1024 * 1024)
+        print(f"   ✅ embeddings.json 저장 완료! ({file_size:.1f}MB, 로드 {json_load*1000:.1f}ms)")
+        print(f"   크기 {file_size / npy_size:.1f}배 감소, 로드 {json_load / max(npy_load, 1e-9):.0f}배 빠름")
+
+    # 유사도 매트릭스 생성
+    print("\n4. 유사도 매트릭스 생성 중...")
+    def report(done, total):
+        print(f"   진행: {done}/{total} ({100*done/total:.1f}%)")
+
+    canonical = canonical or {}
+    groups = duplicate_groups(post_ids, canonical) if canonical else None
+    groups_path = Path(cache_dir) / GROUPS_FILE
+    previous_canonical = {}
+    if groups_path.exists():
+        with open(groups_path, 'r', encoding='utf-8') as f:
+            previous_canonical = json.load(f)
+
+    similarity_path = output_dir / 'similarity-matrix.json'
+    with metrics.span('embeddings/similarity', rows=len(post_ids)):
+        if full or cached_before == 0 or not similarity_path.exists():
+            similarity_matrix = top_k_similar(
+                embeddings, post_ids, k=10, block_size=block_size, progress=report,
+                groups=groups,
+            )
+        else:
+            with open(similarity_path, 'r', encoding='utf-8') as f:
+                previous = json.load(f)
+            regrouped = {post_id for post_id in set(canonical) | set(previous_canonical)
+                         if canonical.get(post_id) != previous_canonical.get(post_id)}
+            changed_ids = sorted({post_ids[i] for i in missing} | regrouped)
+            similarity_matrix, full_rows, merged_rows = update_top_k_similar(
+                previous, embeddings, post_ids, changed_ids,
+                k=10, block_size=block_size, progress=report, groups=groups,
+            )
+            print(f"   재계산 {full_rows}행, 부분 갱신 {merged_rows}행")
+
+    with metrics.span('embeddings/serialize', rows=len(similarity_matrix)):
+        with open(similarity_path, 'w', encoding='utf-8') as f:
+            json.dump(similarity_matrix, f)
+        print(f"   ✅ similarity-matrix.json 저장 완료!")
+
+        bin_path, _ = save_similarity_csr(output_dir, similarity_matrix)
+    bin_size = bin_path.stat().st_size / (1024 * 1024)
+    print(f"   ✅ {SIMILARITY_BIN} 저장 완료! ({bin_size:.1f}MB)")
+    # 캐시는 유사도 산출물을 다 쓴 뒤에 저장 (중간에 죽으면 다음 실행에서 바뀐 글을 다시 찾도록)
+    cache.save()
+    mode_path.parent.mkdir(parents=True, exist_ok=True)
+    mode_path.write_text(mode)
+    with open(groups_path, 'w', encoding='utf-8') as f:
+        json.dump(canonical, f)
+
+    # ANN 인덱스 (임의 쿼리/임의 k 검색용)
+    print("\n5. ANN 인덱스 생성 중...")
+    with metrics.span('embeddings/ann', rows=len(post_ids)):
+        index = IVFIndex.build(embeddings, post_ids)
+        index.save(output_dir / ANN_INDEX_NPZ)
+    print(f"   ✅ {ANN_INDEX_NPZ} 저장 완료! (nlist={index.nlist})")
+
+    # 양자화 인덱스 (저메모리 서빙용, 후보만 embeddings.npy로 재정렬)
+    print("\n6. 양자화 인덱스 생성 중...")
+    with metrics.span('embeddings/quantize', rows=len(post_ids)):
+        quantized = QuantizedIndex.build(embeddings, post_ids, method=quantization)
+        quantized.save(output_dir / QUANTIZED_INDEX_NPZ)
+    print(f"   ✅ {QUANTIZED_INDEX_NPZ} 저장 완료! ({quantization}, "
+          f"{quantized.nbytes / (1024 * 1024):.1f}MB, float32 대비 "
+          f"{embeddings.shape[0] * embeddings.shape[1] * 4 / quantized.nbytes:.1f}배 작음)")
+
+    return embeddings
@@ -0,0 +1,402 @@
+"""
+SQLite -> Firestore 마이그레이션 엔진
+
+- posts / summaries 를 post_id 순으로 fetchmany 스트리밍 (본문을 모아두지 않음)
+- 400개 단위 batch를 스레드 풀로 여러 개 동시에 commit
+  (동시에 떠 있는 batch 수를 제한해서 메모리 사용량이 일정)
+- 앞선 batch가 모두 commit된 지점의 마지막 post_id를 체크포인트로 저장
+  -> 중간에 죽어도 다음 실행에서 그 다음부터 이어서 진행
+- docs/sec 보고 (metrics.py 실행 리포트에 upload/<phase> 구간과 batch 수 기록)
+
+sync_delta() 는 문서마다 지문(fingerprint)을 계산해 로컬 매니페스트
+(.cache/firestore-manifest.json)와 비교하고, 추가/변경/삭제된 문서만 씁니다.
+삭제는 매니페스트에 있던(= 이 스크립트가 올린) 문서만 대상이라
+RSS 동기화(/api/sync)가 직접 넣은 글은 건드리지 않습니다.
+
+Firestore 대신 FakeFirestore(메모리)를 넘기면 테스트할 수 있고,
+FIRESTORE_EMULATOR_HOST 를 설정하면 firebase_admin이 에뮬레이터로 붙습니다.
+"""
+
+import hashlib
+import json
+import os
+import threading
+import time
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+
+from blog_data import CACHE_DIR, FETCH_SIZE, SCRIPT_DIR, remap_category, should_hide, write_json
+import metrics
+
+BATCH_SIZE = 400  # Firestore batch는 500개 제한
+DEFAULT_WORKERS = 4
+CHECKPOINT_PATH = CACHE_DIR / 'firestore-checkpoint.json'
+MANIFEST_PATH = CACHE_DIR / 'firestore-manifest.json'
+KEY_PATH = SCRIPT_DIR / 'firebase-admin-key.json'
+
+POSTS_SQL = '''
+    SELECT id, post_id, title, category, pub_date, content, char_count
+    FROM posts
+    WHERE post_id > ?
+    ORDER BY post_id
+'''
+
+SUMMARIES_SQL = '''
+    SELECT s.post_id, s.summary, s.keywords, p.category
+    FROM summaries s
+    LEFT JOIN posts p ON p.post_id = s.post_id
+    WHERE s.post_id > ?
+    ORDER BY s.post_id
+'''
+
+PHASES = ('posts', 'summaries')
+
+
+def firestore_client():
+    """Firestore 클라이언트 (처음 호출할 때 초기화)
+
+    FIRESTORE_EMULATOR_HOST 가 있으면 서비스 계정 키 없이 에뮬레이터에 붙습니다.
+    """
+    import firebase_admin
+    from firebase_admin import credentials, firestore
+
+    try:
+        firebase_admin.get_app()
+    except ValueError:
+        if os.getenv('FIRESTORE_EMULATOR_HOST'):
+            project_id = os.getenv('GCLOUD_PROJECT', 'demo-irepublic-brain')
+            firebase_admin.initialize_app(options={'projectId': project_id})
+        else:
+            firebase_admin.initialize_app(credentials.Certificate(str(KEY_PATH)))
+    return firestore.client()
+
+
+def iter_rows(conn, sql, after='', fetch_size=FETCH_SIZE):
+    cursor = conn.cursor()
+    cursor.execute(sql, (after,))
+    while True:
+        rows = cursor.fetchmany(fetch_size)
+        if not rows:
+            break
+        yield from rows
+
+
+def document_fingerprint(doc):
+    """문서 내용 해시 (fingerprint 필드 자신은 제외)"""
+    payload = json.dumps({k: v for k, v in doc.items() if k != 'fingerprint'},
+                         ensure_ascii=False, sort_keys=True)
+    return hashlib.sha1(payload.encode('utf-8')).hexdigest()
+
+
+def post_document(row):
+    row_id, post_id, title, category, pub_date, content, char_count = row
+    doc = {
+        'id': row_id,
+        'post_id': post_id,
+        'title': title,
+        'category': remap_category(category),
+        'pub_date': pub_date,
+        'content': content,
+        'char_count': char_count
+    }
+    doc['fingerprint'] = document_fingerprint(doc)
+    return doc
+
+
+def summary_document(row):
+    post_id, summary, keywords, _ = row
+    return {
+        'post_id': post_id,
+        'summary': summary,
+        'keywords': keywords
+    }
+
+
+class Checkpoint:
+    """{'phase': 'posts'|'summaries', 'last': post_id} 저장"""
+
+    def __init__(self, path=CHECKPOINT_PATH):
+        self.path = path
+        self.phase = PHASES[0]
+        self.last = ''
+        if path and path.exists():
+            with open(path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+            self.phase, self.last = data['phase'], data['last']
+
+    def save(self, phase, last):
+        self.phase, self.last = phase, last
+        if self.path:
+            write_json(self.path, {'phase': phase, 'last': last})
+
+    def clear(self):
+        self.phase, self.last = PHASES[0], ''
+        if self.path and self.path.exists():
+            self.path.unlink()
+
+
+class BatchWriter:
+    """batch를 동시에 commit하면서 '연속으로 끝난 지점'을 추적"""
+
+    def __init__(self, db, batch_size=BATCH_SIZE, workers=DEFAULT_WORKERS, on_progress=None):
+        self.db = db
+        self.batch_size = batch_size
+        self.pool = ThreadPoolExecutor(max_workers=workers)
+        self.slots = threading.Semaphore(workers * 2)
+        self.on_progress = on_progress
+        self.lock = threading.Lock()
+        self.ops = []
+        self.last_key = None
+        self.next_seq = 0
+        self.done = {}
+        self.frontier = 0
+        self.futures = []
+        self.committed = 0
+        self.error = None
+
+    def set(self, collection, doc_id, data, key=None):
+        self._add(('set', collection, doc_id, data), key)
+
+    def delete(self, collection, doc_id, key=None):
+        self._add(('delete', collection, doc_id, None), key)
+
+    def _add(self, op, key):
+        self.ops.append(op)
+        self.last_key = key
+        if len(self.ops) >= self.batch_size:
+            self.flush()
+
+    def flush(self):
+        if self.error:
+            raise self.error
+        if not self.ops:
+            return
+        ops, key, seq = self.ops, self.last_key, self.next_seq
+        self.ops = []
+        self.next_seq += 1
+        self.slots.acquire()  # 동시에 떠 있는 batch 수 제한
+        self.futures.append(self.pool.submit(self._commit, seq, ops, key))
+
+    def _commit(self, seq, ops, key):
+        try:
+            batch = self.db.batch()
+            for action, collection, doc_id, data in ops:
+                ref = self.db.collection(collection).document(doc_id)
+                if action == 'set':
+                    batch.set(ref, data)
+                else:
+                    batch.delete(ref)
+            batch.commit()
+        except Exception as e:
+            self.error = e
+            raise
+        finally:
+            self.slots.release()
+
+        with self.lock:
+            metrics.count('firestore/batches')
+            metrics.count('firestore/ops', len(ops))
+            self.committed += len(ops)
+            self.done[seq] = key
+            last = None
+            while self.frontier in self.done:
+                last = self.done.pop(self.frontier)
+                self.frontier += 1
+            if last is not None and self.on_progress:
+                self.on_progress(last, self.committed)
+
+    def close(self):
+        """남은 batch commit 후 모두 끝날 때까지 대기 (실패가 있으면 예외)"""
+        try:
+            self.flush()
+            for future in self.futures:
+                future.result()
+        finally:
+            self.pool.shutdown(wait=True)
+
+
+def migrate_phase(db, conn, phase, checkpoint, batch_size=BATCH_SIZE,
+                  workers=DEFAULT_WORKERS, fetch_size=FETCH_SIZE):
+    """posts 또는 summaries 한 단계 -> (쓴 문서 수, 스킵 수)"""
+    after = checkpoint.last if checkpoint.phase == phase else ''
+    start = time.perf_counter()
+    report_every = batch_size * 10
+    last_report = [0]
+
+    def on_progress(last, committed):
+        checkpoint.save(phase, last)
+        if committed - last_report[0] >= report_every:
+            last_report[0] = committed
+            rate = committed / (time.perf_counter() - start)
+            print(f'  - {committed}개 처리중... ({rate:.0f} docs/sec)')
+
+    writer = BatchWriter(db, batch_size, workers, on_progress)
+    written = skipped = 0
+    with metrics.span(f'upload/{phase}') as upload:
+        try:
+            if phase == 'posts':
+                for row in iter_rows(conn, POSTS_SQL, after, fetch_size):
+                    # 숨김 카테고리 필터링
+                    if should_hide(row[3]):
+                        skipped += 1
+                        continue
+                    writer.set('posts', row[1], post_document(row), row[1])
+                    written += 1
+            else:
+                for row in iter_rows(conn, SUMMARIES_SQL, after, fetch_size):
+                    # 해당 포스트가 숨김 카테고리인지 확인
+                    if should_hide(row[3]):
+                        skipped += 1
+                        continue
+                    writer.set('summaries', row[0], summary_document(row), row[0])
+                    written += 1
+        finally:
+            writer.close()
+            upload.add_rows(written)
+
+    elapsed = time.perf_counter() - start
+    rate = written / elapsed if elapsed else 0.0
+    print(f'  - 총 {written}개 완료 ({skipped}개 스킵, {elapsed:.1f}s, {rate:.0f} docs/sec)')
+    return written, skipped
+
+
+def migrate(db, conn, checkpoint, batch_size=BATCH_SIZE, workers=DEFAULT_WORKERS,
+            fetch_size=FETCH_SIZE):
+    """체크포인트부터 이어서 posts -> summaries 마이그레이션"""
+    if checkpoint.last:
+        print(f'체크포인트에서 이어서 진행: {checkpoint.phase} > {checkpoint.last}\n')
+
+    results = {}
+    titles = {'posts': '1. Posts 테이블 마이그레이션...', 'summaries': '2. Summaries 테이블 마이그레이션...'}
+    first = PHASES.index(checkpoint.phase)
+    for i, phase in enumerate(PHASES[first:], first):
+        print(titles[phase])
+        results[phase] = migrate_phase(db, conn, phase, checkpoint, batch_size, workers, fetch_size)
+        if i + 1 < len(PHASES):
+            checkpoint.save(PHASES[i + 1], '')
+        print()
+
+    checkpoint.clear()
+    return results
+
+
+def load_manifest(path=MANIFEST_PATH):
+    """{'posts': {post_id: fingerprint}, 'summaries': {...}}"""
+    manifest = {phase: {} for phase in PHASES}
+    if path and path.exists():
+        with open(path, 'r', encoding='utf-8') as f:
+            manifest.update(json.load(f))
+    return manifest
+
+
+def sync_delta(db, conn, manifest_path=MANIFEST_PATH, batch_size=BATCH_SIZE,
+               workers=DEFAULT_WORKERS, fetch_size=FETCH_SIZE, dry_run=False,
+               update_manifest=True):
+    """매니페스트와 지문이 다른 문서만 쓰고, 사라진 문서는 삭제
+
+    -> {'posts': {'added', 'updated', 'deleted', 'unchanged'}, 'summaries': {...}}
+    매니페스트는 모든 batch가 성공한 뒤에만 저장합니다 (dry_run / update_manifest=False 면 저장 안 함).
+    (중간에 실패하면 다음 실행에서 같은 변경을 다시 씁니다. set/delete는 멱등)
+    """
+    previous = load_manifest(manifest_path)
+    current = {phase: {} for phase in PHASES}
+    diff = {phase: {'added': 0, 'updated': 0, 'deleted': 0, 'unchanged': 0} for phase in PHASES}
+    start = time.perf_counter()
+
+    sources = {
+        'posts': (POSTS_SQL, 3, 1, post_document),
+        'summaries': (SUMMARIES_SQL, 3, 0, summary_document),
+    }
+    writer = None if dry_run else BatchWriter(db, batch_size, workers)
+    with metrics.span('upload/delta') as upload:
+        try:
+            for phase in PHASES:
+                sql, category_col, id_col, to_document = sources[phase]
+                seen, counts = current[phase], diff[phase]
+                old = previous[phase]
+                for row in iter_rows(conn, sql, '', fetch_size):
+                    if should_hide(row[category_col]):
+                        continue
+                    doc_id = row[id_col]
+                    doc = to_document(row)
+                    fp = doc['fingerprint'] if phase == 'posts' else document_fingerprint(doc)
+                    seen[doc_id] = fp
+                    if old.get(doc_id) == fp:
+                        counts['unchanged'] += 1
+                        continue
+                    counts['updated' if doc_id in old else 'added'] += 1
+                    if writer:
+                        writer.set(phase, doc_id, doc)
+
+                # 지난번에 올렸는데 이번에 없는 문서 (DB에서 삭제 / 숨김 카테고리로 이동)
+                for doc_id in old.keys() - seen.keys():
+                    counts['deleted'] += 1
+                    if writer:
+                        writer.delete(phase, doc_id)
+        finally:
+            if writer:
+                writer.close()
+            upload.add_rows(sum(c['added'] + c['updated'] + c['deleted'] for c in diff.values()))
+
+    elapsed = time.perf_counter() - start
+    writes = sum(c['added'] + c['updated'] + c['deleted'] for c in diff.values())
+    print(f"{'변경 사항 (dry-run)' if dry_run else '변경 사항'}:")
+    for phase in PHASES:
+        c = diff[phase]
+        print(f"  - {phase}: +{c['added']} ~{c['updated']} -{c['deleted']} "
+              f"(변경 없음 {c['unchanged']}개)")
+    print(f"  - 쓰기 {writes}회 ({elapsed:.1f}s)")
+
+    if update_manifest and not dry_run and manifest_path:
+        write_json(manifest_path, current)
+    return diff
+
+
+class FakeFirestore:
+    """테스트용 메모리 Firestore (collection/document/batch set·delete 만 흉내)"""
+
+    def __init__(self, latency=0.0, fail_after=None):
+        self.latency = latency
+        self.fail_after = fail_after
+        self.data = defaultdict(dict)
+        self.commits = 0
+        self._lock = threading.Lock()
+
+    def collection(self, name):
+        return _FakeCollection(self, name)
+
+    def batch(self):
+        return _FakeBatch(self)
+
+
+class _FakeCollection:
+    def __init__(self, store, name):
+        self.store = store
+        self.name = name
+
+    def document(self, doc_id):
+        return (self.name, doc_id)
+
+
+class _FakeBatch:
+    def __init__(self, store):
+        self.store = store
+        self.ops = []
+
+    def set(self, ref, data):
+        self.ops.append((ref, data))
+
+    def delete(self, ref):
+        self.ops.append((ref, None))
+
+    def commit(self):
+        time.sleep(self.store.latency)
+        with self.store._lock:
+            if self.store.fail_after is not None and self.store.commits >= self.store.fail_after:
+                raise RuntimeError('FakeFirestore: 의도된 실패')
+            for (collection, doc_id), data in self.ops:
+                if data is None:
+                    self.store.data[collection].pop(doc_id, None)
+                else:
+                    self.store.data[collection][doc_id] = data
+            self.store.commits += 1
@@ -3,138 +3,77 @@
 로컬 임베딩 생성 스크립트
 사용법:
   1. pip install sentence-transformers
-  2. python scripts/generate-local-embeddings.py
+  2. python scripts/generate-local-embeddings.py [--block-size 1024] [--full]
+                                                 [--dtype float16|float32|int8] [--json]
+                                                 [--workers 4] [--batch-size 64]
+                                                 [--chunks mean|max] [--quantization pq|int8]
+
+평소에는 .cache/embeddings-cache.npz 에 저장된 임베딩을 재사용하고
+새 글/내용이 바뀐 글만 인코딩합니다. 인코딩은 길이순으로 배치를 묶고
+--workers > 1이면 워커마다 모델을 올려 프로세스 풀로 나눠 돌립니다 (parallel_encode.py). 유사도 매트릭스도 영향받는 행만 갱신합니다.
 
 출력:
-  - public/data/embeddings.json
-  - public/data/similarity-matrix.json
+  - public/data/embeddings.npy (+ embeddings-ids.json, int8이면 embeddings-scale.npy)
+  - public/data/embeddings.json (--json 일 때만)
+  - public/data/similarity-matrix.json (호환용)
+  - public/data/similarity-matrix.bin + similarity-ids.json (CSR, API 조회용)
+    (near-duplicates.json 의 중복 묶음은 행마다 하나씩만 이웃으로 남김, 그래서 dedupe 단계도 함께 실행)
+  - public/data/ann-index.npz (IVF 근사 검색 인덱스, ann_index.py 참고)
+  - public/data/quantized-index.npz (PQ/int8 코드, quantized_index.py 참고)
+  - public/data/chunk-embeddings.npy + chunk-offsets.npy + chunk-spans.npy
+    (--chunks 일 때만, 문단 단위 검색용, chunk_store.py 참고)
+
+실제 처리는 embeddings.py (pipeline.py 의 embeddings 단계)에 있습니다.
 """
 
-import json
-import sqlite3
-import os
-import numpy as np
-from pathlib import Path
-
-# sentence-transformers 설치 확인
-try:
-    from sentence_transformers import SentenceTransformer
-except ImportError:
-    print("sentence-transformers가 설치되어 있지 않습니다.")
-    print("설치 명령: pip install sentence-transformers")
-    exit(1)
-
-# 경로 설정
-SCRIPT_DIR = Path(__file__).parent
-PROJECT_DIR = SCRIPT_DIR.parent
-DB_PATH = Path.home() / 'Desktop/AI/indiebizOS/data/packages/installed/tools/blog/data/blog_insight.db'
-OUTPUT_DIR = PROJECT_DIR / 'public/data'
-
-def cosine_similarity(a, b):
-    """코사인 유사도 계산"""
-    return np.dot(a, b) / (np.linalg.norm(a) * np.linalg.norm(b))
-
-def find_top_k_similar(embeddings, post_ids, target_idx, k=10):
-    """Top-K 유사 글 찾기"""
-    target_emb = embeddings[target_idx]
-    scores = []
-
-    for i, emb in enumerate(embeddings):
-        if i == target_idx:
-            continue
-        score = cosine_similarity(target_emb, emb)
-        scores.append((post_ids[i], float(score)))
-
-    scores.sort(key=lambda x: x[1], reverse=True)
-    return [{'id': s[0], 'score': round(s[1], 4)} for s in scores[:k]]
+import argparse
+
+from embedding_store import EMBEDDING_DTYPES
+from chunk_store import POOL_MODES
+from parallel_encode import DEFAULT_BATCH_SIZE
+from quantized_index import QUANTIZATION_METHODS
+from pipeline import run_pipeline
+from similarity import DEFAULT_BLOCK_SIZE
+
+def parse_args():
+    parser = argparse.ArgumentParser(description='로컬 임베딩 + 유사도 매트릭스 생성')
+    parser.add_argument('--block-size', type=int, default=DEFAULT_BLOCK_SIZE,
+                        help='유사도 계산 시 한 번에 처리할 행 수 (메모리 ~ block x N x 4B)')
+    parser.add_argument('--full', action='store_true',
+                        help='캐시를 무시하고 전체 임베딩/유사도를 다시 계산')
+    parser.add_argument('--dtype', choices=EMBEDDING_DTYPES, default='float16',
+                        help='embeddings.npy 저장 형식')
+    parser.add_argument('--json', action='store_true',
+                        help='예전 embeddings.json도 함께 출력 (호환용)')
+    parser.add_argument('--quantization', choices=QUANTIZATION_METHODS, default='pq',
+                        help='quantized-index.npz 양자화 방식 (product quantization / int8)')
+    parser.add_argument('--chunks', choices=POOL_MODES, default=None,
+                        help='본문 전체를 겹치는 청크(500자, 100자 겹침)로 인코딩하고 mean/max 풀링')
+    parser.add_argument('--workers', type=int, default=1,
+                        help='인코딩 프로세스 수 (워커마다 모델 1개, ~500MB)')
+    parser.add_argument('--batch-size', type=int, default=DEFAULT_BATCH_SIZE,
+                        help='model.encode 배치 크기')
+    return parser.parse_args()
 
 def main():
-    # 출력 디렉토리 생성
-    OUTPUT_DIR.mkdir(parents=True, exist_ok=True)
-
-    # DB 확인
-    if not DB_PATH.exists():
-        print(f"DB 파일을 찾을 수 없습니다: {DB_PATH}")
-        exit(1)
+    args = parse_args()
 
     print("=" * 50)
     print("🧠 사유의 뇌 - 로컬 임베딩 생성")
     print("=" * 50)
 
-    # 모델 로딩
-    print("\n1. 모델 로딩 중... (처음엔 다운로드 필요, ~500MB)")
-    model = SentenceTransformer('paraphrase-multilingual-MiniLM-L12-v2')
-    print("   ✅ 모델 로딩 완료!")
-
-    # DB에서 글 로드
-    print("\n2. DB에서 글 로드 중...")
-    conn = sqlite3.connect(DB_PATH)
-    cursor = conn.cursor()
-    cursor.execute("""
-        SELECT post_id, title, content
-        FROM posts
-        WHERE content IS NOT NULL AND content != ''
-        ORDER BY pub_date DESC
-    """)
-    posts = cursor.fetchall()
-    conn.close()
-    print(f"   ✅ {len(posts)}개 글 로드 완료!")
-
-    # 텍스트 준비
-    print("\n3. 임베딩 생성 중...")
-    texts = [f"{p[1]}\n\n{(p[2] or '')[:500]}" for p in posts]
-    post_ids = [p[0] for p in posts]
-
-    # 배치 임베딩 생성
-    embeddings = model.encode(
-        texts,
-        show_progress_bar=True,
-        batch_size=64,
-        convert_to_numpy=True
-    )
-    print(f"   ✅ 임베딩 생성 완료! Shape: {embeddings.shape}")
-
-    # 임베딩 저장 (소수점 5자리로 압축)
-    print("\n4. 임베딩 저장 중...")
-    embeddings_data = []
-    for i, post_id in enumerate(post_ids):
-        embeddings_data.append({
-            'id': post_id,
-            'embedding': [round(float(v), 5) for v in embeddings[i]]
-        })
-
-    embeddings_path = OUTPUT_DIR / 'embeddings.json'
-    with open(embeddings_path, 'w', encoding='utf-8') as f:
-        json.dump(embeddings_data, f)
-
-    file_size = embeddings_path.stat().st_size / (1024 * 1024)
-    print(f"   ✅ embeddings.json 저장 완료! ({file_size:.1f}MB)")
-
-    # 유사도 매트릭스 생성
-    print("\n5. 유사도 매트릭스 생성 중...")
-    similarity_matrix = []
-    total = len(post_ids)
-
-    for i, post_id in enumerate(post_ids):
-        if i % 500 == 0:
-            print(f"   진행: {i}/{total} ({100*i/total:.1f}%)")
-        similar = find_top_k_similar(embeddings, post_ids, i, k=10)
-        similarity_matrix.append({
-            'id': post_id,
-            'similar': similar
-        })
-
-    similarity_path = OUTPUT_DIR / 'similarity-matrix.json'
-    with open(similarity_path, 'w', encoding='utf-8') as f:
-        json.dump(similarity_matrix, f)
-    print(f"   ✅ similarity-matrix.json 저장 완료!")
-
-    # 완료
-    print("\n" + "=" * 50)
-    print("🎉 완료!")
-    print(f"   - embeddings.json: {len(embeddings_data)}개 글")
-    print(f"   - similarity-matrix.json: {len(similarity_matrix)}개 유사도")
-    print("=" * 50)
+    run_pipeline(['embeddings'], force=True, options={
+        'block_size': args.block_size,
+        'full': args.full,
+        'dtype': args.dtype,
+        'json': args.json,
+        'chunks': args.chunks,
+        'quantization': args.quantization,
+        'encode_workers': args.workers,
+        'batch_size': args.batch_size,
+    })
+
+    print("\n🎉 완료!")
 
 if __name__ == '__main__':
     main()
@@ -0,0 +1,40 @@
+#!/usr/bin/env python3
+"""
+브레인 네트워크 그래프 생성 스크립트
+사용법:
+  1. python scripts/generate-local-embeddings.py  (유사도 매트릭스)
+  2. python scripts/generate-network-graph.py [--edges threshold|mutual|backbone]
+
+출력:
+  - public/data/network/index.json (구간 목록)
+  - public/data/network/{recent,year-YYYY,category-N}.json ({nodes, links, stats})
+
+/api/network?window=recent 가 이 파일들을 그대로 스트리밍합니다.
+실제 처리는 network_graph.py (pipeline.py 의 network 단계)에 있습니다.
+"""
+
+import argparse
+
+from network_graph import EDGE_MODES
+from pipeline import run_pipeline
+
+def parse_args():
+    parser = argparse.ArgumentParser(description='브레인 네트워크 그래프 생성')
+    parser.add_argument('--edges', choices=EDGE_MODES, default='threshold',
+                        help='threshold: 유사도 0.5 이상 전부, mutual: 서로의 top-k, '
+                             'backbone: 최대 신장 숲 (큰 구간용)')
+    return parser.parse_args()
+
+def main():
+    args = parse_args()
+
+    print("=" * 50)
+    print("🕸️ 사유의 뇌 - 네트워크 그래프 생성")
+    print("=" * 50)
+
+    run_pipeline(['network'], force=True, options={'network_edges': args.edges})
+
+    print("\n🎉 완료!")
+
+if __name__ == '__main__':
+    main()
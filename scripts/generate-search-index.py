@@ -0,0 +1,45 @@
+#!/usr/bin/env python3
+"""
+검색 인덱스 생성 스크립트
+사용법:
+  python scripts/generate-search-index.py
+  python scripts/generate-search-index.py --query "인공지능 교육"   # 생성 후 검색해 보기
+
+출력:
+  - public/data/search-index.npz (글자 2-gram BM25 역색인)
+
+실제 처리는 search_index.py (pipeline.py 의 search 단계)에 있습니다.
+"""
+
+import argparse
+
+from blog_data import OUTPUT_DIR
+from pipeline import run_pipeline
+from search_index import SEARCH_INDEX_NPZ, SearchIndex
+
+def parse_args():
+    parser = argparse.ArgumentParser(description='전문 검색 인덱스 생성')
+    parser.add_argument('--query', nargs='*', default=[], help='생성 후 시험 삼아 검색할 질의')
+    parser.add_argument('-k', type=int, default=10)
+    return parser.parse_args()
+
+def main():
+    args = parse_args()
+
+    print("=" * 50)
+    print("🔎 사유의 뇌 - 검색 인덱스 생성")
+    print("=" * 50)
+
+    run_pipeline(['search'], force=True)
+
+    if args.query:
+        index = SearchIndex.load(OUTPUT_DIR / SEARCH_INDEX_NPZ)
+        for query in args.query:
+            print(f"\n🔎 {query}")
+            for post_id, score in index.search(query, k=args.k):
+                print(f"   {post_id}  {score:.3f}")
+
+    print("\n🎉 완료!")
+
+if __name__ == '__main__':
+    main()
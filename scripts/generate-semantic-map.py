@@ -0,0 +1,40 @@
+#!/usr/bin/env python3
+"""
+2D 의미 지도 생성 스크립트
+사용법:
+  1. python scripts/generate-local-embeddings.py  (임베딩 / 유사도 매트릭스)
+  2. python scripts/generate-semantic-map.py [--full]
+
+평소에는 .cache/layout-cache.npz 의 좌표를 유지하고 새 글만 이웃 근처에 배치합니다.
+--full 이면 전체 레이아웃을 다시 계산합니다 (새 글이 20%를 넘으면 자동으로 전체 계산).
+
+출력:
+  - public/data/posts-map.json (주 카테고리별 글 좌표)
+  - public/data/category-map.json (카테고리 중심점)
+
+실제 처리는 layout.py (pipeline.py 의 layout 단계)에 있습니다.
+"""
+
+import argparse
+
+from pipeline import run_pipeline
+
+def parse_args():
+    parser = argparse.ArgumentParser(description='2D 의미 지도 (posts-map / category-map) 생성')
+    parser.add_argument('--full', action='store_true',
+                        help='레이아웃 캐시를 무시하고 전체 좌표를 다시 계산')
+    return parser.parse_args()
+
+def main():
+    args = parse_args()
+
+    print("=" * 50)
+    print("🗺️ 사유의 뇌 - 의미 지도 생성")
+    print("=" * 50)
+
+    run_pipeline(['layout'], force=True, options={'layout_full': args.full})
+
+    print("\n🎉 완료!")
+
+if __name__ == '__main__':
+    main()
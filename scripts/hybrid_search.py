@@ -0,0 +1,112 @@
+"""
+하이브리드 검색 (BM25 + 임베딩 코사인, reciprocal rank fusion)
+
+  search = HybridSearch(OUTPUT_DIR)
+  search.search('인공지능과 교육', k=10)
+  # [{'id', 'score', 'lexical': 순위|None, 'semantic': 순위|None}, ...]
+
+- 어휘 후보: search-index.npz 의 BM25 상위 candidates 개
+- 의미 후보: ann-index.npz (IVF) 에서 nprobe 개 리스트만 비교한 상위 candidates 개
+  -> 글 수가 늘어도 비교하는 벡터 수는 nprobe/nlist 비율로 제한됩니다.
+- 두 순위를 RRF(1 / (RRF_K + 순위))로 합칩니다. 점수 척도가 달라도 보정이 필요 없습니다.
+
+질의 임베딩은 같은 MiniLM 모델로 한 번만 계산하고 LRU 캐시에 둡니다.
+ANN 인덱스나 sentence-transformers 가 없으면 BM25만으로 검색합니다.
+"""
+
+import importlib.util
+from functools import lru_cache
+from pathlib import Path
+
+import numpy as np
+
+from ann_index import ANN_INDEX_NPZ, DEFAULT_NPROBE, IVFIndex
+from search_index import SEARCH_INDEX_NPZ, SearchIndex
+
+RRF_K = 60
+DEFAULT_CANDIDATES = 100
+QUERY_CACHE_SIZE = 256
+
+
+def default_encoder():
+    """embeddings.py 와 같은 모델로 질의 하나를 인코딩하는 함수 (모델은 처음 쓸 때 로딩)"""
+    model = None
+
+    def encode(text):
+        nonlocal model
+        if model is None:
+            from embeddings import load_model
+            model = load_model()
+        return model.encode([text], convert_to_numpy=True)[0]
+
+    return encode
+
+
+def reciprocal_rank_fusion(rankings, k=RRF_K, weights=None):
+    """{이름: [post_id, ...]} -> [(post_id, score, {이름: 순위})] 점수 높은 순"""
+    fused = {}
+    for name, ids in rankings.items():
+        weight = (weights or {}).get(name, 1.0)
+        for rank, post_id in enumerate(ids, 1):
+            score, ranks = fused.get(post_id, (0.0, {}))
+            ranks[name] = rank
+            fused[post_id] = (score + weight / (k + rank), ranks)
+    return sorted(
+        ((post_id, score, ranks) for post_id, (score, ranks) in fused.items()),
+        key=lambda item: (-item[1], min(item[2].values())),
+    )
+
+
+class HybridSearch:
+    """BM25 + 의미 검색 통합 진입점"""
+
+    def __init__(self, output_dir, encoder=None, candidates=DEFAULT_CANDIDATES,
+                 nprobe=DEFAULT_NPROBE, cache_size=QUERY_CACHE_SIZE):
+        output_dir = Path(output_dir)
+        self.lexical = SearchIndex.load(output_dir / SEARCH_INDEX_NPZ)
+        ann_path = output_dir / ANN_INDEX_NPZ
+        self.semantic = IVFIndex.load(ann_path) if ann_path.exists() else None
+        if self.semantic is None:
+            print(f"⚠️ {ANN_INDEX_NPZ} 이 없어 BM25만으로 검색합니다.")
+        elif encoder is None and importlib.util.find_spec('sentence_transformers') is None:
+            print("⚠️ sentence-transformers가 없어 BM25만으로 검색합니다.")
+            self.semantic = None
+        self.candidates = candidates
+        self.nprobe = nprobe
+        self._encoder = encoder or default_encoder()
+        self.encode_query = lru_cache(maxsize=cache_size)(self._encode)
+
+    def _encode(self, text):
+        vector = np.asarray(self._encoder(text), dtype=np.float32)
+        vector.setflags(write=False)  # 캐시에서 여러 번 꺼내 쓰므로 읽기 전용
+        return vector
+
+    def lexical_ids(self, query):
+        return [post_id for post_id, _ in self.lexical.search(query, k=self.candidates)]
+
+    def semantic_ids(self, query):
+        if self.semantic is None:
+            return []
+        vector = self.encode_query(' '.join(query.split()))
+        return [post_id for post_id, _ in
+                self.semantic.search(vector, k=self.candidates, nprobe=self.nprobe)]
+
+    def search(self, query, k=10, mode='hybrid'):
+        """mode: 'hybrid' | 'lexical' | 'semantic'"""
+        if not query or not query.strip():
+            return []
+        rankings = {}
+        if mode in ('hybrid', 'lexical'):
+            rankings['lexical'] = self.lexical_ids(query)
+        if mode in ('hybrid', 'semantic'):
+            rankings['semantic'] = self.semantic_ids(query)
+
+        return [
+            {
+                'id': post_id,
+                'score': round(score, 6),
+                'lexical': ranks.get('lexical'),
+                'semantic': ranks.get('semantic'),
+            }
+            for post_id, score, ranks in reciprocal_rank_fusion(rankings)[:k]
+        ]
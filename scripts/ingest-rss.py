@@ -0,0 +1,71 @@
+#!/usr/bin/env python3
+"""
+RSS -> 로컬 SQLite 증분 수집
+
+사용법:
+  python scripts/ingest-rss.py                          # 첫 페이지만
+  python scripts/ingest-rss.py --pages 5 --concurrency 4
+  python scripts/ingest-rss.py --feed http://127.0.0.1:8000/rss.xml   # 로컬 HTTP 서버로 시험
+  python scripts/ingest-rss.py --build                  # 바뀐 글이 있으면 이어서 파이프라인 실행
+
+지난 응답의 ETag / Last-Modified 로 조건부 요청을 보내므로 (--no-conditional 로 끔)
+바뀐 것이 없으면 304 만 받고 끝납니다. 새 글 / 바뀐 글의 post_id 는
+.cache/ingest-changes.json 에 남습니다. 실제 처리는 rss_ingest.py 에 있습니다.
+"""
+
+import argparse
+import json
+
+from blog_data import DB_PATH, connect
+from pipeline import DEFAULT_STAGES, run_pipeline
+from rss_ingest import (
+    CHANGES_PATH, DEFAULT_CONCURRENCY, DEFAULT_FEED, STATE_PATH, TIMEOUT, ingest,
+)
+import metrics
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description='RSS -> SQLite 증분 수집')
+    parser.add_argument('--db', default=DB_PATH, help='SQLite DB 경로')
+    parser.add_argument('--feed', default=DEFAULT_FEED, help='RSS 주소')
+    parser.add_argument('--pages', type=int, default=1, help='가져올 피드 페이지 수 (?page=N)')
+    parser.add_argument('--concurrency', type=int, default=DEFAULT_CONCURRENCY,
+                        help='동시에 보낼 요청 수')
+    parser.add_argument('--timeout', type=float, default=TIMEOUT, help='요청 하나의 제한 시간(초)')
+    parser.add_argument('--no-conditional', action='store_true',
+                        help='ETag / Last-Modified 를 보내지 않고 전부 다시 받기')
+    parser.add_argument('--changes-out', default=str(CHANGES_PATH), help='바뀐 post_id 목록 JSON 경로')
+    parser.add_argument('--build', action='store_true', help='바뀐 글이 있으면 파이프라인 실행')
+    parser.add_argument('--metrics', default=None,
+                        help='실행 리포트 JSON 경로 (기본: .cache/runs/<시각>-ingest-rss.json)')
+    args = parser.parse_args()
+    if args.pages < 1:
+        parser.error('--pages 는 1 이상이어야 합니다')
+    return args
+
+
+def main():
+    args = parse_args()
+    print('RSS 수집 시작...\n')
+    run = metrics.start_run('ingest-rss')
+    try:
+        conn = connect(args.db)
+        try:
+            changes = ingest(conn, feed=args.feed, pages=args.pages, concurrency=args.concurrency,
+                             timeout=args.timeout, state_path=STATE_PATH,
+                             changes_path=args.changes_out, conditional=not args.no_conditional)
+        finally:
+            conn.close()
+    finally:
+        print(f"📊 실행 리포트: {run.save(args.metrics)}")
+
+    print(f"\n✅ 새 글 {len(changes['new'])}개, 바뀐 글 {len(changes['updated'])}개")
+    print(json.dumps({key: changes[key] for key in ('new', 'updated')}, ensure_ascii=False))
+
+    if args.build and changes['changed']:
+        print('\n파이프라인 실행...')
+        run_pipeline(DEFAULT_STAGES, db_path=args.db)
+
+
+if __name__ == '__main__':
+    main()
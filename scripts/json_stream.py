@@ -0,0 +1,159 @@
+"""
+스트리밍 JSON 쓰기 (메모리 사용량 일정)
+
+항목을 하나씩 받아 바로 임시 파일에 쓰고, commit() 때 rename으로 교체합니다.
+Next.js 라우트가 반쯤 쓰인 파일을 읽는 일이 없습니다.
+출력 바이트는 같은 데이터를 json.dump 한 결과와 동일합니다.
+
+  with JsonArrayWriter(path) as writer:      # [item, item, ...]
+      writer.write(item)
+
+  writer = JsonArrayWriter(path, prefix='{"posts": ')
+  ...
+  writer.commit(suffix=', "stats": {...}}')  # {"posts": [...], "stats": {...}}
+
+  JsonGroupedWriter(path)                    # {"key": [item, ...], ...}
+"""
+
+import filecmp
+import json
+import os
+import tempfile
+from pathlib import Path
+
+
+def _indented(text, indent, level):
+    """json.dumps(indent=...) 결과를 level 단계만큼 들여쓰기"""
+    pad = ' ' * (indent * level)
+    return '\n'.join(pad + line for line in text.split('\n'))
+
+
+class AtomicFile:
+    """임시 파일에 쓰고 commit 때 제자리로 rename"""
+
+    def __init__(self, path):
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.tmp_path = self.path.with_suffix(self.path.suffix + '.tmp')
+        self.file = open(self.tmp_path, 'w', encoding='utf-8')
+        self.closed = False
+
+    def write(self, text):
+        self.file.write(text)
+
+    def commit(self, if_changed=False):
+        """rename으로 교체 -> 교체했으면 True
+
+        if_changed=True면 기존 파일과 내용이 같을 때 임시 파일만 지우고 False를 반환합니다.
+        """
+        self.file.close()
+        self.closed = True
+        if if_changed and self.path.exists() and filecmp.cmp(self.tmp_path, self.path, shallow=False):
+            self.tmp_path.unlink()
+            return False
+        self.tmp_path.replace(self.path)
+        return True
+
+    def discard(self):
+        if self.closed:
+            return
+        self.file.close()
+        if self.tmp_path.exists():
+            self.tmp_path.unlink()
+        self.closed = True
+
+
+class JsonArrayWriter:
+    """JSON 배열을 한 항목씩 쓰기"""
+
+    def __init__(self, path, indent=None, ensure_ascii=False, prefix=''):
+        self.out = AtomicFile(path)
+        self.indent = indent
+        self.ensure_ascii = ensure_ascii
+        self.count = 0
+        self.out.write(prefix + '[')
+
+    def write(self, item):
+        text = json.dumps(item, ensure_ascii=self.ensure_ascii, indent=self.indent)
+        if self.indent is None:
+            self.out.write((', ' if self.count else '') + text)
+        else:
+            self.out.write((',\n' if self.count else '\n') + _indented(text, self.indent, 1))
+        self.count += 1
+
+    def commit(self, suffix='', if_changed=False):
+        if self.indent is not None and self.count:
+            self.out.write('\n')
+        self.out.write(']' + suffix)
+        return self.out.commit(if_changed=if_changed)
+
+    def discard(self):
+        self.out.discard()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        if exc_type is None:
+            self.commit()
+        else:
+            self.discard()
+
+
+class JsonGroupedWriter:
+    """{그룹: [항목, ...]} 형태를 그룹별 임시 파일로 나눠 쓴 뒤 합치기
+
+    그룹 순서는 처음 등장한 순서입니다 (dict 삽입 순서와 같음).
+    """
+
+    def __init__(self, path, indent=None, ensure_ascii=False):
+        self.path = Path(path)
+        self.indent = indent
+        self.ensure_ascii = ensure_ascii
+        self.spill_dir = tempfile.TemporaryDirectory(prefix='json-groups-')
+        self.groups = {}
+
+    def write(self, key, item):
+        group = self.groups.get(key)
+        if group is None:
+            spill_path = os.path.join(self.spill_dir.name, f"{len(self.groups)}.part")
+            group = self.groups[key] = [open(spill_path, 'w+', encoding='utf-8'), 0]
+        text = json.dumps(item, ensure_ascii=self.ensure_ascii, indent=self.indent)
+        if self.indent is None:
+            group[0].write((', ' if group[1] else '') + text)
+        else:
+            group[0].write((',\n' if group[1] else '\n') + _indented(text, self.indent, 2))
+        group[1] += 1
+
+    def commit(self):
+        out = AtomicFile(self.path)
+        try:
+            out.write('{')
+            for i, (key, (spill, count)) in enumerate(self.groups.items()):
+                key_text = json.dumps(key, ensure_ascii=self.ensure_ascii)
+                if self.indent is None:
+                    out.write((', ' if i else '') + key_text + ': [')
+                else:
+                    pad = ' ' * self.indent
+                    out.write((',\n' if i else '\n') + pad + key_text + ': [')
+                spill.seek(0)
+                for chunk in iter(lambda: spill.read(1 << 16), ''):
+                    out.write(chunk)
+                if self.indent is not None:
+                    out.write('\n' + ' ' * self.indent)
+                out.write(']')
+            if self.indent is not None and self.groups:
+                out.write('\n')
+            out.write('}')
+            out.commit()
+        except BaseException:
+            out.discard()
+            raise
+        finally:
+            self.discard()
+
+    def discard(self):
+        for spill, _ in self.groups.values():
+            spill.close()
+        self.groups = {}
+        self.spill_dir.cleanup()
@@ -0,0 +1,228 @@
+"""
+키워드 통계 (/api/keywords 용 사전 계산)
+
+요청마다 summaries 전체를 읽어 키워드를 세던 것을 빌드 때 한 번의 스트리밍으로 끝냅니다.
+키워드는 쉼표로 나눈 뒤 정규화(NFC, 공백 정리, 앞뒤 #·따옴표 제거, 소문자)하고
+글 하나 안의 중복은 한 번만 셉니다. 표시 이름은 가장 많이 쓰인 원래 표기입니다.
+
+public/data/keywords/ 에 저장:
+  index.json        {posts, keywords, years, categories, files}
+  global.json       {'keywords': [[키워드, 글 수], ...]} (글 수 순, 최대 MAX_GLOBAL개)
+  by-year.json      {'2024': [[키워드, 글 수], ...]}   연도별 상위 TOP_PER_GROUP개
+  by-category.json  {'사유': [[키워드, 글 수], ...]}   주 카테고리별 상위 TOP_PER_GROUP개
+  cooccurrence.json 동시 출현 희소 행렬 (CSR)
+    keywords / counts      어휘 (글 수 MIN_PAIR_COUNT 이상 상위 MAX_VOCAB개)
+    indptr / indices / values
+                           행마다 함께 나온 글 수 상위 NEIGHBORS개 이웃
+    pairs                  [[i, j, 함께 나온 글 수, NPMI], ...] 상위 TOP_PAIRS쌍
+"""
+
+import re
+import shutil
+import unicodedata
+from array import array
+from collections import Counter, defaultdict
+from pathlib import Path
+
+import numpy as np
+
+from blog_data import split_category, write_json
+
+KEYWORDS_DIR = 'keywords'
+KEYWORDS_INDEX_JSON = 'index.json'
+MAX_GLOBAL = 5000
+TOP_PER_GROUP = 100
+MAX_VOCAB = 2000
+MIN_PAIR_COUNT = 2
+NEIGHBORS = 10
+TOP_PAIRS = 2000
+
+_SPACES = re.compile(r'\s+')
+_STRIP = '#"\'“”‘’`·.'
+
+
+def split_keywords(keywords):
+    """'키워드1, 키워드2' -> 원래 표기 목록 (정리만 하고 소문자로 바꾸지 않음)"""
+    surfaces = []
+    for part in (keywords or '').split(','):
+        surface = _SPACES.sub(' ', unicodedata.normalize('NFC', part)).strip().strip(_STRIP).strip()
+        if surface:
+            surfaces.append(surface)
+    return surfaces
+
+
+def normalize_keyword(surface):
+    """집계 키 (대소문자 구분 없음)"""
+    return surface.casefold()
+
+
+class KeywordStatsBuilder:
+    """글 정보와 키워드를 스트리밍으로 받아 집계
+
+    add_post(post_id, pub_date, category) 로 글을 등록하고
+    add_keywords(post_id, keywords) 로 요약 키워드를 넣습니다 (등록되지 않은 글은 무시).
+    """
+
+    def __init__(self):
+        self.post_groups = {}
+        self.key_ids = {}
+        self.keys = []
+        self.surfaces = []
+        self.totals = []
+        self.by_year = defaultdict(Counter)
+        self.by_category = defaultdict(Counter)
+        # 글별 키워드 id (동시 출현 계산용) - 평평한 배열 + 글 경계
+        self.post_keywords = array('i')
+        self.post_offsets = array('q', [0])
+
+    def add_post(self, post_id, pub_date, category):
+        year = pub_date[:4] if pub_date else None
+        main, _ = split_category(category or '미분류')
+        self.post_groups[post_id] = (year, main)
+
+    def _key_id(self, surface):
+        key = normalize_keyword(surface)
+        key_id = self.key_ids.get(key)
+        if key_id is None:
+            key_id = self.key_ids[key] = len(self.keys)
+            self.keys.append(key)
+            self.surfaces.append(Counter())
+            self.totals.append(0)
+        self.surfaces[key_id][surface] += 1
+        return key_id
+
+    def add_keywords(self, post_id, keywords):
+        """요약 키워드 한 줄 (등록된 글이면 True)"""
+        group = self.post_groups.get(post_id)
+        if group is None:
+            return False
+        year, main = group
+        ids = list(dict.fromkeys(self._key_id(surface) for surface in split_keywords(keywords)))
+        for key_id in ids:
+            self.totals[key_id] += 1
+            if year:
+                self.by_year[year][key_id] += 1
+            self.by_category[main][key_id] += 1
+        if ids:
+            self.post_keywords.extend(ids)
+            self.post_offsets.append(len(self.post_keywords))
+        return True
+
+    @property
+    def posts_with_keywords(self):
+        return len(self.post_offsets) - 1
+
+    def label(self, key_id):
+        return self.surfaces[key_id].most_common(1)[0][0]
+
+    def ranked(self, counts, limit):
+        top = sorted(counts.items(), key=lambda item: (-item[1], self.keys[item[0]]))[:limit]
+        return [[self.label(key_id), count] for key_id, count in top]
+
+    def cooccurrence(self, max_vocab=MAX_VOCAB, min_count=MIN_PAIR_COUNT, neighbors=NEIGHBORS,
+                     top_pairs=TOP_PAIRS):
+        """어휘 안 키워드 쌍의 동시 출현 -> cooccurrence.json 내용"""
+        totals = np.asarray(self.totals, dtype=np.int64)
+        order = np.lexsort((np.asarray(self.keys, dtype=object).astype(str), -totals))
+        vocab = order[totals[order] >= min_count][:max_vocab]
+        size = len(vocab)
+        local = np.full(len(totals), -1, dtype=np.int64)
+        local[vocab] = np.arange(size)
+
+        # 글마다 어휘 안 키워드의 (i < j) 쌍을 만들어 i * size + j 로 모아 셈
+        ids = local[np.frombuffer(self.post_keywords, dtype=np.int32)] if size else np.empty(0, np.int64)
+        offsets = np.frombuffer(self.post_offsets, dtype=np.int64)
+        chunks = []
+        for start, end in zip(offsets[:-1], offsets[1:]):
+            row = ids[start:end]
+            row = np.sort(row[row >= 0])
+            if len(row) > 1:
+                i, j = np.triu_indices(len(row), k=1)
+                chunks.append(row[i] * size + row[j])
+        if chunks:
+            codes, counts = np.unique(np.concatenate(chunks), return_counts=True)
+            keep = counts >= min_count
+            codes, counts = codes[keep], counts[keep]
+        else:
+            codes = counts = np.empty(0, dtype=np.int64)
+        rows, cols = codes // max(size, 1), codes % max(size, 1)
+
+        # NPMI = log(p(ij) / (p(i) p(j))) / -log p(ij)
+        n = max(self.posts_with_keywords, 1)
+        vocab_totals = totals[vocab]
+        p_ij = counts / n
+        with np.errstate(divide='ignore', invalid='ignore'):
+            pmi = np.log(p_ij / ((vocab_totals[rows] / n) * (vocab_totals[cols] / n)))
+            npmi = np.where(p_ij < 1, pmi / -np.log(p_ij), 1.0)
+
+        # 대칭 행렬의 행마다 상위 이웃 (글 수, NPMI 순)
+        sym_rows = np.concatenate([rows, cols])
+        sym_cols = np.concatenate([cols, rows])
+        sym_counts = np.concatenate([counts, counts])
+        sym_npmi = np.concatenate([npmi, npmi])
+        order = np.lexsort((-sym_npmi, -sym_counts, sym_rows))
+        indptr = [0]
+        indices, values = [], []
+        bounds = np.searchsorted(sym_rows[order], np.arange(size + 1))
+        for r in range(size):
+            top = order[bounds[r]:bounds[r + 1]][:neighbors]
+            indices.extend(int(c) for c in sym_cols[top])
+            values.extend(int(c) for c in sym_counts[top])
+            indptr.append(len(indices))
+
+        top = np.lexsort((-npmi, -counts))[:top_pairs]
+        return {
+            'posts': self.posts_with_keywords,
+            'keywords': [self.label(key_id) for key_id in vocab],
+            'counts': [int(c) for c in vocab_totals],
+            'indptr': indptr,
+            'indices': indices,
+            'values': values,
+            'pairs': [[int(rows[p]), int(cols[p]), int(counts[p]), round(float(npmi[p]), 4)]
+                      for p in top],
+        }
+
+
+def save_keyword_stats(output_dir, builder):
+    """public/data/keywords/ 저장 (디렉터리째 교체) -> index"""
+    keywords_dir = Path(output_dir) / KEYWORDS_DIR
+    tmp_dir = keywords_dir.with_name(KEYWORDS_DIR + '.tmp')
+    if tmp_dir.exists():
+        shutil.rmtree(tmp_dir)
+    tmp_dir.mkdir(parents=True)
+
+    global_counts = dict(enumerate(builder.totals))
+    write_json(tmp_dir / 'global.json',
+               {'keywords': builder.ranked(global_counts, MAX_GLOBAL)}, ensure_ascii=False)
+    write_json(tmp_dir / 'by-year.json',
+               {year: builder.ranked(builder.by_year[year], TOP_PER_GROUP)
+                for year in sorted(builder.by_year, reverse=True)},
+               ensure_ascii=False)
+    categories = sorted(builder.by_category, key=lambda name: -sum(builder.by_category[name].values()))
+    write_json(tmp_dir / 'by-category.json',
+               {name: builder.ranked(builder.by_category[name], TOP_PER_GROUP) for name in categories},
+               ensure_ascii=False)
+    cooccurrence = builder.cooccurrence()
+    write_json(tmp_dir / 'cooccurrence.json', cooccurrence, ensure_ascii=False)
+
+    index = {
+        'posts': builder.posts_with_keywords,
+        'keywords': len(builder.keys),
+        'vocabulary': len(cooccurrence['keywords']),
+        'pairs': len(cooccurrence['pairs']),
+        'years': sorted(builder.by_year, reverse=True),
+        'categories': categories,
+        'files': ['global.json', 'by-year.json', 'by-category.json', 'cooccurrence.json'],
+    }
+    write_json(tmp_dir / KEYWORDS_INDEX_JSON, index, ensure_ascii=False, indent=2)
+
+    # 디렉터리째 교체 (라우트가 섞인 파일을 읽지 않도록)
+    old_dir = keywords_dir.with_name(KEYWORDS_DIR + '.old')
+    if keywords_dir.exists():
+        if old_dir.exists():
+            shutil.rmtree(old_dir)
+        keywords_dir.rename(old_dir)
+    tmp_dir.rename(keywords_dir)
+    if old_dir.exists():
+        shutil.rmtree(old_dir)
+    return index
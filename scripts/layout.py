@@ -0,0 +1,256 @@
+"""
+2D 의미 지도 레이아웃 (posts-map.json / category-map.json)
+
+임베딩을 randomized PCA로 2차원에 투영한 뒤,
+유사도 top-k 그래프(similarity-matrix.bin)를 이용한 UMAP 방식의 힘 기반 보정을
+NumPy 벡터 연산으로 돌립니다.
+  - 이웃끼리는 당기고 (간선 전체를 한 번에 계산)
+  - 무작위로 뽑은 글과는 밀어냄 (negative sampling)
+
+레이아웃은 .cache/layout-cache.npz 에 저장됩니다. 다음 실행에서 새 글/내용이 바뀐 글이
+적으면 기존 좌표는 그대로 두고, 새 글만 이웃 좌표의 가중 평균에 놓은 뒤 보정합니다.
+"""
+
+from collections import defaultdict
+from pathlib import Path
+
+import numpy as np
+
+from blog_data import CACHE_DIR, split_category, write_json
+from json_stream import JsonGroupedWriter
+
+LAYOUT_CACHE_PATH = CACHE_DIR / 'layout-cache.npz'
+POSTS_MAP_JSON = 'posts-map.json'
+CATEGORY_MAP_JSON = 'category-map.json'
+
+EPOCHS = 200
+INCREMENTAL_EPOCHS = 50
+NEGATIVE_SAMPLES = 5
+LEARNING_RATE = 1.0
+MAX_NEW_FRACTION = 0.2  # 새 글이 이보다 많으면 전체 재계산
+
+# UMAP min_dist=0.1 에 해당하는 곡선 파라미터
+CURVE_A = 1.577
+CURVE_B = 0.895
+
+INIT_SPREAD = 10.0
+POST_RANGE = (5.0, 95.0)
+CATEGORY_RANGE = (0.0, 100.0)
+
+
+def randomized_pca(X, n_components=2, oversample=10, n_iter=4, seed=0):
+    """Halko 방식 randomized PCA -> (mean, components[n_components, d])"""
+    rng = np.random.default_rng(seed)
+    X = np.asarray(X, dtype=np.float32)
+    mean = X.mean(axis=0)
+    centered = X - mean
+    omega = rng.standard_normal((X.shape[1], n_components + oversample)).astype(np.float32)
+    Y = centered @ omega
+    for _ in range(n_iter):
+        Q, _ = np.linalg.qr(Y)
+        Y = centered @ (centered.T @ Q)
+    Q, _ = np.linalg.qr(Y)
+    _, _, Vt = np.linalg.svd(Q.T @ centered, full_matrices=False)
+    return mean, Vt[:n_components]
+
+
+def neighbor_edges(post_ids, similar):
+    """similar(post_id) -> [{'id', 'score'}] 로 간선 배열 (heads, tails, weights)"""
+    row_of = {post_id: i for i, post_id in enumerate(post_ids)}
+    heads, tails, weights = [], [], []
+    for i, post_id in enumerate(post_ids):
+        for item in similar(post_id):
+            j = row_of.get(item['id'])
+            if j is not None and item['score'] > 0:
+                heads.append(i)
+                tails.append(j)
+                weights.append(item['score'])
+    return (np.array(heads, dtype=np.int64), np.array(tails, dtype=np.int64),
+            np.array(weights, dtype=np.float32))
+
+
+def _scatter_add(n, index, values):
+    """np.add.at(out, index, values) 의 빠른 버전 (2열)"""
+    return np.stack([
+        np.bincount(index, weights=values[:, 0], minlength=n),
+        np.bincount(index, weights=values[:, 1], minlength=n),
+    ], axis=1)
+
+
+def refine_layout(Y, heads, tails, weights, epochs=EPOCHS, movable=None,
+                  negative_samples=NEGATIVE_SAMPLES, learning_rate=LEARNING_RATE, seed=0):
+    """UMAP 방식 힘 기반 보정 (movable=False 인 점은 고정)"""
+    rng = np.random.default_rng(seed)
+    Y = np.array(Y, dtype=np.float64)
+    n = len(Y)
+    if n < 2 or epochs <= 0:
+        return Y
+    a, b = CURVE_A, CURVE_B
+    weights = weights / weights.max() if len(weights) else weights
+
+    for epoch in range(epochs):
+        lr = learning_rate * (1.0 - epoch / epochs)
+
+        # 이웃끼리 당기기
+        diff = Y[heads] - Y[tails]
+        dist2 = (diff * diff).sum(axis=1)
+        coef = -2.0 * a * b * np.power(dist2, b - 1.0, where=dist2 > 0, out=np.zeros_like(dist2))
+        coef /= 1.0 + a * np.power(dist2, b)
+        grad = np.clip(coef[:, None] * diff, -4.0, 4.0) * weights[:, None]
+        delta = _scatter_add(n, heads, grad) - _scatter_add(n, tails, grad)
+
+        # 무작위 글과 밀어내기
+        if negative_samples:
+            sources = np.repeat(heads, negative_samples)
+            others = rng.integers(0, n, size=len(sources))
+            diff = Y[sources] - Y[others]
+            dist2 = (diff * diff).sum(axis=1)
+            coef = 2.0 * b / ((0.001 + dist2) * (1.0 + a * np.power(dist2, b)))
+            coef[sources == others] = 0.0
+            grad = np.clip(coef[:, None] * diff, -4.0, 4.0)
+            delta += _scatter_add(n, sources, grad) / negative_samples
+
+        if movable is not None:
+            delta[~movable] = 0.0
+        Y += lr * delta
+    return Y
+
+
+def _rescale(points, lo, hi):
+    """축별 min-max -> [lo, hi]"""
+    points = np.asarray(points, dtype=np.float64)
+    if not len(points):
+        return points
+    low, high = points.min(axis=0), points.max(axis=0)
+    span = np.where(high > low, high - low, 1.0)
+    return lo + (points - low) / span * (hi - lo)
+
+
+class LayoutCache:
+    """post_id / 내용 해시 / 좌표 + PCA 기저 (새 글 배치용)"""
+
+    def __init__(self, path=LAYOUT_CACHE_PATH):
+        self.path = Path(path) if path else None
+        self.positions = {}
+        self.mean = self.components = self.init_low = self.init_span = None
+        if self.path and self.path.exists():
+            data = np.load(self.path, allow_pickle=False)
+            for post_id, digest, xy in zip(data['post_ids'], data['hashes'], data['positions']):
+                self.positions[str(post_id)] = (str(digest), xy)
+            self.mean, self.components = data['mean'], data['components']
+            self.init_low, self.init_span = data['init_low'], data['init_span']
+
+    def save(self, post_ids, hashes, Y):
+        if not self.path:
+            return
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = self.path.with_suffix('.tmp.npz')
+        np.savez(
+            tmp_path,
+            post_ids=np.array(post_ids, dtype=str), hashes=np.array(hashes, dtype=str),
+            positions=np.asarray(Y, dtype=np.float32),
+            mean=self.mean, components=self.components,
+            init_low=self.init_low, init_span=self.init_span,
+        )
+        tmp_path.replace(self.path)
+
+
+def initial_layout(embeddings, cache, seed=0):
+    """PCA 투영 -> [0, INIT_SPREAD] 범위 초기 좌표 (기저는 cache에 기록)"""
+    cache.mean, cache.components = randomized_pca(embeddings, seed=seed)
+    projected = (np.asarray(embeddings, dtype=np.float32) - cache.mean) @ cache.components.T
+    cache.init_low = projected.min(axis=0)
+    cache.init_span = np.where(np.ptp(projected, axis=0) > 0, np.ptp(projected, axis=0), 1.0)
+    return (projected - cache.init_low) / cache.init_span * INIT_SPREAD
+
+
+def compute_layout(embeddings, post_ids, hashes, similar, full=False,
+                   cache_path=LAYOUT_CACHE_PATH, seed=0):
+    """임베딩 -> 글별 2D 좌표 (N x 2, 정규화 전)
+
+    similar(post_id) 는 top-k 이웃 목록을 돌려주는 함수입니다 (SimilarityCSR.similar).
+    """
+    cache = LayoutCache(cache_path)
+    heads, tails, weights = neighbor_edges(post_ids, similar)
+
+    known = [
+        i for i, (post_id, digest) in enumerate(zip(post_ids, hashes))
+        if cache.positions.get(post_id, (None,))[0] == digest
+    ]
+    new_count = len(post_ids) - len(known)
+    incremental = (not full and cache.components is not None and known
+                   and new_count <= MAX_NEW_FRACTION * len(post_ids))
+
+    if not incremental:
+        print(f"   전체 레이아웃 계산 ({len(post_ids)}개, {EPOCHS} epochs)")
+        Y = initial_layout(embeddings, cache, seed=seed)
+        Y = refine_layout(Y, heads, tails, weights, epochs=EPOCHS, seed=seed)
+    else:
+        print(f"   기존 좌표 {len(known)}개 유지, 새로 배치 {new_count}개")
+        Y = np.zeros((len(post_ids), 2))
+        placed = np.zeros(len(post_ids), dtype=bool)
+        for i in known:
+            Y[i] = cache.positions[post_ids[i]][1]
+            placed[i] = True
+        movable = ~placed
+
+        if new_count:
+            # 새 글: 이미 놓인 이웃들의 유사도 가중 평균, 이웃이 없으면 PCA 투영
+            new_rows = np.flatnonzero(movable)
+            projected = (np.asarray(embeddings[new_rows], dtype=np.float32) - cache.mean) @ cache.components.T
+            Y[new_rows] = (projected - cache.init_low) / cache.init_span * INIT_SPREAD
+
+            mask = movable[heads] & placed[tails]
+            total = np.bincount(heads[mask], weights=weights[mask], minlength=len(post_ids))
+            sums = _scatter_add(len(post_ids), heads[mask], Y[tails[mask]] * weights[mask, None])
+            has_neighbors = movable & (total > 0)
+            Y[has_neighbors] = sums[has_neighbors] / total[has_neighbors, None]
+
+            # 새 글에 닿는 간선만으로 보정 (기존 좌표는 고정)
+            touching = movable[heads] | movable[tails]
+            Y = refine_layout(Y, heads[touching], tails[touching], weights[touching],
+                              epochs=INCREMENTAL_EPOCHS, movable=movable,
+                              learning_rate=LEARNING_RATE * 0.5, seed=seed)
+
+    cache.save(post_ids, hashes, Y)
+    return Y
+
+
+def save_layout(output_dir, Y, posts):
+    """좌표 + 글 정보 -> posts-map.json (주 카테고리별), category-map.json (중심점)
+
+    posts: [(post_id, title, category, pub_date)] (Y와 같은 순서, 최신순)
+    """
+    output_dir = Path(output_dir)
+    post_xy = _rescale(Y, *POST_RANGE)
+
+    writer = JsonGroupedWriter(output_dir / POSTS_MAP_JSON, indent=2)
+    sums = defaultdict(lambda: np.zeros(2))
+    counts = defaultdict(int)
+    try:
+        for (post_id, title, category, pub_date), raw, xy in zip(posts, Y, post_xy):
+            main = split_category(category)[0] if category else '카테고리없음'
+            writer.write(main, {
+                'id': post_id,
+                'title': title,
+                'category': category,
+                'pub_date': pub_date,
+                'x': round(float(xy[0]), 2),
+                'y': round(float(xy[1]), 2),
+            })
+            # 카테고리 중심점도 같은 패스에서 누적
+            sums[main] += raw
+            counts[main] += 1
+    except BaseException:
+        writer.discard()
+        raise
+    writer.commit()
+
+    names = sorted(counts, key=lambda name: -counts[name])
+    centroids = _rescale([sums[name] / counts[name] for name in names], *CATEGORY_RANGE)
+    category_map = [
+        {'name': name, 'x': round(float(xy[0]), 2), 'y': round(float(xy[1]), 2), 'count': counts[name]}
+        for name, xy in zip(names, centroids)
+    ]
+    write_json(output_dir / CATEGORY_MAP_JSON, category_map, ensure_ascii=False, indent=2)
+    return len(posts), len(category_map)
@@ -0,0 +1,187 @@
+"""
+파이프라인 계측 (단계별 시간 / 처리량 / 메모리, JSON 실행 리포트)
+
+  run = metrics.start_run('build-all', profile=['embeddings'], trace_memory=['static'])
+  with metrics.span('embeddings/encode', rows=len(texts)):
+      ...
+  with metrics.span('db-read') as s:
+      for post in posts:
+          s.add_rows(1)
+  metrics.count('firestore/writes', 400)
+  run.record('static/add', seconds, rows=n)   # 따로 잰 시간
+  run.save()   # .cache/runs/<시각>-build-all.json
+
+- span 은 중첩할 수 있고 이름은 'stage/부분' 처럼 씁니다.
+  wall/CPU 시간, 행 수와 rows/sec, 끝났을 때의 프로세스 피크 RSS 를 기록합니다.
+- profile 에 span 이름(또는 앞부분 'embeddings')을 넣으면 그 span 을 cProfile 로 감싸
+  .prof 파일을 남기고 누적 시간 상위 함수를 리포트에 넣습니다.
+- trace_memory 에 넣은 span 은 tracemalloc 으로 Python 할당 피크와 상위 할당 위치를 기록합니다.
+- start_run 전에 쓰면 기본 실행(default)에 기록되고, 저장하지 않으면 버려집니다.
+"""
+
+import cProfile
+import io
+import os
+import platform
+import pstats
+import sys
+import time
+import tracemalloc
+from contextlib import contextmanager
+from datetime import datetime
+from pathlib import Path
+
+from blog_data import CACHE_DIR, write_json
+
+RUNS_DIR = CACHE_DIR / 'runs'
+PROFILE_TOP = 15
+TRACE_TOP = 10
+
+
+def peak_rss_mb(children=False):
+    """현재 프로세스(또는 끝난 자식들 중 최대)의 피크 RSS (MB)"""
+    try:
+        import resource
+    except ImportError:  # Windows
+        return 0.0
+    who = resource.RUSAGE_CHILDREN if children else resource.RUSAGE_SELF
+    peak = resource.getrusage(who).ru_maxrss
+    # Linux는 KB, macOS는 바이트
+    return peak / (1024 * 1024) if sys.platform == 'darwin' else peak / 1024
+
+
+class SpanHandle:
+    """진행 중인 span (행 수 누적용)"""
+
+    def __init__(self, rows=None):
+        self.rows = rows
+
+    def add_rows(self, n):
+        self.rows = (self.rows or 0) + n
+
+
+class RunMetrics:
+    """한 번의 실행에서 모은 span / 카운터"""
+
+    def __init__(self, name, profile=(), trace_memory=(), runs_dir=RUNS_DIR):
+        self.name = name
+        self.profile = set(profile or ())
+        self.trace_memory = set(trace_memory or ())
+        self.runs_dir = Path(runs_dir)
+        self.started_at = datetime.now()
+        self.run_id = f"{self.started_at:%Y%m%d-%H%M%S}-{name}"
+        self.start = time.perf_counter()
+        self.spans = []
+        self.counters = {}
+        self._stack = []
+        self._profiling = False
+
+    def _selected(self, name, names):
+        return any(name == n or name.startswith(n + '/') for n in names)
+
+    @contextmanager
+    def span(self, name, rows=None):
+        handle = SpanHandle(rows)
+        record = {'name': name, 'depth': len(self._stack)}
+        self.spans.append(record)
+        self._stack.append(name)
+
+        profiler = None
+        if not self._profiling and self._selected(name, self.profile):
+            profiler = cProfile.Profile()
+            self._profiling = True
+        tracing = self._selected(name, self.trace_memory) and not tracemalloc.is_tracing()
+        if tracing:
+            tracemalloc.start()
+
+        wall, cpu = time.perf_counter(), time.process_time()
+        if profiler:
+            profiler.enable()
+        try:
+            yield handle
+        finally:
+            if profiler:
+                profiler.disable()
+                self._profiling = False
+            record['seconds'] = time.perf_counter() - wall
+            record['cpu_seconds'] = time.process_time() - cpu
+            if handle.rows is not None:
+                record['rows'] = handle.rows
+                record['rows_per_sec'] = handle.rows / record['seconds'] if record['seconds'] else None
+            record['peak_rss_mb'] = peak_rss_mb()
+            if tracing:
+                snapshot = tracemalloc.take_snapshot()
+                record['traced_peak_mb'] = tracemalloc.get_traced_memory()[1] / (1024 * 1024)
+                tracemalloc.stop()
+                record['top_allocations'] = [
+                    {'where': str(stat.traceback), 'mb': stat.size / (1024 * 1024), 'count': stat.count}
+                    for stat in snapshot.statistics('lineno')[:TRACE_TOP]
+                ]
+            if profiler:
+                record.update(self._save_profile(name, profiler))
+            self._stack.pop()
+
+    def _save_profile(self, name, profiler):
+        self.runs_dir.mkdir(parents=True, exist_ok=True)
+        path = self.runs_dir / f"{self.run_id}-{name.replace('/', '-')}.prof"
+        profiler.dump_stats(path)
+        stats = pstats.Stats(profiler, stream=io.StringIO()).sort_stats('cumulative')
+        top = []
+        for (filename, line, func), (_, calls, total, cumulative, _) in stats.stats.items():
+            top.append({'function': f"{Path(filename).name}:{line}({func})", 'calls': calls,
+                        'tottime': total, 'cumtime': cumulative})
+        top.sort(key=lambda item: -item['cumtime'])
+        return {'profile': str(path), 'profile_top': top[:PROFILE_TOP]}
+
+    def record(self, name, seconds, rows=None):
+        """따로 잰 시간을 span 으로 기록 (글마다 나눠 잰 시간의 합 등)"""
+        record = {'name': name, 'depth': len(self._stack), 'seconds': seconds}
+        if rows is not None:
+            record['rows'] = rows
+            record['rows_per_sec'] = rows / seconds if seconds else None
+        self.spans.append(record)
+
+    def count(self, name, n=1):
+        self.counters[name] = self.counters.get(name, 0) + n
+
+    def report(self):
+        return {
+            'run': self.name,
+            'run_id': self.run_id,
+            'started_at': self.started_at.isoformat(timespec='seconds'),
+            'seconds': time.perf_counter() - self.start,
+            'peak_rss_mb': peak_rss_mb(),
+            'argv': sys.argv,
+            'python': platform.python_version(),
+            'cpu_count': os.cpu_count(),
+            'spans': self.spans,
+            'counters': self.counters,
+        }
+
+    def save(self, path=None):
+        """JSON 리포트 저장 -> 경로"""
+        path = Path(path) if path else self.runs_dir / f"{self.run_id}.json"
+        write_json(path, self.report(), ensure_ascii=False, indent=2)
+        return path
+
+
+_run = RunMetrics('default')
+
+
+def start_run(name, profile=(), trace_memory=(), runs_dir=RUNS_DIR):
+    """새 실행을 시작하고 현재 실행으로 설정"""
+    global _run
+    _run = RunMetrics(name, profile=profile, trace_memory=trace_memory, runs_dir=runs_dir)
+    return _run
+
+
+def current_run():
+    return _run
+
+
+def span(name, rows=None):
+    return _run.span(name, rows=rows)
+
+
+def count(name, n=1):
+    _run.count(name, n)
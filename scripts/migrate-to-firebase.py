@@ -5,147 +5,95 @@ SQLite -> Firestore 마이그레이션 스크립트
 사용법:
 1. pip install firebase-admin
 2. firebase-admin-key.json 파일을 이 스크립트와 같은 폴더에 둠
-3. python migrate-to-firebase.py
-"""
-import sqlite3
-import os
-import firebase_admin
-from firebase_admin import credentials, firestore
-
-# 스크립트 위치 기준으로 경로 설정
-SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
-
-# Firebase Admin 초기화
-cred = credentials.Certificate(os.path.join(SCRIPT_DIR, 'firebase-admin-key.json'))
-firebase_admin.initialize_app(cred)
-
-db = firestore.client()
+3. python migrate-to-firebase.py [--batch-size 400] [--workers 4] [--fresh] [--fake]
+                                [--delta [--dry-run]] [--metrics run.json]
 
-# SQLite DB 경로 (사용자 환경에 맞게 수정)
-DB_PATH = '/Users/kangkukjin/Desktop/AI/indiebizOS/data/packages/installed/tools/blog/data/blog_insight.db'
+중간에 실패하면 .cache/firestore-checkpoint.json 에 마지막으로 commit된
+post_id가 남아 있어서, 다시 실행하면 그 다음부터 이어서 진행합니다.
+처음부터 다시 하려면 --fresh 를 붙입니다.
 
-# 숨길 카테고리
-HIDDEN_CATEGORIES = ['임시보관함', '집자료들']
-CATEGORY_REMAP = {'재검토 글들': '미분류'}
+--delta 는 문서 지문을 .cache/firestore-manifest.json 과 비교해서
+추가/변경/삭제된 posts·summaries 만 쓰고 변경 요약을 출력합니다.
+(매니페스트가 없으면 첫 실행은 전체를 씁니다. --dry-run 은 변경 요약만 출력)
 
-def should_hide(category):
-    if not category:
-        return False
-    return any(category.startswith(hidden) for hidden in HIDDEN_CATEGORIES)
-
-def remap_category(category):
-    if not category:
-        return category
-    main_cat = category.split('/')[0] if '/' in category else category
-    if main_cat in CATEGORY_REMAP:
-        return category.replace(main_cat, CATEGORY_REMAP[main_cat])
-    return category
+FIRESTORE_EMULATOR_HOST 를 설정하면 에뮬레이터로, --fake 면 메모리 Firestore로 실행합니다.
+실행 리포트(단계별 시간, docs/sec, batch 수)는 .cache/runs/ 에 저장됩니다 (metrics.py).
+실제 처리는 firestore_migration.py 에 있습니다.
+"""
 
-def migrate():
+import argparse
+
+from blog_data import DB_PATH, connect
+from firestore_migration import (
+    BATCH_SIZE, DEFAULT_WORKERS, Checkpoint, FakeFirestore, firestore_client, migrate, sync_delta,
+)
+import metrics
+
+def parse_args():
+    parser = argparse.ArgumentParser(description='SQLite -> Firestore 마이그레이션')
+    parser.add_argument('--db', default=DB_PATH, help='SQLite DB 경로')
+    parser.add_argument('--batch-size', type=int, default=BATCH_SIZE,
+                        help='batch 하나에 담을 문서 수 (Firestore 제한 500)')
+    parser.add_argument('--workers', type=int, default=DEFAULT_WORKERS,
+                        help='동시에 commit할 batch 수')
+    parser.add_argument('--fresh', action='store_true',
+                        help='체크포인트를 지우고 처음부터 다시 실행')
+    parser.add_argument('--fake', action='store_true',
+                        help='실제 Firestore 대신 메모리 FakeFirestore 사용 (시험용)')
+    parser.add_argument('--delta', action='store_true',
+                        help='매니페스트와 비교해 바뀐 문서만 쓰기/삭제')
+    parser.add_argument('--dry-run', action='store_true',
+                        help='--delta 와 함께: 쓰지 않고 변경 요약만 출력')
+    parser.add_argument('--metrics', default=None,
+                        help='실행 리포트 JSON 경로 (기본: .cache/runs/<시각>-migrate-to-firebase.json)')
+    args = parser.parse_args()
+    if not 0 < args.batch_size <= 500:
+        parser.error('--batch-size 는 1~500 이어야 합니다')
+    if args.dry_run and not args.delta:
+        parser.error('--dry-run 은 --delta 와 함께 써야 합니다')
+    return args
+
+def delta_main(args):
+    print('변경분 동기화 시작...\n')
+    db = None if args.dry_run else (FakeFirestore() if args.fake else firestore_client())
+    conn = connect(args.db)
+    try:
+        # --fake 로 쓴 결과는 실제 Firestore와 무관하므로 매니페스트를 갱신하지 않음
+        sync_delta(db, conn, batch_size=args.batch_size, workers=args.workers,
+                   dry_run=args.dry_run, update_manifest=not args.fake)
+    finally:
+        conn.close()
+    print('\n✅ 동기화 완료!')
+
+def main():
+    args = parse_args()
+    run = metrics.start_run('migrate-to-firebase')
+    try:
+        if args.delta:
+            delta_main(args)
+        else:
+            migrate_main(args)
+    finally:
+        print(f"📊 실행 리포트: {run.save(args.metrics)}")
+
+def migrate_main(args):
     print('마이그레이션 시작...\n')
 
-    # SQLite 연결
-    sqlite_conn = sqlite3.connect(DB_PATH)
-    sqlite_conn.row_factory = sqlite3.Row
-    cursor = sqlite_conn.cursor()
-
-    # 1. Posts 마이그레이션
-    print('1. Posts 테이블 마이그레이션...')
-    cursor.execute('''
-        SELECT id, post_id, title, category, pub_date, content, char_count
-        FROM posts
-    ''')
-    posts = cursor.fetchall()
-
-    post_count = 0
-    skipped_count = 0
-    batch = db.batch()
-    batch_count = 0
-
-    posts_dict = {}  # 나중에 summaries 필터링용
-
-    for post in posts:
-        post_dict = dict(post)
-        posts_dict[post_dict['post_id']] = post_dict
-
-        # 숨김 카테고리 필터링
-        if should_hide(post_dict['category']):
-            skipped_count += 1
-            continue
-
-        doc_ref = db.collection('posts').document(post_dict['post_id'])
-        batch.set(doc_ref, {
-            'id': post_dict['id'],
-            'post_id': post_dict['post_id'],
-            'title': post_dict['title'],
-            'category': remap_category(post_dict['category']),
-            'pub_date': post_dict['pub_date'],
-            'content': post_dict['content'],
-            'char_count': post_dict['char_count']
-        })
-
-        post_count += 1
-        batch_count += 1
-
-        # Firestore batch는 500개 제한
-        if batch_count >= 400:
-            batch.commit()
-            batch = db.batch()
-            batch_count = 0
-            print(f'  - {post_count}개 처리중...')
-
-    # 남은 배치 커밋
-    if batch_count > 0:
-        batch.commit()
-
-    print(f'  - 총 {post_count}개 글 완료 ({skipped_count}개 스킵)')
-
-    # 2. Summaries 마이그레이션
-    print('\n2. Summaries 테이블 마이그레이션...')
-    cursor.execute('''
-        SELECT post_id, summary, keywords FROM summaries
-    ''')
-    summaries = cursor.fetchall()
-
-    summary_count = 0
-    batch = db.batch()
-    batch_count = 0
-
-    for summary in summaries:
-        summary_dict = dict(summary)
-
-        # 해당 포스트가 숨김 카테고리인지 확인
-        post = posts_dict.get(summary_dict['post_id'])
-        if post and should_hide(post['category']):
-            continue
-
-        doc_ref = db.collection('summaries').document(summary_dict['post_id'])
-        batch.set(doc_ref, {
-            'post_id': summary_dict['post_id'],
-            'summary': summary_dict['summary'],
-            'keywords': summary_dict['keywords']
-        })
-
-        summary_count += 1
-        batch_count += 1
-
-        if batch_count >= 400:
-            batch.commit()
-            batch = db.batch()
-            batch_count = 0
-            print(f'  - {summary_count}개 처리중...')
-
-    # 남은 배치 커밋
-    if batch_count > 0:
-        batch.commit()
-
-    print(f'  - 총 {summary_count}개 요약 완료')
+    checkpoint = Checkpoint()
+    if args.fresh:
+        checkpoint.clear()
 
-    print('\n✅ 마이그레이션 완료!')
-    print(f'- Posts: {post_count}개')
-    print(f'- Summaries: {summary_count}개')
+    db = FakeFirestore() if args.fake else firestore_client()
+    conn = connect(args.db)
+    try:
+        results = migrate(db, conn, checkpoint, batch_size=args.batch_size, workers=args.workers)
+    finally:
+        conn.close()
 
-    sqlite_conn.close()
+    print('✅ 마이그레이션 완료!')
+    if 'posts' in results:
+        print(f"- Posts: {results['posts'][0]}개")
+    print(f"- Summaries: {results['summaries'][0]}개")
 
 if __name__ == '__main__':
-    migrate()
+    main()
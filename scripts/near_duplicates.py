@@ -0,0 +1,282 @@
+"""
+MinHash + LSH 근사 중복 / 연작 탐지
+
+본문을 문자 SHINGLE_SIZE-gram 으로 나눠 MinHash 서명(NUM_PERM개)을 만들고,
+서명을 BANDS개 밴드로 나눠 같은 밴드 값을 가진 글끼리만 후보로 비교합니다 (LSH).
+후보 쌍만 서명으로 Jaccard 를 추정하므로 전체 쌍 비교(N²) 없이 끝납니다.
+
+  - 서명 계산은 글마다 독립이라 프로세스 풀로 나눠 계산합니다 (workers).
+  - 서명은 본문 해시와 함께 .cache/minhash-cache.npz 에 저장해 바뀐 글만 다시 계산합니다.
+  - 추정 Jaccard DUPLICATE_THRESHOLD 이상 -> 중복 묶음 (재게시, 거의 같은 사본)
+    SERIES_THRESHOLD 이상 -> 연작 묶음 (중복 묶음 둘 이상을 잇는 것만)
+  - 묶음의 대표(canonical)는 가장 먼저 쓴 글입니다.
+
+저장 파일: public/data/near-duplicates.json
+  {'threshold', 'seriesThreshold', 'duplicates': [{'ids': [대표, ...], 'jaccard'}],
+   'series': [{'ids': [...], 'jaccard'}]}
+embeddings 단계는 이 파일을 읽어 유사도 매트릭스를 만들 때부터 묶음마다 하나씩만 이웃으로
+고릅니다 (similarity.py 의 groups, 그래서 embeddings 단계가 dedupe 단계에 의존).
+network 단계와 /api/similar 는 이웃 id 를 대표 글 id 로 바꿔 접습니다.
+"""
+
+import json
+import re
+import unicodedata
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import get_context
+from pathlib import Path
+
+import numpy as np
+
+from blog_data import CACHE_DIR, write_json
+from embedding_store import EmbeddingCache
+
+NEAR_DUPLICATES_JSON = 'near-duplicates.json'
+MINHASH_CACHE_FILE = 'minhash-cache.npz'
+MINHASH_CACHE_PATH = CACHE_DIR / MINHASH_CACHE_FILE
+SHINGLE_SIZE = 5
+SHINGLE_LIMIT = 20000  # 본문 앞부분만 (아주 긴 글의 서명 계산 시간 제한)
+MIN_SHINGLES = 20  # 이보다 짧은 글은 비교하지 않음 (짧은 글끼리 우연히 겹침)
+NUM_PERM = 128
+BANDS = 32  # 밴드당 4행 -> Jaccard 0.5 에서 후보가 될 확률 ~87%, 0.7 에서 ~99.9%
+MAX_BUCKET = 50  # 이보다 큰 버킷은 첫 글과만 짝지음 (상용구 때문에 쌍이 폭증하지 않도록)
+DUPLICATE_THRESHOLD = 0.8
+SERIES_THRESHOLD = 0.5
+CHUNK_POSTS = 256
+SEED = 1
+
+_SPACES = re.compile(r'\s+')
+_MASK32 = np.uint64(0xFFFFFFFF)
+_EMPTY = np.uint32(0xFFFFFFFF)
+
+
+def settings_key():
+    """캐시 무효화용 설정 문자열"""
+    return f"minhash|k={SHINGLE_SIZE}|limit={SHINGLE_LIMIT}|perm={NUM_PERM}|seed={SEED}"
+
+
+def _permutations(num_perm=NUM_PERM, seed=SEED):
+    """곱셈-시프트 해시 계수 (홀수 a, 임의 b) - 워커에서도 같은 값"""
+    rng = np.random.default_rng(seed)
+    a = rng.integers(1, 2 ** 63, size=num_perm, dtype=np.uint64) | np.uint64(1)
+    b = rng.integers(0, 2 ** 63, size=num_perm, dtype=np.uint64)
+    return a, b
+
+
+def shingles(text, k=SHINGLE_SIZE, limit=SHINGLE_LIMIT):
+    """정규화한 본문의 문자 k-gram 해시 (uint32, 중복 제거)"""
+    text = _SPACES.sub(' ', unicodedata.normalize('NFC', text[:limit]).lower()).strip()
+    codes = np.frombuffer(text.encode('utf-32-le'), dtype=np.uint32).astype(np.uint64)
+    if len(codes) < k:
+        return np.empty(0, dtype=np.uint32)
+    # k 글자 다항 해시 (uint64 오버플로는 의도된 mod 2^64)
+    h = np.zeros(len(codes) - k + 1, dtype=np.uint64)
+    with np.errstate(over='ignore'):
+        for t in range(k):
+            h = h * np.uint64(1000003) + codes[t:len(codes) - k + 1 + t]
+        h ^= h >> np.uint64(29)
+    return np.unique((h & _MASK32).astype(np.uint32))
+
+
+def minhash(shingle_hashes, a, b, block=2048):
+    """shingle 해시 -> MinHash 서명 (NUM_PERM,) uint32 (shingle 이 없으면 전부 _EMPTY)"""
+    signature = np.full(len(a), _EMPTY, dtype=np.uint32)
+    x = shingle_hashes.astype(np.uint64)
+    with np.errstate(over='ignore'):
+        for start in range(0, len(x), block):
+            hashed = (a[:, None] * x[None, start:start + block] + b[:, None]) >> np.uint64(32)
+            np.minimum(signature, hashed.min(axis=1).astype(np.uint32), out=signature)
+    return signature
+
+
+def _signature_chunk(texts):
+    """워커: 텍스트 묶음 -> (서명 행렬, shingle 수)"""
+    a, b = _permutations()
+    signatures = np.empty((len(texts), NUM_PERM), dtype=np.uint32)
+    sizes = np.empty(len(texts), dtype=np.int32)
+    for i, text in enumerate(texts):
+        hashes = shingles(text)
+        signatures[i] = minhash(hashes, a, b)
+        sizes[i] = len(hashes)
+    return signatures, sizes
+
+
+def compute_signatures(texts, workers=1, chunk_posts=CHUNK_POSTS):
+    """텍스트 목록 -> (서명 (N, NUM_PERM) uint32, shingle 수 (N,))
+
+    workers > 1 이면 CHUNK_POSTS개씩 spawn 프로세스 풀에 나눠 계산합니다.
+    """
+    if not texts:
+        return np.empty((0, NUM_PERM), dtype=np.uint32), np.empty(0, dtype=np.int32)
+    chunks = [texts[i:i + chunk_posts] for i in range(0, len(texts), chunk_posts)]
+    if workers <= 1 or len(chunks) == 1:
+        results = [_signature_chunk(chunk) for chunk in chunks]
+    else:
+        with ProcessPoolExecutor(max_workers=workers, mp_context=get_context('spawn')) as executor:
+            results = list(executor.map(_signature_chunk, chunks))
+    return np.concatenate([r[0] for r in results]), np.concatenate([r[1] for r in results])
+
+
+class SignatureCache(EmbeddingCache):
+    """post_id -> (본문 해시, MinHash 서명) 캐시 (shingle 이 너무 적은 글은 _EMPTY 서명)"""
+
+    def __init__(self, path=MINHASH_CACHE_PATH):
+        super().__init__(settings_key(), path)
+
+    def put(self, post_id, digest, signature):
+        self.entries[post_id] = (digest, np.asarray(signature, dtype=np.uint32))
+
+
+def lsh_candidates(signatures, bands=BANDS, max_bucket=MAX_BUCKET):
+    """같은 밴드 값을 가진 행 쌍 -> (i, j) 배열 (i < j, 중복 제거)"""
+    n, num_perm = signatures.shape
+    rows = num_perm // bands
+    valid = np.flatnonzero(signatures[:, 0] != _EMPTY)
+    pairs = []
+    with np.errstate(over='ignore'):
+        for band in range(bands):
+            # 밴드의 rows개 값을 uint64 하나로 섞음 (충돌은 뒤의 Jaccard 추정에서 걸러짐)
+            part = signatures[valid, band * rows:(band + 1) * rows].astype(np.uint64)
+            keys = np.zeros(len(valid), dtype=np.uint64)
+            for r in range(rows):
+                keys = keys * np.uint64(0x9E3779B97F4A7C15) + part[:, r]
+            order = np.argsort(keys, kind='stable')
+            sorted_keys = keys[order]
+            starts = np.flatnonzero(np.r_[True, sorted_keys[1:] != sorted_keys[:-1]])
+            sizes = np.diff(np.r_[starts, len(order)])
+            for start, size in zip(starts[sizes > 1], sizes[sizes > 1]):
+                members = valid[order[start:start + size]]
+                if size > max_bucket:
+                    pairs.append(np.stack([np.full(size - 1, members[0]), members[1:]], axis=1))
+                else:
+                    i, j = np.triu_indices(size, k=1)
+                    pairs.append(np.stack([members[i], members[j]], axis=1))
+    if not pairs:
+        return np.empty((0, 2), dtype=np.int64)
+    pairs = np.sort(np.concatenate(pairs), axis=1)
+    codes = np.unique(pairs[:, 0].astype(np.int64) * n + pairs[:, 1])
+    return np.stack([codes // n, codes % n], axis=1)
+
+
+def estimate_jaccard(signatures, pairs, block=65536):
+    """서명이 같은 위치의 비율 = Jaccard 추정치"""
+    estimates = np.empty(len(pairs), dtype=np.float32)
+    for start in range(0, len(pairs), block):
+        i, j = pairs[start:start + block].T
+        estimates[start:start + block] = (signatures[i] == signatures[j]).mean(axis=1)
+    return estimates
+
+
+def _components(n, pairs):
+    """union-find 연결 요소 -> [[행, ...], ...] (크기 2 이상)"""
+    parent = list(range(n))
+
+    def find(x):
+        while parent[x] != x:
+            parent[x] = parent[parent[x]]
+            x = parent[x]
+        return x
+
+    for i, j in pairs:
+        ri, rj = find(int(i)), find(int(j))
+        if ri != rj:
+            parent[max(ri, rj)] = min(ri, rj)
+    groups = {}
+    for x in range(n):
+        groups.setdefault(find(x), []).append(x)
+    return [members for members in groups.values() if len(members) > 1]
+
+
+def find_near_duplicates(post_ids, pub_dates, signatures, threshold=DUPLICATE_THRESHOLD,
+                         series_threshold=SERIES_THRESHOLD):
+    """서명 -> near-duplicates.json 내용"""
+    pairs = lsh_candidates(signatures)
+    estimates = estimate_jaccard(signatures, pairs)
+
+    def order_key(row):
+        return pub_dates[row] or '9999', post_ids[row]
+
+    def groups(min_jaccard):
+        keep = estimates >= min_jaccard
+        result = []
+        for members in _components(len(post_ids), pairs[keep]):
+            members.sort(key=order_key)
+            inside = np.isin(pairs[:, 0], members) & keep
+            result.append({
+                'ids': [post_ids[row] for row in members],
+                'jaccard': round(float(estimates[inside].min()), 3),
+            })
+        result.sort(key=lambda group: (-len(group['ids']), group['ids'][0]))
+        return result
+
+    duplicates = groups(threshold)
+    canonical = canonical_map(duplicates)
+    series = [
+        group for group in groups(series_threshold)
+        if len({canonical.get(post_id, post_id) for post_id in group['ids']}) > 1
+    ]
+    return {
+        'threshold': threshold,
+        'seriesThreshold': series_threshold,
+        'candidates': int(len(pairs)),
+        'duplicates': duplicates,
+        'series': series,
+    }
+
+
+def canonical_map(duplicates):
+    """중복 묶음 목록 -> {post_id: 대표 post_id} (묶음에 든 글만)"""
+    return {post_id: group['ids'][0] for group in duplicates for post_id in group['ids']}
+
+
+def load_canonical(output_dir):
+    """near-duplicates.json 의 {post_id: 대표 post_id} (파일이 없으면 빈 dict)"""
+    path = Path(output_dir) / NEAR_DUPLICATES_JSON
+    if not path.exists():
+        return {}
+    with open(path, 'r', encoding='utf-8') as f:
+        return canonical_map(json.load(f)['duplicates'])
+
+
+def collapse_similar(similar, canonical):
+    """similar(post_id) 를 감싸 같은 중복 묶음의 글을 대표 하나로 접음
+
+    이웃은 대표 id 로 바꾸고, 자기 묶음은 빼고, 묶음마다 가장 높은 점수 하나만 남깁니다.
+    유사도 행렬은 embeddings 단계에서 이미 묶음마다 하나씩 k개를 고르므로 (similarity.py 의
+    groups) 사본이 많은 글도 접은 뒤 k개가 남습니다.
+    """
+    def collapsed(post_id):
+        own = canonical.get(post_id, post_id)
+        seen = {own}
+        result = []
+        for item in similar(post_id):
+            target = canonical.get(item['id'], item['id'])
+            if target not in seen:
+                seen.add(target)
+                result.append({**item, 'id': target})
+        return result
+
+    return collapsed
+
+
+def build_near_duplicates(post_ids, pub_dates, texts, hashes, output_dir, workers=1, cache=None):
+    """바뀐 글만 서명을 계산해 near-duplicates.json 저장 -> 결과 dict
+
+    texts: 글별 본문 (캐시에 같은 해시가 있는 글은 None 이어도 됨)
+    """
+    if cache is None:  # 빈 캐시도 falsy 이므로 None 일 때만 기본 경로
+        cache = SignatureCache()
+    missing = cache.diff(post_ids, hashes)
+    print(f"   캐시 {len(cache)}개, 새로 계산 {len(missing)}개 (workers={workers})")
+    if missing:
+        signatures, sizes = compute_signatures([texts[i] for i in missing], workers=workers)
+        signatures[sizes < MIN_SHINGLES] = _EMPTY
+        for row, i in enumerate(missing):
+            cache.put(post_ids[i], hashes[i], signatures[row])
+    cache.prune(post_ids)
+    cache.save()
+
+    signatures = cache.get_matrix(post_ids) if post_ids else np.empty((0, NUM_PERM), np.uint32)
+    result = find_near_duplicates(post_ids, pub_dates, signatures)
+    write_json(Path(output_dir) / NEAR_DUPLICATES_JSON, result, ensure_ascii=False)
+    return result
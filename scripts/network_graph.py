@@ -0,0 +1,166 @@
+"""
+브레인 네트워크 그래프 (/api/network 용 사전 계산)
+
+요청마다 유사도 매트릭스 전체를 읽어 그래프를 만들던 것을 빌드 때 미리 해 둡니다.
+public/data/network/ 에 구간(window)별 파일을 만들고, 라우트는 파일을 그대로 스트리밍합니다.
+
+  index.json          구간 목록 {'windows': [{'key', 'label', 'file', 'posts', 'connections'}]}
+  recent.json         최근 RECENT_POSTS 개
+  year-2024.json      연도별
+  category-0.json     주 카테고리별 (글 수 순)
+
+각 파일은 예전 라우트 응답과 같은 {nodes, links, stats} 형식이고 노드에 연결 수가 들어 있습니다.
+
+간선 방식 (edges):
+  threshold  유사도 MIN_SCORE 이상인 top-k 이웃 전부 (예전 동작)
+  mutual     서로의 top-k 에 들어 있는 쌍만 (mutual kNN)
+  backbone   threshold 간선의 최대 신장 숲 (구간이 커도 간선 수 < 노드 수)
+"""
+
+import shutil
+from collections import defaultdict
+from pathlib import Path
+
+from blog_data import split_category, write_json
+
+NETWORK_DIR = 'network'
+NETWORK_INDEX_JSON = 'index.json'
+RECENT_POSTS = 1000
+MIN_SCORE = 0.5
+EDGE_MODES = ('threshold', 'mutual', 'backbone')
+
+
+def build_graph(posts, similar, total_posts, min_score=MIN_SCORE, edges='threshold'):
+    """구간의 글 목록 -> {nodes, links, stats}
+
+    posts: [(post_id, title, category, pub_date)] (최신순)
+    similar(post_id): [{'id', 'score'}] top-k 이웃
+    """
+    if edges not in EDGE_MODES:
+        raise ValueError(f"알 수 없는 간선 방식: {edges}")
+    in_window = {post[0] for post in posts}
+
+    nodes = [
+        {
+            'id': post_id,
+            'title': title,
+            'category': category or '미분류',
+            'year': pub_date[:4] if pub_date else '미상',
+            'pub_date': pub_date,
+        }
+        for post_id, title, category, pub_date in posts
+    ]
+
+    # 유사도 임계값 + 구간 안 + 중복 제거 (먼저 나온 글이 source)
+    neighbors = {post[0]: similar(post[0]) for post in posts}
+    links = []
+    seen = set()
+    for post_id, *_ in posts:
+        for sim in neighbors[post_id]:
+            if sim['score'] < min_score or sim['id'] not in in_window:
+                continue
+            key = (post_id, sim['id']) if post_id < sim['id'] else (sim['id'], post_id)
+            if key in seen:
+                continue
+            seen.add(key)
+            links.append({'source': post_id, 'target': sim['id'], 'weight': sim['score']})
+
+    if edges == 'mutual':
+        top = {post_id: {sim['id'] for sim in items} for post_id, items in neighbors.items()}
+        links = [link for link in links
+                 if link['source'] in top[link['target']] and link['target'] in top[link['source']]]
+    elif edges == 'backbone':
+        links = maximum_spanning_forest(links)
+
+    # 연결 수
+    degree = defaultdict(int)
+    for link in links:
+        degree[link['source']] += 1
+        degree[link['target']] += 1
+    for node in nodes:
+        node['connections'] = degree[node['id']]
+
+    return {
+        'nodes': nodes,
+        'links': links,
+        'stats': {
+            'posts': len(nodes),
+            'connections': len(links),
+            'totalPosts': total_posts,
+        },
+    }
+
+
+def maximum_spanning_forest(links):
+    """Kruskal (가중치 큰 순) -> 숲에 남은 간선 (원래 순서 유지)"""
+    parent = {}
+
+    def find(x):
+        root = x
+        while parent.get(root, root) != root:
+            root = parent[root]
+        while parent.get(x, x) != root:
+            parent[x], x = root, parent[x]
+        return root
+
+    keep = set()
+    order = sorted(range(len(links)), key=lambda i: -links[i]['weight'])
+    for i in order:
+        a, b = find(links[i]['source']), find(links[i]['target'])
+        if a != b:
+            parent[a] = b
+            keep.add(i)
+    return [link for i, link in enumerate(links) if i in keep]
+
+
+def network_windows(posts, recent=RECENT_POSTS):
+    """[(key, label, posts)] : 최근 N개, 연도별(최신 연도부터), 주 카테고리별(글 수 순)"""
+    by_year = defaultdict(list)
+    by_category = defaultdict(list)
+    for post in posts:
+        _, _, category, pub_date = post
+        if pub_date:
+            by_year[pub_date[:4]].append(post)
+        by_category[split_category(category)[0] if category else '미분류'].append(post)
+
+    windows = [('recent', f'최근 {min(recent, len(posts))}개', posts[:recent])]
+    for year in sorted(by_year, reverse=True):
+        windows.append((f'year-{year}', f'{year}년', by_year[year]))
+    for i, name in enumerate(sorted(by_category, key=lambda name: -len(by_category[name]))):
+        windows.append((f'category-{i}', name, by_category[name]))
+    return windows
+
+
+def save_network(output_dir, posts, similar, recent=RECENT_POSTS, min_score=MIN_SCORE,
+                 edges='threshold'):
+    """모든 구간 그래프 + index.json 저장 -> index"""
+    network_dir = Path(output_dir) / NETWORK_DIR
+    tmp_dir = network_dir.with_name(NETWORK_DIR + '.tmp')
+    if tmp_dir.exists():
+        shutil.rmtree(tmp_dir)
+    tmp_dir.mkdir(parents=True)
+
+    index = {'edges': edges, 'minScore': min_score, 'windows': []}
+    for key, label, window_posts in network_windows(posts, recent):
+        graph = build_graph(window_posts, similar, len(posts), min_score, edges)
+        filename = f'{key}.json'
+        write_json(tmp_dir / filename, graph, ensure_ascii=False)
+        index['windows'].append({
+            'key': key,
+            'label': label,
+            'file': filename,
+            'posts': graph['stats']['posts'],
+            'connections': graph['stats']['connections'],
+        })
+    write_json(tmp_dir / NETWORK_INDEX_JSON, index, ensure_ascii=False, indent=2)
+
+    # 디렉터리째 교체 (라우트가 섞인 구간 파일을 읽지 않도록)
+    old_dir = network_dir.with_name(NETWORK_DIR + '.old')
+    if network_dir.exists():
+        if old_dir.exists():
+            shutil.rmtree(old_dir)
+        network_dir.rename(old_dir)
+    tmp_dir.rename(network_dir)
+    if old_dir.exists():
+        shutil.rmtree(old_dir)
+    return index
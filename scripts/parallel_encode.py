@@ -0,0 +1,130 @@
+"""
+멀티 프로세스 임베딩 인코딩 (길이별 배치)
+
+1. 텍스트를 길이순으로 정렬해서 비슷한 길이끼리 배치를 만듭니다 (패딩 낭비 감소).
+   토크나이저를 부모 프로세스에 올리지 않도록 글자 수를 길이 기준으로 씁니다.
+2. 정렬된 묶음(chunk)을 프로세스 풀에 나눠 줍니다. 워커마다 모델을 하나씩 올리고,
+   torch 스레드 수는 CPU 수 / 워커 수로 나눕니다.
+3. 결과를 원래 순서로 되돌립니다.
+
+인코딩이 끝나면 posts/sec, 패딩 효율, 피크 RSS(메인 / 워커별)를 보고합니다.
+
+  vectors, report = encode_parallel(texts, load_model, workers=4, batch_size=64)
+"""
+
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import get_context
+
+import numpy as np
+
+from metrics import peak_rss_mb
+
+DEFAULT_BATCH_SIZE = 64
+CHUNK_BATCHES = 4  # 워커에 한 번에 넘기는 배치 수
+
+_worker_model = None
+
+
+def length_sorted_batches(texts, batch_size=DEFAULT_BATCH_SIZE, sort=True):
+    """길이순으로 정렬한 행 번호를 batch_size 단위로 나눈 목록"""
+    order = np.argsort([len(t) for t in texts], kind='stable') if sort else np.arange(len(texts))
+    return [order[i:i + batch_size] for i in range(0, len(order), batch_size)]
+
+
+def padding_efficiency(texts, batches):
+    """실제 길이 합 / (배치별 최대 길이 x 배치 크기) 합 (1에 가까울수록 낭비가 적음)"""
+    lengths = np.array([len(t) for t in texts])
+    used = sum(int(lengths[b].sum()) for b in batches)
+    padded = sum(int(lengths[b].max()) * len(b) for b in batches if len(b))
+    return used / padded if padded else 1.0
+
+
+def _init_worker(model_factory, threads):
+    global _worker_model
+    if threads:
+        try:
+            import torch
+            torch.set_num_threads(threads)
+        except ImportError:
+            pass
+    _worker_model = model_factory()
+
+
+def _encode_chunk(rows, texts, batch_size):
+    vectors = _worker_model.encode(
+        texts, batch_size=batch_size, show_progress_bar=False, convert_to_numpy=True
+    )
+    return rows, np.asarray(vectors, dtype=np.float32), os.getpid(), peak_rss_mb()
+
+
+def encode_parallel(texts, model_factory, workers=1, batch_size=DEFAULT_BATCH_SIZE,
+                    sort=True, progress=None):
+    """texts -> (N x D float32, 리포트 dict)
+
+    model_factory: 모델을 만드는 최상위 함수 (워커에서 호출되므로 pickle 가능해야 함)
+    """
+    start = time.perf_counter()
+    batches = length_sorted_batches(texts, batch_size, sort=sort)
+    chunks = [
+        np.concatenate(batches[i:i + CHUNK_BATCHES])
+        for i in range(0, len(batches), CHUNK_BATCHES)
+    ]
+    result = None
+    worker_rss = {}
+    done = 0
+
+    def collect(rows, vectors, pid, rss):
+        nonlocal result, done
+        if result is None:
+            result = np.zeros((len(texts), vectors.shape[1]), dtype=np.float32)
+        result[rows] = vectors  # 원래 순서로 되돌리기
+        worker_rss[pid] = max(worker_rss.get(pid, 0.0), rss)
+        done += len(rows)
+        if progress:
+            progress(done, len(texts))
+
+    if workers <= 1:
+        _init_worker(model_factory, 0)
+        for rows in chunks:
+            collect(*_encode_chunk(rows, [texts[i] for i in rows], batch_size))
+    else:
+        threads = max(1, (os.cpu_count() or 1) // workers)
+        with ProcessPoolExecutor(
+            max_workers=workers, mp_context=get_context('spawn'),
+            initializer=_init_worker, initargs=(model_factory, threads),
+        ) as pool:
+            futures = [
+                pool.submit(_encode_chunk, rows, [texts[i] for i in rows], batch_size)
+                for rows in chunks
+            ]
+            for future in futures:
+                collect(*future.result())
+
+    elapsed = time.perf_counter() - start
+    report = {
+        'posts': len(texts),
+        'workers': workers,
+        'batch_size': batch_size,
+        'sorted': sort,
+        'seconds': elapsed,
+        'posts_per_sec': len(texts) / elapsed if elapsed else 0.0,
+        'padding_efficiency': padding_efficiency(texts, batches),
+        'main_rss_mb': peak_rss_mb(),
+        'worker_rss_mb': sorted(worker_rss.values(), reverse=True) if workers > 1 else [],
+    }
+    if result is None:
+        result = np.zeros((0, 0), dtype=np.float32)
+    return result, report
+
+
+def format_report(report):
+    line = (f"{report['posts']}개, 워커 {report['workers']}, 배치 {report['batch_size']}"
+            f"{'' if report['sorted'] else ' (정렬 안 함)'}: "
+            f"{report['seconds']:.1f}s, {report['posts_per_sec']:.1f} posts/sec, "
+            f"패딩 효율 {report['padding_efficiency']:.0%}, 피크 RSS 메인 {report['main_rss_mb']:.0f}MB")
+    if report['worker_rss_mb']:
+        rss = report['worker_rss_mb']
+        line += f" / 워커 최대 {max(rss):.0f}MB (합 {sum(rss):.0f}MB)"
+    return line
@@ -0,0 +1,647 @@
+"""
+정적 데이터 통합 빌드 파이프라인
+
+DB의 posts 테이블을 한 번만 스트리밍으로 읽어 모든 단계(stage)에 나눠 주고
+(다른 테이블이 필요한 단계는 같은 연결로 read_tables 에서 읽음),
+의존 관계(DAG) 순서대로 각 단계를 실행합니다.
+
+- 각 단계는 자신이 쓰는 필드만으로 입력 지문(fingerprint)을 만듭니다.
+  의존 단계의 지문도 포함하므로 앞 단계가 바뀌면 뒤 단계도 다시 돕니다.
+- 지문이 지난번과 같고 출력 파일이 모두 있으면 그 단계는 건너뜁니다.
+- 지난 지문은 .cache/pipeline-state.json 에 저장됩니다.
+- 단계별 읽기(add)/실행(run) 시간을 표로 보여주고, 단계 안의 세부 구간까지
+  metrics.py 실행 리포트(.cache/runs/*.json)로 남깁니다.
+"""
+
+import hashlib
+import json
+import time
+from pathlib import Path
+
+from blog_data import CACHE_DIR, OUTPUT_DIR, connect, iter_posts, iter_summaries, write_json
+from ann_index import ANN_INDEX_NPZ
+from embedding_store import (
+    EMBEDDINGS_IDS_JSON, EMBEDDINGS_NPY, content_hash, embedding_text, load_embeddings,
+)
+from chunk_store import (
+    CHUNK_EMBEDDINGS_NPY, CHUNK_OFFSETS_NPY, CHUNK_SPANS_NPY, chunk_spans, chunk_texts, chunks_hash,
+)
+from embeddings import MODE_FILE, build_embeddings, encoder_model
+from parallel_encode import DEFAULT_BATCH_SIZE
+from keyword_stats import KEYWORDS_DIR, KEYWORDS_INDEX_JSON, KeywordStatsBuilder, save_keyword_stats
+import layout
+import metrics
+import network_graph
+from near_duplicates import (
+    MINHASH_CACHE_FILE, NEAR_DUPLICATES_JSON, SHINGLE_LIMIT, SignatureCache, build_near_duplicates,
+    collapse_similar, load_canonical,
+)
+from search_index import BODY_LIMIT, SEARCH_INDEX_NPZ, SearchIndexBuilder
+from similarity import DEFAULT_BLOCK_SIZE, SIMILARITY_BIN, SIMILARITY_IDS_JSON, SimilarityCSR
+from post_shards import SHARDS_DIR, SHARDS_MANIFEST_JSON
+from quantized_index import QUANTIZED_INDEX_NPZ
+from static_data import StaticDataBuilder
+import timeline
+import topic_clusters
+import topic_drift
+
+STATE_PATH = CACHE_DIR / 'pipeline-state.json'
+
+
+class Stage:
+    """파이프라인 단계 기본 클래스"""
+
+    name = ''
+    depends_on = ()
+    outputs = ()
+
+    def __init__(self, options, output_dir):
+        self.options = options
+        self.output_dir = output_dir
+        self.force = False
+        self._digest = hashlib.sha1()
+
+    def wants(self, post):
+        return True
+
+    def add(self, post):
+        raise NotImplementedError
+
+    def read_tables(self, conn):
+        """글을 모두 받은 뒤 posts 외 테이블이 필요하면 같은 연결로 읽기"""
+
+    def feed(self, *parts):
+        """입력 지문에 값 추가"""
+        for part in parts:
+            self._digest.update(str(part).encode('utf-8'))
+            self._digest.update(b'\x1f')
+
+    def fingerprint(self, dependency_fingerprints):
+        digest = self._digest.copy()
+        for fp in dependency_fingerprints:
+            digest.update(fp.encode('utf-8'))
+        return digest.hexdigest()
+
+    def run(self, output_dir, deps):
+        raise NotImplementedError
+
+    def close(self):
+        """실행 여부와 관계없이 마지막에 호출 (임시 파일 정리 등)"""
+
+
+def post_text_hash(post):
+    """글 전체(제목 + 본문) 해시 (청크 모드에선 500자 뒤 수정도 임베딩을 바꾸므로)"""
+    return content_hash(f"{post.title}\n{post.content}")
+
+
+def embedding_hashes(options, hashes):
+    """글 해시에 임베딩 모델 / 문서 벡터 방식(MODE_FILE)을 붙인 캐시 키
+
+    모델이나 --chunks 방식이 바뀌면 모든 키가 바뀌어 임베딩 기반 캐시를 다시 계산합니다.
+    """
+    mode_path = Path(options.get('cache_dir', CACHE_DIR)) / MODE_FILE
+    mode = mode_path.read_text().strip() if mode_path.exists() else ''
+    model_name, _ = encoder_model(options.get('encoder', 'model'))
+    prefix = f"{model_name}|{mode}|"
+    return [content_hash(prefix + digest) for digest in hashes]
+
+
+class StaticStage(Stage):
+    """posts-light / posts-meta / monthly-stats / categories / shards
+
+    읽는 동안 임시 파일에 바로 쓰고, 실행되면 rename / 건너뛰면 삭제합니다.
+    """
+
+    name = 'static'
+    outputs = ('posts-light.json', 'posts-meta.json', 'monthly-stats.json', 'categories.json',
+               f'{SHARDS_DIR}/{SHARDS_MANIFEST_JSON}')
+
+    def __init__(self, options, output_dir):
+        super().__init__(options, output_dir)
+        self.builder = StaticDataBuilder(output_dir)
+
+    def add(self, post):
+        self.feed(post.post_id, post.title, post.category, post.pub_date, post.char_count,
+                  post.content[:200])
+        self.builder.add(post)
+
+    def run(self, output_dir, deps):
+        with metrics.span('static/serialize'):
+            self.builder.commit()
+
+    def close(self):
+        self.builder.discard()
+
+
+def stats_documents(builder):
+    """static 단계 집계 -> (월별 통계, 카테고리 계층) Firestore 문서 내용"""
+    category_hierarchy = [
+        {'main': main, 'sub': sub, 'count': count}
+        for main, subs in builder.hierarchy.items()
+        for sub, count in subs.items()
+    ]
+    category_hierarchy.sort(key=lambda x: x['count'], reverse=True)
+    return builder.monthly_stats(), category_hierarchy
+
+
+class StatsStage(Stage):
+    """Firestore stats 문서 (월별 통계 / 카테고리 계층) 업로드"""
+
+    name = 'stats'
+    depends_on = ('static',)
+
+    def add(self, post):
+        pass
+
+    def run(self, output_dir, deps):
+        import firebase_admin
+        from firebase_admin import credentials, firestore
+
+        try:
+            firebase_admin.get_app()
+        except ValueError:
+            cred = credentials.Certificate(str(Path(__file__).parent / 'firebase-admin-key.json'))
+            firebase_admin.initialize_app(cred)
+        db = firestore.client()
+
+        monthly_stats, category_hierarchy = stats_documents(deps['static'].builder)
+        with metrics.span('stats/upload', rows=2):
+            db.collection('stats').document('monthly').set({
+                'monthlyStats': monthly_stats,
+                'updatedAt': firestore.SERVER_TIMESTAMP
+            })
+            print(f"월별 통계 저장 완료: {len(monthly_stats)}개 월")
+
+            db.collection('stats').document('categories').set({
+                'hierarchy': category_hierarchy,
+                'updatedAt': firestore.SERVER_TIMESTAMP
+            })
+        print(f"카테고리 통계 저장 완료: {len(category_hierarchy)}개 카테고리")
+
+
+class EmbeddingsStage(Stage):
+    """임베딩 / 유사도 매트릭스 / ANN·양자화 인덱스 (chunks 옵션이면 청크 임베딩도)"""
+
+    name = 'embeddings'
+    depends_on = ('dedupe',)  # 유사 글 목록에서 중복 묶음을 접기 위해
+    outputs = (
+        EMBEDDINGS_NPY, EMBEDDINGS_IDS_JSON, 'similarity-matrix.json',
+        SIMILARITY_BIN, SIMILARITY_IDS_JSON, ANN_INDEX_NPZ, QUANTIZED_INDEX_NPZ,
+    )
+
+    def __init__(self, options, output_dir):
+        super().__init__(options, output_dir)
+        self.force = options.get('full', False)
+        self.pool = options.get('chunks')
+        self.post_ids = []
+        self.texts = []
+        self.spans = []
+        if self.pool:
+            self.outputs = self.outputs + (CHUNK_EMBEDDINGS_NPY, CHUNK_OFFSETS_NPY, CHUNK_SPANS_NPY)
+        self.feed(options.get('dtype', 'float16'), options.get('json', False), self.pool,
+                  options.get('quantization', 'pq'), options.get('encoder', 'model'))
+
+    def wants(self, post):
+        return bool(post.content)
+
+    def add(self, post):
+        self.post_ids.append(post.post_id)
+        if self.pool:
+            spans = chunk_spans(post.content)
+            texts = chunk_texts(post.title, post.content, spans)
+            self.spans.append(spans)
+            self.texts.append(texts)
+            self.feed(post.post_id, chunks_hash(texts))
+        else:
+            text = embedding_text(post.title, post.content)
+            self.texts.append(text)
+            self.feed(post.post_id, content_hash(text))
+
+    def run(self, output_dir, deps):
+        build_embeddings(
+            self.post_ids, self.texts, output_dir,
+            block_size=self.options.get('block_size', DEFAULT_BLOCK_SIZE),
+            full=self.options.get('full', False),
+            dtype=self.options.get('dtype', 'float16'),
+            write_json=self.options.get('json', False),
+            workers=self.options.get('encode_workers', 1),
+            batch_size=self.options.get('batch_size', DEFAULT_BATCH_SIZE),
+            pool=self.pool,
+            spans=self.spans,
+            quantization=self.options.get('quantization', 'pq'),
+            encoder=self.options.get('encoder', 'model'),
+            cache_dir=self.options.get('cache_dir', CACHE_DIR),
+            canonical=load_canonical(output_dir),
+        )
+
+
+class DedupeStage(Stage):
+    """near-duplicates.json (MinHash + LSH 근사 중복 / 연작 묶음)
+
+    서명 캐시에 같은 해시가 있는 글은 본문을 들고 있지 않습니다.
+    """
+
+    name = 'dedupe'
+    outputs = (NEAR_DUPLICATES_JSON,)
+
+    def __init__(self, options, output_dir):
+        super().__init__(options, output_dir)
+        self.cache = SignatureCache(Path(options.get('cache_dir', CACHE_DIR)) / MINHASH_CACHE_FILE)
+        self.post_ids = []
+        self.pub_dates = []
+        self.texts = []
+        self.hashes = []
+
+    def wants(self, post):
+        return bool(post.content)
+
+    def add(self, post):
+        text = post.content[:SHINGLE_LIMIT]
+        digest = content_hash(text)
+        entry = self.cache.entries.get(post.post_id)
+        self.post_ids.append(post.post_id)
+        self.pub_dates.append(post.pub_date)
+        self.hashes.append(digest)
+        self.texts.append(None if entry is not None and entry[0] == digest else text)
+        self.feed(post.post_id, post.pub_date, digest)
+
+    def run(self, output_dir, deps):
+        with metrics.span('dedupe/build', rows=len(self.post_ids)):
+            result = build_near_duplicates(
+                self.post_ids, self.pub_dates, self.texts, self.hashes, output_dir,
+                workers=self.options.get('dedupe_workers', 1), cache=self.cache,
+            )
+        duplicated = sum(len(group['ids']) for group in result['duplicates'])
+        print(f"   후보 쌍 {result['candidates']}개 -> 중복 묶음 {len(result['duplicates'])}개 "
+              f"({duplicated}개 글), 연작 묶음 {len(result['series'])}개")
+        print(f"   ✅ {NEAR_DUPLICATES_JSON} 저장")
+
+
+class LayoutStage(Stage):
+    """posts-map.json / category-map.json (2D 의미 지도)"""
+
+    name = 'layout'
+    depends_on = ('embeddings',)
+    outputs = (layout.POSTS_MAP_JSON, layout.CATEGORY_MAP_JSON)
+
+    def __init__(self, options, output_dir):
+        super().__init__(options, output_dir)
+        self.posts = []
+        self.hashes = []
+
+    def wants(self, post):
+        return bool(post.content)
+
+    def add(self, post):
+        self.posts.append((post.post_id, post.title, post.category, post.pub_date))
+        self.hashes.append(post_text_hash(post))
+        self.feed(post.post_id, post.title, post.category, post.pub_date)
+
+    def run(self, output_dir, deps):
+        post_ids, embeddings = load_embeddings(output_dir)
+        if post_ids != [post[0] for post in self.posts]:
+            raise RuntimeError("embeddings-ids.json 이 DB 글 목록과 다릅니다 (embeddings 단계 먼저 실행)")
+        with metrics.span('layout/compute', rows=len(post_ids)):
+            Y = layout.compute_layout(
+                embeddings, post_ids, embedding_hashes(self.options, self.hashes),
+                SimilarityCSR(output_dir).similar,
+                full=self.options.get('layout_full', False),
+                cache_path=Path(self.options.get('cache_dir', CACHE_DIR)) / layout.LAYOUT_CACHE_PATH.name,
+            )
+        with metrics.span('layout/serialize', rows=len(post_ids)):
+            post_count, category_count = layout.save_layout(output_dir, Y, self.posts)
+        print(f"   ✅ {layout.POSTS_MAP_JSON} 저장 ({post_count}개)")
+        print(f"   ✅ {layout.CATEGORY_MAP_JSON} 저장 ({category_count}개 카테고리)")
+
+
+class TopicsStage(Stage):
+    """topics.json / topic-assignments.npy / topic-centroids.npy (임베딩 주제 군집)"""
+
+    name = 'topics'
+    depends_on = ('embeddings',)
+    outputs = (topic_clusters.TOPICS_JSON, topic_clusters.TOPIC_ASSIGNMENTS_NPY,
+               topic_clusters.TOPIC_CENTROIDS_NPY)
+
+    def __init__(self, options, output_dir):
+        super().__init__(options, output_dir)
+        self.posts = []
+        self.hashes = []
+        self.feed(options.get('topic_clusters'))
+
+    def wants(self, post):
+        return bool(post.content)
+
+    def add(self, post):
+        self.posts.append((post.post_id, post.title))
+        self.hashes.append(post_text_hash(post))
+        self.feed(post.post_id, post.title)
+
+    def run(self, output_dir, deps):
+        post_ids, embeddings = load_embeddings(output_dir)
+        if post_ids != [post[0] for post in self.posts]:
+            raise RuntimeError("embeddings-ids.json 이 DB 글 목록과 다릅니다 (embeddings 단계 먼저 실행)")
+        with metrics.span('topics/cluster', rows=len(post_ids)):
+            labels, scores, centroids = topic_clusters.compute_topics(
+                embeddings, post_ids, embedding_hashes(self.options, self.hashes),
+                n_clusters=self.options.get('topic_clusters'),
+                full=self.options.get('full', False),
+                cache_path=Path(self.options.get('cache_dir', CACHE_DIR)) / topic_clusters.TOPICS_CACHE_FILE,
+            )
+        with metrics.span('topics/label', rows=len(post_ids)):
+            count = topic_clusters.save_topics(output_dir, self.posts, labels, scores, centroids)
+        print(f"   ✅ {topic_clusters.TOPICS_JSON} 저장 ({count}개 주제)")
+
+
+class DriftStage(Stage):
+    """topic-drift.json (월/분기/연도 임베딩 중심의 흐름, 기간별 대표 글)"""
+
+    name = 'drift'
+    depends_on = ('embeddings',)
+    outputs = (topic_drift.TOPIC_DRIFT_JSON,)
+
+    def __init__(self, options, output_dir):
+        super().__init__(options, output_dir)
+        self.posts = []
+        self.hashes = []
+
+    def wants(self, post):
+        return bool(post.content)
+
+    def add(self, post):
+        self.posts.append((post.post_id, post.title, post.pub_date))
+        self.hashes.append(post_text_hash(post))
+        self.feed(post.post_id, post.title, post.pub_date)
+
+    def run(self, output_dir, deps):
+        post_ids, embeddings = load_embeddings(output_dir)
+        if post_ids != [post[0] for post in self.posts]:
+            raise RuntimeError("embeddings-ids.json 이 DB 글 목록과 다릅니다 (embeddings 단계 먼저 실행)")
+        with metrics.span('drift/compute', rows=len(post_ids)):
+            result = topic_drift.compute_drift(
+                embeddings, self.posts, embedding_hashes(self.options, self.hashes),
+                full=self.options.get('full', False),
+                cache_path=Path(self.options.get('cache_dir', CACHE_DIR)) / topic_drift.DRIFT_CACHE_FILE,
+            )
+        topic_drift.save_drift(output_dir, result)
+        for kind in ('year', 'quarter'):
+            shifts = ', '.join(f"{key} ({result['periods'][key]['drift']:.3f})"
+                               for key in result['largestShifts'][kind])
+            print(f"   {kind} 변화가 큰 기간: {shifts or '-'}")
+        print(f"   ✅ {topic_drift.TOPIC_DRIFT_JSON} 저장 ({len(result['periods'])}개 기간)")
+
+
+class NetworkStage(Stage):
+    """public/data/network/ (구간별 브레인 네트워크 그래프)
+
+    near-duplicates.json 의 중복 묶음은 대표 글 하나만 노드로 남기고 이웃도 대표로 접습니다.
+    """
+
+    name = 'network'
+    depends_on = ('embeddings', 'dedupe')
+    outputs = (f'{network_graph.NETWORK_DIR}/{network_graph.NETWORK_INDEX_JSON}',)
+
+    def __init__(self, options, output_dir):
+        super().__init__(options, output_dir)
+        self.posts = []
+        self.feed(options.get('network_edges', 'threshold'))
+
+    def wants(self, post):
+        return bool(post.content)
+
+    def add(self, post):
+        self.posts.append((post.post_id, post.title, post.category, post.pub_date))
+        self.feed(post.post_id, post.title, post.category, post.pub_date)
+
+    def run(self, output_dir, deps):
+        canonical = load_canonical(output_dir)
+        posts = [post for post in self.posts if canonical.get(post[0], post[0]) == post[0]]
+        if len(posts) < len(self.posts):
+            print(f"   중복 글 {len(self.posts) - len(posts)}개를 대표 글로 접음")
+        index = network_graph.save_network(
+            output_dir, posts, collapse_similar(SimilarityCSR(output_dir).similar, canonical),
+            edges=self.options.get('network_edges', 'threshold'),
+        )
+        for window in index['windows']:
+            print(f"   {window['label']}: 노드 {window['posts']}개, 간선 {window['connections']}개")
+        print(f"   ✅ {network_graph.NETWORK_DIR}/ 저장 ({len(index['windows'])}개 구간, {index['edges']})")
+
+
+class SearchStage(Stage):
+    """search-index.npz (제목 / 본문 앞부분 / 요약 / 키워드 BM25 역색인)"""
+
+    name = 'search'
+    outputs = (SEARCH_INDEX_NPZ,)
+
+    def __init__(self, options, output_dir):
+        super().__init__(options, output_dir)
+        self.builder = SearchIndexBuilder()
+
+    def add(self, post):
+        self.builder.add(post.post_id, post.title, post.content)
+        self.feed(post.post_id, post.title, content_hash(post.content[:BODY_LIMIT]))
+
+    def read_tables(self, conn):
+        for post_id, summary, keywords in iter_summaries(conn):
+            if self.builder.add_summary(post_id, summary, keywords):
+                self.feed(post_id, summary, keywords)
+
+    def run(self, output_dir, deps):
+        with metrics.span('search/build'):
+            index = self.builder.build()
+        with metrics.span('search/serialize', rows=len(index)):
+            index.save(output_dir / SEARCH_INDEX_NPZ)
+        size = (output_dir / SEARCH_INDEX_NPZ).stat().st_size / (1024 * 1024)
+        print(f"   ✅ {SEARCH_INDEX_NPZ} 저장 ({len(index)}개 글, 용어 {len(index.terms)}개, {size:.1f}MB)")
+
+
+class KeywordsStage(Stage):
+    """public/data/keywords/ (요약 키워드 전체 / 연도별 / 카테고리별 집계, 동시 출현)"""
+
+    name = 'keywords'
+    outputs = (f'{KEYWORDS_DIR}/{KEYWORDS_INDEX_JSON}',)
+
+    def __init__(self, options, output_dir):
+        super().__init__(options, output_dir)
+        self.builder = KeywordStatsBuilder()
+
+    def add(self, post):
+        self.builder.add_post(post.post_id, post.pub_date, post.category)
+        self.feed(post.post_id, post.pub_date[:4] if post.pub_date else '', post.category)
+
+    def read_tables(self, conn):
+        for post_id, _, keywords in iter_summaries(conn):
+            if self.builder.add_keywords(post_id, keywords):
+                self.feed(post_id, keywords)
+
+    def run(self, output_dir, deps):
+        with metrics.span('keywords/serialize', rows=self.builder.posts_with_keywords):
+            index = save_keyword_stats(output_dir, self.builder)
+        print(f"   {index['posts']}개 글, 키워드 {index['keywords']}개, "
+              f"동시 출현 어휘 {index['vocabulary']}개 / 상위 쌍 {index['pairs']}개")
+        print(f"   ✅ {KEYWORDS_DIR}/ 저장 ({len(index['years'])}개 연도, {len(index['categories'])}개 카테고리)")
+
+
+class TimelineStage(Stage):
+    """timeline-summaries.json"""
+
+    name = 'timeline'
+    outputs = ('timeline-summaries.json',)
+
+    def __init__(self, options, output_dir):
+        super().__init__(options, output_dir)
+        self.posts = []
+        self.feed(timeline.ai_enabled(), options.get('stub', False))
+        if options.get('stub'):
+            self.outputs = ()  # 스텁 결과는 public/data 가 아니라 STUB_OUTPUT_PATH 에 씀
+
+    def wants(self, post):
+        return bool(post.pub_date)
+
+    def add(self, post):
+        self.posts.append((post.pub_date, post.title))
+        self.feed(post.pub_date, post.title)
+
+    def run(self, output_dir, deps):
+        monthly = timeline.group_by_month(self.posts)
+        print(f"   {len(monthly)}개 월 발견")
+        stub = self.options.get('stub', False)
+        client = timeline.StubClient() if stub else timeline.make_client()
+        with metrics.span('timeline/summarize', rows=len(monthly)):
+            summaries = timeline.build_timeline_summaries(
+                monthly, client=client,
+                concurrency=self.options.get('concurrency', timeline.DEFAULT_CONCURRENCY),
+                rate_limit=self.options.get('rate_limit', timeline.DEFAULT_RATE_LIMIT),
+                cache_path=timeline.STUB_CACHE_PATH if stub else timeline.CACHE_PATH,
+            )
+        path = timeline.STUB_OUTPUT_PATH if stub else output_dir / 'timeline-summaries.json'
+        write_json(path, summaries, ensure_ascii=False, indent=2)
+        print(f"\n✅ {path if stub else path.name} 저장 ({len(summaries)}개 요약)")
+
+
+STAGES = {
+    stage.name: stage
+    for stage in (StaticStage, StatsStage, EmbeddingsStage, DedupeStage, LayoutStage, TopicsStage,
+                  DriftStage, NetworkStage, SearchStage, KeywordsStage, TimelineStage)
+}
+DEFAULT_STAGES = ('static', 'embeddings', 'dedupe', 'layout', 'topics', 'drift', 'network',
+                  'search', 'keywords', 'timeline')
+
+
+def resolve_stages(names):
+    """의존 단계를 포함해 위상 정렬한 단계 이름 목록"""
+    order = []
+
+    def visit(name, path=()):
+        if name not in STAGES:
+            raise ValueError(f"알 수 없는 단계: {name}")
+        if name in path:
+            raise ValueError(f"순환 의존: {' -> '.join(path + (name,))}")
+        if name in order:
+            return
+        for dep in STAGES[name].depends_on:
+            visit(dep, path + (name,))
+        order.append(name)
+
+    for name in names:
+        visit(name)
+    return order
+
+
+def load_state(path):
+    if Path(path).exists():
+        with open(path, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    return {}
+
+
+def run_pipeline(names=DEFAULT_STAGES, db_path=None, output_dir=OUTPUT_DIR,
+                 force=False, options=None, state_path=STATE_PATH):
+    """단계들을 실행하고 단계별 결과/시간을 담은 리포트를 반환
+
+    force는 names에 직접 지정한 단계에만 적용됩니다 (의존 단계는 지문 비교).
+    options의 profile / trace_memory 에 단계(span) 이름을 주면 cProfile / tracemalloc 으로
+    감싸고, 실행 리포트는 metrics_path (기본 .cache/runs/) 에 저장합니다.
+    """
+    output_dir = Path(output_dir)
+    output_dir.mkdir(parents=True, exist_ok=True)
+    options = options or {}
+    order = resolve_stages(names)
+    stages = {name: STAGES[name](options, output_dir) for name in order}
+    add_times = {name: 0.0 for name in order}
+    add_counts = {name: 0 for name in order}
+    run = metrics.start_run('pipeline', profile=options.get('profile'),
+                            trace_memory=options.get('trace_memory'))
+
+    # 1. DB 한 번 읽기
+    print(f"📖 DB 읽는 중... (단계: {', '.join(order)})")
+    start = time.perf_counter()
+    try:
+        conn = connect(db_path)
+        post_count = 0
+        try:
+            with run.span('db-read') as read_span:
+                for post in iter_posts(conn):
+                    post_count += 1
+                    for name, stage in stages.items():
+                        t = time.perf_counter()
+                        if stage.wants(post):
+                            stage.add(post)
+                            add_counts[name] += 1
+                        add_times[name] += time.perf_counter() - t
+                for name, stage in stages.items():
+                    t = time.perf_counter()
+                    stage.read_tables(conn)
+                    add_times[name] += time.perf_counter() - t
+                read_span.add_rows(post_count)
+        finally:
+            conn.close()
+        read_time = time.perf_counter() - start
+        for name in order:
+            run.record(f'{name}/add', add_times[name], rows=add_counts[name])
+        print(f"   ✅ {post_count}개 글 ({read_time:.2f}s)")
+
+        # 2. DAG 순서대로 실행
+        state = load_state(state_path)
+        fingerprints = {}
+        report = {'posts': post_count, 'read_seconds': read_time, 'stages': []}
+
+        for name in order:
+            stage = stages[name]
+            fp = stage.fingerprint([fingerprints[dep] for dep in stage.depends_on])
+            fingerprints[name] = fp
+            outputs_ready = all((output_dir / out).exists() for out in stage.outputs)
+
+            forced = stage.force or (force and name in names)
+            if not forced and state.get(name) == fp and outputs_ready:
+                status, run_time = 'skipped', 0.0
+                print(f"\n⏭️  [{name}] 입력 변경 없음, 건너뜀")
+            else:
+                print(f"\n▶️  [{name}]")
+                t = time.perf_counter()
+                with run.span(name, rows=add_counts[name]):
+                    stage.run(output_dir, {dep: stages[dep] for dep in stage.depends_on})
+                run_time = time.perf_counter() - t
+                status = 'ran'
+                state[name] = fp
+                write_json(state_path, state, indent=2)
+
+            report['stages'].append({
+                'name': name,
+                'status': status,
+                'add_seconds': add_times[name],
+                'run_seconds': run_time,
+            })
+    finally:
+        for stage in stages.values():
+            stage.close()
+
+    # 3. 단계별 시간
+    print("\n" + "=" * 50)
+    print(f"{'단계':<12}{'상태':<10}{'읽기(s)':>10}{'실행(s)':>10}")
+    print(f"{'db-read':<12}{'':<10}{read_time:>10.2f}{'':>10}")
+    for row in report['stages']:
+        print(f"{row['name']:<12}{row['status']:<10}{row['add_seconds']:>10.2f}{row['run_seconds']:>10.2f}")
+    print("=" * 50)
+    report['metrics'] = str(run.save(options.get('metrics_path')))
+    print(f"📊 실행 리포트: {report['metrics']} (피크 RSS {metrics.peak_rss_mb():.0f}MB)")
+    return report
@@ -0,0 +1,139 @@
+"""
+글 목록 샤드 (월별 / 주 카테고리별) + 매니페스트
+
+posts-light.json / posts-meta.json 전체를 받지 않고 화면에 필요한 부분만 받을 수 있도록
+public/data/shards/ 에 나눠 씁니다.
+
+  shards/manifest.json          {'total', 'months': [...], 'categories': [...]}
+                                 각 항목 {'key', 'file', 'count', 'bytes'}
+  shards/month/2025-10.json     그 달의 글 (최신순)
+  shards/category/<해시>.json   주 카테고리의 글 (이름 해시라 순서가 바뀌어도 파일명 유지)
+
+항목은 posts-light 항목에 (본문이 있으면) posts-meta 의 excerpt 를 더한 형식입니다.
+샤드마다 파일을 열어 두지 않고 (월이 늘수록 열린 파일 수가 ulimit -n 에 가까워지므로)
+직렬화한 항목을 모아 두었다가 FLUSH_BYTES 마다 임시 파일에 이어 씁니다.
+내용이 바뀐 샤드 파일만 교체하고, 없어진 샤드는 지웁니다.
+"""
+
+import filecmp
+import hashlib
+import json
+from pathlib import Path
+
+from blog_data import month_key, split_category, write_json
+
+SHARDS_DIR = 'shards'
+SHARDS_MANIFEST_JSON = 'manifest.json'
+UNKNOWN_MONTH = 'unknown'
+FLUSH_BYTES = 64 * 1024
+
+
+def category_filename(name):
+    return hashlib.sha1(name.encode('utf-8')).hexdigest()[:10] + '.json'
+
+
+class ShardBuffer:
+    """샤드 하나의 JSON 배열 (json.dump 와 같은 바이트, 모아서 append 로 쓰기)"""
+
+    def __init__(self, path):
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.tmp_path = self.path.with_suffix(self.path.suffix + '.tmp')
+        self.tmp_path.write_text('[', encoding='utf-8')
+        self.pending = []
+        self.pending_bytes = 0
+        self.count = 0
+
+    def write(self, item):
+        text = json.dumps(item, ensure_ascii=False)
+        self.pending.append((', ' if self.count else '') + text)
+        self.pending_bytes += len(text)
+        self.count += 1
+        if self.pending_bytes >= FLUSH_BYTES:
+            self.flush()
+
+    def flush(self, suffix=''):
+        with open(self.tmp_path, 'a', encoding='utf-8') as f:
+            f.write(''.join(self.pending) + suffix)
+        self.pending = []
+        self.pending_bytes = 0
+
+    def commit(self):
+        """임시 파일로 교체 -> 교체했으면 True (기존 파일과 같으면 임시 파일만 지움)"""
+        self.flush(']')
+        if self.path.exists() and filecmp.cmp(self.tmp_path, self.path, shallow=False):
+            self.tmp_path.unlink()
+            return False
+        self.tmp_path.replace(self.path)
+        return True
+
+    def discard(self):
+        self.pending = []
+        if self.tmp_path.exists():
+            self.tmp_path.unlink()
+
+
+class PostShardWriter:
+    """글을 하나씩 받아 샤드별로 모아 쓰기 (열린 파일은 한 번에 하나)"""
+
+    def __init__(self, output_dir):
+        self.shard_dir = Path(output_dir) / SHARDS_DIR
+        self.writers = {'month': {}, 'category': {}}
+        self.total = 0
+
+    def _writer(self, kind, key, filename):
+        writer = self.writers[kind].get(key)
+        if writer is None:
+            writer = ShardBuffer(self.shard_dir / kind / filename)
+            self.writers[kind][key] = writer
+        return writer
+
+    def add(self, item):
+        """item: posts-light 항목 (+ excerpt)"""
+        month = month_key(item['pub_date']) or UNKNOWN_MONTH
+        self._writer('month', month, f'{month}.json').write(item)
+        main = split_category(item['category'])[0] if item['category'] else '미분류'
+        self._writer('category', main, category_filename(main)).write(item)
+        self.total += 1
+
+    def commit(self):
+        """바뀐 샤드만 교체 + 매니페스트 저장 -> (교체 수, 그대로 수, 삭제 수)"""
+        manifest = {'total': self.total, 'months': [], 'categories': []}
+        written = unchanged = 0
+        keep = set()
+        for kind, section in (('month', 'months'), ('category', 'categories')):
+            for key, writer in self.writers[kind].items():
+                path = writer.path
+                if writer.commit():
+                    written += 1
+                else:
+                    unchanged += 1
+                keep.add(path)
+                manifest[section].append({
+                    'key': key,
+                    'file': f'{kind}/{path.name}',
+                    'count': writer.count,
+                    'bytes': path.stat().st_size,
+                })
+
+        # 최신 월부터, 날짜 없는 글(unknown)은 맨 뒤
+        manifest['months'].sort(key=lambda entry: (entry['key'] != UNKNOWN_MONTH, entry['key']),
+                                reverse=True)
+        manifest['categories'].sort(key=lambda entry: -entry['count'])
+
+        removed = 0
+        for kind in self.writers:
+            for path in (self.shard_dir / kind).glob('*.json'):
+                if path not in keep:
+                    path.unlink()
+                    removed += 1
+
+        write_json(self.shard_dir / SHARDS_MANIFEST_JSON, manifest, ensure_ascii=False, indent=2)
+        self.writers = {'month': {}, 'category': {}}
+        return written, unchanged, removed
+
+    def discard(self):
+        for writers in self.writers.values():
+            for writer in writers.values():
+                writer.discard()
+        self.writers = {'month': {}, 'category': {}}
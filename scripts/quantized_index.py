@@ -0,0 +1,194 @@
+"""
+양자화 임베딩 인덱스 (근사 점수로 후보 -> 정확한 벡터로 재정렬)
+
+서빙 쪽에서 글마다 384차원 float32(1.5KB)를 메모리에 올리지 않도록
+코드만 메모리에 두고 전체 글에 대해 근사 점수를 계산한 뒤,
+상위 rerank개 후보만 embeddings.npy(메모리 매핑)에서 읽어 정확한 코사인으로 정렬합니다.
+
+방식 (method):
+  - pq:   product quantization. 벡터를 m개 부분 공간으로 나누고 공간마다 256개 중심으로
+          양자화 -> 글당 m바이트 (기본 m=48, 384차원 기준 32배 작음).
+          쿼리마다 (m, 256) 내적 표를 만들어 코드로 표를 찾아 더합니다 (ADC).
+          코드는 부분 공간별로 연속되게 (m, N) 로 저장해 표 찾기를 열 단위로 합니다.
+  - int8: 행별 대칭 int8 스칼라 양자화 -> 글당 D + 4바이트 (4배 작음).
+
+저장 파일: public/data/quantized-index.npz
+  - method, ids
+  - pq:   codes (m, N) uint8, codebooks (m, 256, D/m) float32
+  - int8: codes (N, D) int8, scales (N,) float32
+"""
+
+from pathlib import Path
+
+import numpy as np
+
+from embedding_store import quantize_int8
+from similarity import normalize
+
+QUANTIZED_INDEX_NPZ = 'quantized-index.npz'
+QUANTIZATION_METHODS = ('pq', 'int8')
+DEFAULT_SUBSPACES = 48
+PQ_CENTROIDS = 256
+DEFAULT_RERANK = 100
+
+
+def kmeans(vectors, n_clusters, n_iter=15, sample_size=None, block_size=8192, seed=0):
+    """유클리드 k-means -> (n_clusters, d) 중심 (sample_size개 샘플로 학습)"""
+    rng = np.random.default_rng(seed)
+    n = len(vectors)
+    sample_size = min(n, sample_size or n_clusters * 64)
+    sample = np.asarray(vectors[rng.choice(n, size=sample_size, replace=False)], dtype=np.float32)
+    n_clusters = min(n_clusters, len(sample))
+    centroids = sample[rng.choice(len(sample), size=n_clusters, replace=False)].copy()
+
+    for _ in range(n_iter):
+        assign = nearest_centroid(sample, centroids, block_size)
+        counts = np.bincount(assign, minlength=n_clusters)
+        sums = np.stack([
+            np.bincount(assign, weights=sample[:, d], minlength=n_clusters)
+            for d in range(sample.shape[1])
+        ], axis=1)
+
+        # 빈 중심은 임의의 샘플로 다시 채움
+        empty = counts == 0
+        sums[empty] = sample[rng.choice(len(sample), size=int(empty.sum()))]
+        counts[empty] = 1
+        centroids = sums / counts[:, None]
+
+    return centroids
+
+
+def nearest_centroid(vectors, centroids, block_size=8192):
+    """각 벡터와 유클리드 거리가 가장 가까운 중심 번호"""
+    c_norms = (centroids ** 2).sum(axis=1)
+    assign = np.empty(len(vectors), dtype=np.int64)
+    for start in range(0, len(vectors), block_size):
+        block = np.asarray(vectors[start:start + block_size], dtype=np.float32)
+        assign[start:start + block_size] = np.argmin(c_norms - 2 * block @ centroids.T, axis=1)
+    return assign
+
+
+class QuantizedIndex:
+    """양자화 코드 인덱스 (내적 = 코사인 유사도)
+
+    exact: 재정렬에 쓸 원래 행 순서의 임베딩 (load_embeddings 의 memmap 등).
+    없으면 근사 점수로만 정렬합니다.
+    """
+
+    def __init__(self, method, codes, post_ids, codebooks=None, scales=None, exact=None):
+        if method not in QUANTIZATION_METHODS:
+            raise ValueError(f"지원하지 않는 양자화 방식: {method}")
+        self.method = method
+        self.codes = codes
+        self.codebooks = codebooks
+        self.scales = scales
+        self.exact = exact
+        self.post_ids = list(post_ids)
+        self.row_of = {post_id: i for i, post_id in enumerate(self.post_ids)}
+
+    def __len__(self):
+        return len(self.post_ids)
+
+    @property
+    def nbytes(self):
+        """메모리에 올리는 코드/코드북 크기 (바이트)"""
+        return sum(a.nbytes for a in (self.codes, self.codebooks, self.scales) if a is not None)
+
+    @classmethod
+    def build(cls, embeddings, post_ids, method='pq', m=DEFAULT_SUBSPACES, seed=0):
+        normed = normalize(embeddings)
+        if method == 'int8':
+            codes, scales = quantize_int8(normed)
+            return cls('int8', codes, post_ids, scales=scales)
+
+        dim = normed.shape[1]
+        m = max(d for d in range(1, min(m, dim) + 1) if dim % d == 0)  # 차원을 나누는 최대 m
+        sub = dim // m
+        codebooks = np.empty((m, min(PQ_CENTROIDS, len(normed)), sub), dtype=np.float32)
+        codes = np.empty((m, len(normed)), dtype=np.uint8)
+        for j in range(m):
+            part = normed[:, j * sub:(j + 1) * sub]
+            codebooks[j] = kmeans(part, codebooks.shape[1], seed=seed + j)
+            codes[j] = nearest_centroid(part, codebooks[j])
+        return cls('pq', codes, post_ids, codebooks=codebooks)
+
+    def save(self, path):
+        path = Path(path)
+        extra = {'codebooks': self.codebooks} if self.method == 'pq' else {'scales': self.scales}
+        tmp_path = path.with_suffix('.tmp.npz')
+        np.savez(
+            tmp_path,
+            method=np.array(self.method),
+            codes=self.codes,
+            ids=np.array(self.post_ids, dtype=str),
+            **extra,
+        )
+        tmp_path.replace(path)
+
+    @classmethod
+    def load(cls, path, exact=None):
+        data = np.load(path, allow_pickle=False)
+        method = str(data['method'])
+        return cls(
+            method, data['codes'], [str(i) for i in data['ids']],
+            codebooks=data['codebooks'] if method == 'pq' else None,
+            scales=data['scales'] if method == 'int8' else None,
+            exact=exact,
+        )
+
+    def approximate_scores(self, query, block_size=16384):
+        """정규화한 쿼리와 모든 글의 근사 내적"""
+        if self.method == 'pq':
+            m, _, sub = self.codebooks.shape
+            table = np.einsum('mcs,ms->mc', self.codebooks, query.reshape(m, sub))
+            scores = np.zeros(len(self), dtype=np.float32)
+            for j in range(m):
+                scores += np.take(table[j], self.codes[j])
+        else:
+            scores = np.empty(len(self), dtype=np.float32)
+            for start in range(0, len(self.codes), block_size):
+                block = self.codes[start:start + block_size].astype(np.float32)
+                scores[start:start + block_size] = (block @ query) * self.scales[start:start + block_size]
+        return scores
+
+    def search(self, query, k=10, rerank=DEFAULT_RERANK, exclude=None):
+        """쿼리 벡터와 가장 비슷한 k개 -> [(post_id, score), ...]
+
+        rerank: 정확한 벡터로 다시 계산할 후보 수 (0이면 근사 점수 그대로)
+        exclude: 결과에서 뺄 행 번호 (자기 자신 등)
+        """
+        query = np.asarray(query, dtype=np.float32).ravel()
+        query = query / (np.linalg.norm(query) or 1.0)
+        scores = self.approximate_scores(query)
+        if exclude is not None:
+            scores[exclude] = -np.inf
+
+        n_cand = min(max(k, rerank), len(scores) - (exclude is not None))
+        if n_cand <= 0:
+            return []
+        cand = np.argpartition(-scores, n_cand - 1)[:n_cand]
+        if rerank and self.exact is not None:
+            rows = np.sort(cand)  # memmap 읽기를 순차에 가깝게
+            scores = normalize(self.exact[rows]) @ query
+            cand = rows
+        else:
+            scores = scores[cand]
+        k = min(k, len(cand))
+        top = np.argpartition(-scores, k - 1)[:k]
+        top = top[np.argsort(-scores[top], kind='stable')]
+        return [(self.post_ids[cand[i]], float(scores[i])) for i in top]
+
+    def search_id(self, post_id, k=10, rerank=DEFAULT_RERANK):
+        """저장된 글과 비슷한 k개 (자기 자신 제외, exact가 없으면 복원한 벡터로 질의)"""
+        row = self.row_of.get(post_id)
+        if row is None:
+            return []
+        query = self.exact[row] if self.exact is not None else self.reconstruct(row)
+        return self.search(query, k=k, rerank=rerank, exclude=row)
+
+    def reconstruct(self, row):
+        """코드에서 복원한 근사 벡터"""
+        if self.method == 'pq':
+            m = len(self.codebooks)
+            return self.codebooks[np.arange(m), self.codes[:, row]].ravel()
+        return self.codes[row].astype(np.float32) * self.scales[row]
@@ -0,0 +1,269 @@
+"""
+RSS -> 로컬 SQLite posts 증분 수집
+
+/api/sync 는 RSS 를 Firestore 에만 쓰므로 SQLite 와 파생 산출물은 DB 를 다시 내보내기 전까지
+새 글을 모릅니다. 여기서는 같은 RSS 를 SQLite posts 테이블에 바로 넣습니다.
+
+  - 여러 피드 페이지를 asyncio 로 동시에 가져옵니다 (요청 자체는 스레드에서 urllib).
+    지난 응답의 ETag / Last-Modified 를 .cache/rss-state.json 에 두고 조건부 요청을 보내
+    304 면 그 페이지는 건너뜁니다.
+  - 응답은 받는 대로 XMLPullParser 에 넣어 <item> 단위로 파싱합니다 (문서 전체를 올리지 않음).
+  - 새 글 / 제목·카테고리·본문이 바뀐 글만 한 트랜잭션으로 upsert 합니다.
+    RSS 본문은 잘린 요약일 수 있으므로, 제목이 그대로인데 피드 본문이 DB 본문보다 짧으면
+    DB 본문(긴 쪽)을 유지합니다. 공백 차이만 있는 본문도 바뀐 것으로 보지 않습니다.
+  - 바뀐 post_id 목록을 .cache/ingest-changes.json 에 남깁니다 (수집 기록용).
+    파이프라인 단계들은 내용 해시로 증분 처리하므로 id 목록을 넘기지 않아도
+    build-all.py (또는 ingest-rss.py --build) 가 바뀐 글만 다시 계산합니다.
+  - 조건부 요청 상태는 DB 커밋이 끝난 뒤에만 저장합니다 (실패하면 다음에 다시 받음).
+
+테스트할 때는 로컬 HTTP 서버(python -m http.server 등)의 URL 을 --feed 로 넘기면 됩니다.
+"""
+
+import asyncio
+import html
+import json
+import re
+import time
+import urllib.error
+import urllib.request
+import xml.etree.ElementTree as ET
+from datetime import datetime
+from email.utils import parsedate_to_datetime
+from pathlib import Path
+from typing import NamedTuple
+from zoneinfo import ZoneInfo
+
+from blog_data import CACHE_DIR, write_json
+import metrics
+
+DEFAULT_FEED = 'https://irepublic.tistory.com/rss'
+STATE_PATH = CACHE_DIR / 'rss-state.json'
+CHANGES_PATH = CACHE_DIR / 'ingest-changes.json'
+DEFAULT_CONCURRENCY = 4
+TIMEOUT = 30
+READ_SIZE = 64 * 1024
+USER_AGENT = 'irepublic-brain-ingest/1.0'
+BLOG_TZ = ZoneInfo('Asia/Seoul')  # DB pub_date 는 블로그(한국) 시각
+
+_TAG_RE = re.compile(r'<[^>]+>')
+_BLOCK_RE = re.compile(r'<\s*(br|/p|/div|/li|/h[1-6])\b[^>]*>', re.IGNORECASE)
+_BLANK_LINES_RE = re.compile(r'\n\s*\n+')
+
+
+class FeedItem(NamedTuple):
+    post_id: str
+    title: str
+    category: str
+    pub_date: str
+    content: str
+
+
+class FeedPage(NamedTuple):
+    url: str
+    status: int  # 200 / 304
+    items: list
+    etag: str | None
+    last_modified: str | None
+
+
+def feed_urls(feed, pages):
+    """첫 페이지 + ?page=2..N (티스토리 RSS 페이지)"""
+    separator = '&' if '?' in feed else '?'
+    return [feed] + [f'{feed}{separator}page={n}' for n in range(2, pages + 1)]
+
+
+def extract_post_id(link):
+    """https://irepublic.tistory.com/1234 -> '1234' (숫자가 없으면 링크 그대로)"""
+    match = re.search(r'/(\d+)/?$', link or '')
+    return match.group(1) if match else link
+
+
+def html_to_text(markup):
+    """description HTML -> 줄바꿈을 살린 평문"""
+    text = _BLOCK_RE.sub('\n', markup or '')
+    text = html.unescape(_TAG_RE.sub('', text)).replace('\xa0', ' ')
+    return _BLANK_LINES_RE.sub('\n\n', text).strip()
+
+
+def parse_pub_date(value):
+    """RFC 822 날짜 -> 'YYYY-MM-DD HH:MM:SS' (BLOG_TZ 시각, 실패하면 지금)
+
+    실행하는 호스트의 시간대와 상관없이 BLOG_TZ 로 바꿉니다 (시간대가 없으면 그대로).
+    """
+    try:
+        moment = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        moment = None
+    if moment is None:
+        moment = datetime.now(BLOG_TZ)
+    elif moment.tzinfo is not None:
+        moment = moment.astimezone(BLOG_TZ)
+    return moment.strftime('%Y-%m-%d %H:%M:%S')
+
+
+def _item(element):
+    def text(tag):
+        child = element.find(tag)
+        return (child.text or '').strip() if child is not None else ''
+
+    return FeedItem(
+        post_id=extract_post_id(text('link') or text('guid')),
+        title=html.unescape(text('title')),
+        category=text('category') or '미분류',
+        pub_date=parse_pub_date(text('pubDate')),
+        content=html_to_text(text('description')),
+    )
+
+
+def parse_stream(chunks):
+    """바이트 조각을 받는 대로 파싱 -> FeedItem 생성기 (<item> 하나씩, 다 쓴 요소는 버림)"""
+    parser = ET.XMLPullParser(events=('end',))
+    for chunk in chunks:
+        parser.feed(chunk)
+        for _, element in parser.read_events():
+            if element.tag == 'item':
+                yield _item(element)
+                element.clear()
+    parser.close()
+    for _, element in parser.read_events():
+        if element.tag == 'item':
+            yield _item(element)
+
+
+def fetch_page(url, etag=None, last_modified=None, timeout=TIMEOUT):
+    """조건부 GET + 스트리밍 파싱 -> FeedPage (304 면 items 없음)"""
+    headers = {'User-Agent': USER_AGENT}
+    if etag:
+        headers['If-None-Match'] = etag
+    if last_modified:
+        headers['If-Modified-Since'] = last_modified
+    request = urllib.request.Request(url, headers=headers)
+    try:
+        with urllib.request.urlopen(request, timeout=timeout) as response:
+            chunks = iter(lambda: response.read(READ_SIZE), b'')
+            items = list(parse_stream(chunks))
+            return FeedPage(url, response.status, items,
+                            response.headers.get('ETag'), response.headers.get('Last-Modified'))
+    except urllib.error.HTTPError as error:
+        if error.code == 304:
+            return FeedPage(url, 304, [], etag, last_modified)
+        raise
+
+
+async def fetch_pages(urls, state, concurrency=DEFAULT_CONCURRENCY, timeout=TIMEOUT):
+    """여러 페이지를 동시에 가져오기 (동시 요청 수 제한) -> [FeedPage] (urls 순서)"""
+    semaphore = asyncio.Semaphore(max(1, concurrency))
+
+    async def fetch(url):
+        cached = state.get(url, {})
+        async with semaphore:
+            return await asyncio.to_thread(
+                fetch_page, url, cached.get('etag'), cached.get('last_modified'), timeout)
+
+    return await asyncio.gather(*(fetch(url) for url in urls))
+
+
+def load_state(path=STATE_PATH):
+    if Path(path).exists():
+        with open(path, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    return {}
+
+
+def _squash(text):
+    """공백 차이를 무시하고 비교하기 위한 정규화"""
+    return ' '.join(text.split())
+
+
+def merge_content(old_title, old_content, title, content):
+    """저장할 본문 결정: 피드가 잘린 요약이면 DB 의 긴 본문 유지"""
+    old_flat, flat = _squash(old_content), _squash(content)
+    if flat == old_flat or old_flat.startswith(flat):
+        return old_content
+    if len(content) < len(old_content) and title == old_title:
+        return old_content
+    return content
+
+
+def upsert_posts(conn, items):
+    """새 글 / 바뀐 글만 한 트랜잭션으로 반영 -> (new_ids, updated_ids)"""
+    unique = {}
+    for item in items:  # 여러 페이지에 같은 글이 있으면 먼저 나온 것 (최신 페이지)
+        unique.setdefault(item.post_id, item)
+    items = list(unique.values())
+    existing = {}
+    ids = [item.post_id for item in items]
+    for start in range(0, len(ids), 500):
+        chunk = ids[start:start + 500]
+        rows = conn.execute(
+            f"SELECT post_id, title, category, content FROM posts "
+            f"WHERE post_id IN ({','.join('?' * len(chunk))})", chunk)
+        for post_id, title, category, content in rows:
+            existing[str(post_id)] = (title or '', category or '', content or '')
+
+    new_ids, updated_ids = [], []
+    with conn:
+        for item in items:
+            old = existing.get(item.post_id)
+            if old is None:
+                row_id = int(item.post_id) if item.post_id.isdigit() else None
+                if row_id is not None and conn.execute(
+                        'SELECT 1 FROM posts WHERE id = ?', (row_id,)).fetchone():
+                    row_id = None
+                conn.execute(
+                    'INSERT INTO posts (id, post_id, title, category, pub_date, content, char_count) '
+                    'VALUES (?, ?, ?, ?, ?, ?, ?)',
+                    (row_id, item.post_id, item.title, item.category, item.pub_date,
+                     item.content, len(item.content)))
+                new_ids.append(item.post_id)
+                continue
+
+            title, category, content = old
+            merged = merge_content(title, content, item.title, item.content)
+            if item.title == title and item.category == category and merged == content:
+                continue
+            conn.execute(
+                'UPDATE posts SET title = ?, category = ?, content = ?, char_count = ? WHERE post_id = ?',
+                (item.title, item.category, merged, len(merged), item.post_id))
+            updated_ids.append(item.post_id)
+    return new_ids, updated_ids
+
+
+def ingest(conn, feed=DEFAULT_FEED, pages=1, concurrency=DEFAULT_CONCURRENCY, timeout=TIMEOUT,
+           state_path=STATE_PATH, changes_path=CHANGES_PATH, conditional=True):
+    """피드 수집 -> 변경 요약 dict ({'new', 'updated', 'changed', 'pages', ...})"""
+    state = load_state(state_path) if conditional else {}
+    urls = feed_urls(feed, pages)
+
+    with metrics.span('ingest/fetch', rows=len(urls)):
+        results = asyncio.run(fetch_pages(urls, state, concurrency=concurrency, timeout=timeout))
+    items = [item for page in results for item in page.items]
+    not_modified = sum(page.status == 304 for page in results)
+    metrics.count('ingest/items', len(items))
+    metrics.count('ingest/not_modified', not_modified)
+    print(f"   {len(urls)}개 페이지 (변경 없음 {not_modified}개), 글 {len(items)}개")
+
+    with metrics.span('ingest/upsert', rows=len(items)):
+        new_ids, updated_ids = upsert_posts(conn, items)
+
+    # DB 커밋이 끝난 뒤에만 조건부 요청 상태 저장
+    for page in results:
+        if page.status == 200 and (page.etag or page.last_modified):
+            state[page.url] = {'etag': page.etag, 'last_modified': page.last_modified}
+    if state_path:
+        write_json(state_path, state, indent=2)
+
+    changes = {
+        'ingested_at': time.strftime('%Y-%m-%dT%H:%M:%S'),
+        'feed': feed,
+        'pages': len(urls),
+        'not_modified': not_modified,
+        'items': len(items),
+        'new': new_ids,
+        'updated': updated_ids,
+        'changed': new_ids + updated_ids,
+    }
+    if changes_path:
+        write_json(changes_path, changes, ensure_ascii=False, indent=2)
+    return changes
+
@@ -0,0 +1,64 @@
+#!/usr/bin/env python3
+"""
+글 검색 (BM25 + 의미 검색 하이브리드)
+사용법:
+  python scripts/search-posts.py "인공지능과 교육" [-k 10] [--mode hybrid|lexical|semantic]
+  python scripts/search-posts.py              # 대화형 (같은 질의는 임베딩 캐시 사용)
+
+필요한 파일 (scripts/build-all.py 로 생성):
+  - public/data/search-index.npz (search 단계)
+  - public/data/ann-index.npz (embeddings 단계, 없으면 BM25만 사용)
+
+실제 처리는 hybrid_search.py 에 있습니다.
+"""
+
+import argparse
+import json
+import time
+
+from blog_data import OUTPUT_DIR
+from hybrid_search import DEFAULT_CANDIDATES, HybridSearch
+
+def parse_args():
+    parser = argparse.ArgumentParser(description='하이브리드 글 검색')
+    parser.add_argument('query', nargs='*', help='검색어 (없으면 대화형)')
+    parser.add_argument('-k', type=int, default=10)
+    parser.add_argument('--mode', choices=('hybrid', 'lexical', 'semantic'), default='hybrid')
+    parser.add_argument('--candidates', type=int, default=DEFAULT_CANDIDATES,
+                        help='BM25 / 의미 검색에서 각각 가져올 후보 수')
+    return parser.parse_args()
+
+def load_titles():
+    with open(OUTPUT_DIR / 'posts-light.json', 'r', encoding='utf-8') as f:
+        return {post['post_id']: post['title'] for post in json.load(f)['posts']}
+
+def show(search, titles, query, k, mode):
+    start = time.perf_counter()
+    results = search.search(query, k=k, mode=mode)
+    elapsed = (time.perf_counter() - start) * 1000
+    print(f"\n🔎 {query} ({len(results)}개, {elapsed:.1f}ms)")
+    for i, result in enumerate(results, 1):
+        ranks = f"BM25 {result['lexical'] or '-'} / 의미 {result['semantic'] or '-'}"
+        print(f"  {i:2}. {titles.get(result['id'], result['id'])}  ({ranks})")
+
+def main():
+    args = parse_args()
+    search = HybridSearch(OUTPUT_DIR, candidates=args.candidates)
+    titles = load_titles()
+
+    if args.query:
+        show(search, titles, ' '.join(args.query), args.k, args.mode)
+        return
+
+    print("검색어를 입력하세요 (빈 줄이면 종료)")
+    while True:
+        try:
+            query = input('> ').strip()
+        except EOFError:
+            break
+        if not query:
+            break
+        show(search, titles, query, args.k, args.mode)
+
+if __name__ == '__main__':
+    main()
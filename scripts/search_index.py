@@ -0,0 +1,202 @@
+"""
+로컬 전문 검색 인덱스 (제목 / 본문 앞부분 / 요약 / 키워드)
+
+한국어는 조사·어미가 붙어서 띄어쓰기 단위로는 잘 안 맞으므로,
+한글 등은 글자 2-gram, 영문/숫자는 단어 단위로 색인합니다.
+  '인공지능의 미래' -> 인공, 공지, 지능, 능의, 미래
+
+- 필드 가중치: 제목 3, 요약/키워드 2, 본문 1 (가중 tf 로 합산)
+- 역색인 posting: 문서 번호 차이(delta) + tf 를 varint로 압축
+- BM25 점수, NumPy 벡터 연산으로 질의당 수 ms
+
+  index = SearchIndex.load('public/data/search-index.npz')
+  index.search('인공지능 교육', k=10)  # [(post_id, score), ...]
+"""
+
+import re
+import unicodedata
+from collections import defaultdict
+from pathlib import Path
+
+import numpy as np
+
+SEARCH_INDEX_NPZ = 'search-index.npz'
+BODY_LIMIT = 1000  # 본문은 앞부분만 색인
+MAX_TERM_LENGTH = 24
+FIELD_WEIGHTS = {'title': 3, 'summary': 2, 'keywords': 2, 'body': 1}
+
+# BM25 파라미터
+K1 = 1.2
+B = 0.75
+
+# 영문/숫자 묶음과 그 밖의 글자 묶음을 나눔 ('2024년' -> '2024', '년')
+_WORD_RE = re.compile(r'[0-9a-z]+|[^\W0-9a-z_]+')
+
+
+def tokenize(text):
+    """정규화(NFKC, 소문자) 후 영문/숫자 단어는 그대로, 나머지는 글자 2-gram"""
+    if not text:
+        return []
+    text = unicodedata.normalize('NFKC', text).lower()
+    terms = []
+    for word in _WORD_RE.findall(text):
+        if word.isascii() or len(word) == 1:
+            terms.append(word[:MAX_TERM_LENGTH])
+        else:
+            terms.extend(word[i:i + 2] for i in range(len(word) - 1))
+    return terms
+
+
+def varint_encode(values):
+    """음이 아닌 정수 배열 -> LEB128 varint 바이트 (벡터 연산)"""
+    values = np.asarray(values, dtype=np.uint64)
+    nbytes = np.ones(len(values), dtype=np.int64)
+    for i in range(1, 10):
+        nbytes += values >= (np.uint64(1) << np.uint64(7 * i))
+    total = int(nbytes.sum())
+    starts = np.cumsum(nbytes) - nbytes
+    owner = np.repeat(np.arange(len(values)), nbytes)
+    position = np.arange(total) - starts[owner]
+    out = (values[owner] >> (np.uint64(7) * position.astype(np.uint64))) & np.uint64(0x7F)
+    out |= (position < nbytes[owner] - 1).astype(np.uint64) << np.uint64(7)
+    return out.astype(np.uint8)
+
+
+def varint_decode(buf):
+    """varint 바이트 -> 정수 배열 (int64)"""
+    buf = np.asarray(buf, dtype=np.uint8)
+    if not len(buf):
+        return np.zeros(0, dtype=np.int64)
+    ends = np.flatnonzero(buf < 0x80)
+    starts = np.concatenate(([0], ends[:-1] + 1))
+    owner = np.repeat(np.arange(len(ends)), ends - starts + 1)
+    shift = (7 * (np.arange(len(buf)) - starts[owner])).astype(np.uint64)
+    parts = (buf.astype(np.uint64) & np.uint64(0x7F)) << shift
+    return np.bitwise_or.reduceat(parts, starts).astype(np.int64)
+
+
+class SearchIndexBuilder:
+    """글/요약을 받아 역색인 생성 (term -> {문서 번호: 가중 tf})"""
+
+    def __init__(self):
+        self.post_ids = []
+        self.row_of = {}
+        self.doc_len = []
+        self.postings = defaultdict(dict)
+
+    def _add_terms(self, row, text, weight):
+        terms = tokenize(text)
+        for term in terms:
+            docs = self.postings[term]
+            docs[row] = docs.get(row, 0) + weight
+        self.doc_len[row] += weight * len(terms)
+
+    def add(self, post_id, title, body):
+        row = len(self.post_ids)
+        self.post_ids.append(post_id)
+        self.row_of[post_id] = row
+        self.doc_len.append(0)
+        self._add_terms(row, title, FIELD_WEIGHTS['title'])
+        self._add_terms(row, (body or '')[:BODY_LIMIT], FIELD_WEIGHTS['body'])
+
+    def add_summary(self, post_id, summary, keywords):
+        """요약/키워드 (색인에 없는 글이면 무시)"""
+        row = self.row_of.get(post_id)
+        if row is None:
+            return False
+        self._add_terms(row, summary, FIELD_WEIGHTS['summary'])
+        self._add_terms(row, keywords, FIELD_WEIGHTS['keywords'])
+        return True
+
+    def build(self):
+        terms = sorted(self.postings)
+        df = np.zeros(len(terms), dtype=np.int32)
+        doc_chunks, tf_chunks = [], []
+        for i, term in enumerate(terms):
+            docs = self.postings[term]
+            rows = np.fromiter(sorted(docs), dtype=np.int64, count=len(docs))
+            df[i] = len(rows)
+            doc_chunks.append(np.diff(rows, prepend=0))
+            tf_chunks.append(np.fromiter((docs[r] for r in rows), dtype=np.int64, count=len(rows)))
+
+        # 용어별 경계는 posting 개수 -> 바이트 오프셋으로 변환
+        bounds = np.concatenate(([0], np.cumsum(df, dtype=np.int64)))
+        doc_blob, doc_offsets = _encode_chunks(doc_chunks, bounds)
+        tf_blob, tf_offsets = _encode_chunks(tf_chunks, bounds)
+        return SearchIndex(
+            post_ids=np.array(self.post_ids, dtype=str),
+            terms=np.array(terms, dtype=str),
+            df=df,
+            doc_offsets=doc_offsets, doc_blob=doc_blob,
+            tf_offsets=tf_offsets, tf_blob=tf_blob,
+            doc_len=np.array(self.doc_len, dtype=np.float32),
+        )
+
+
+def _encode_chunks(chunks, bounds):
+    values = np.concatenate(chunks) if chunks else np.zeros(0, dtype=np.int64)
+    blob = varint_encode(values)
+    byte_ends = np.flatnonzero(blob < 0x80) + 1
+    offsets = np.concatenate(([0], byte_ends))[bounds]
+    return blob, offsets.astype(np.int64)
+
+
+class SearchIndex:
+    """BM25 역색인 (npz 하나로 저장)"""
+
+    FIELDS = ('post_ids', 'terms', 'df', 'doc_offsets', 'doc_blob', 'tf_offsets', 'tf_blob', 'doc_len')
+
+    def __init__(self, **arrays):
+        for field in self.FIELDS:
+            setattr(self, field, arrays[field])
+        n = len(self.post_ids)
+        avgdl = float(self.doc_len.mean()) if n else 1.0
+        # 문서 길이 정규화 항은 질의와 무관하므로 미리 계산
+        self._norm = K1 * (1 - B + B * self.doc_len / max(avgdl, 1e-9))
+        self._idf = np.log(1 + (n - self.df + 0.5) / (self.df + 0.5))
+
+    def __len__(self):
+        return len(self.post_ids)
+
+    def save(self, path):
+        path = Path(path)
+        tmp_path = path.with_suffix('.tmp.npz')
+        np.savez(tmp_path, **{field: getattr(self, field) for field in self.FIELDS})
+        tmp_path.replace(path)
+
+    @classmethod
+    def load(cls, path):
+        with np.load(path, allow_pickle=False) as data:
+            return cls(**{field: data[field] for field in cls.FIELDS})
+
+    def term_id(self, term):
+        i = int(np.searchsorted(self.terms, term))
+        if i < len(self.terms) and self.terms[i] == term:
+            return i
+        return None
+
+    def postings(self, term_id):
+        """용어 하나의 (문서 번호 배열, tf 배열)"""
+        docs = varint_decode(self.doc_blob[self.doc_offsets[term_id]:self.doc_offsets[term_id + 1]])
+        tfs = varint_decode(self.tf_blob[self.tf_offsets[term_id]:self.tf_offsets[term_id + 1]])
+        return np.cumsum(docs), tfs
+
+    def scores(self, query):
+        """질의 -> 문서별 BM25 점수 배열 (N)"""
+        scores = np.zeros(len(self.post_ids), dtype=np.float64)
+        for term in set(tokenize(query)):
+            term_id = self.term_id(term)
+            if term_id is None:
+                continue
+            docs, tfs = self.postings(term_id)
+            scores[docs] += self._idf[term_id] * tfs * (K1 + 1) / (tfs + self._norm[docs])
+        return scores
+
+    def search(self, query, k=10):
+        """[(post_id, score)] 점수 높은 순"""
+        scores = self.scores(query)
+        hits = np.flatnonzero(scores)
+        if len(hits) > k:
+            hits = hits[np.argpartition(-scores[hits], k - 1)[:k]]
+        hits = hits[np.lexsort((hits, -scores[hits]))]
+        return [(str(self.post_ids[i]), round(float(scores[i]), 4)) for i in hits]
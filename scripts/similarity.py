@@ -0,0 +1,254 @@
+"""
+유사도 계산 엔진
+
+임베딩 행렬을 한 번만 정규화한 뒤 블록 단위 행렬곱 + argpartition으로
+모든 글의 Top-K 유사 글을 구합니다. 블록 크기(block_size)만큼의 행만
+한 번에 계산하므로 메모리 사용량은 block_size x N 으로 제한됩니다.
+
+후보를 고른 뒤 점수는 기존 cosine_similarity로 다시 계산하므로
+중복 묶음이 없으면(groups=None 이거나 near-duplicates.json 이 비어 있으면)
+similarity-matrix.json 결과는 예전 구현과 바이트 단위로 동일합니다.
+
+similarity-matrix.bin (CSR 형식, 리틀 엔디언):
+  header   b'SIMCSR01' + uint32 행 수 + uint32 전체 이웃 수 (16바이트)
+  offsets  int32[행 수 + 1]   행 i의 이웃 = [offsets[i], offsets[i+1])
+  indices  int32[이웃 수]     이웃의 행 번호
+  scores   float16[이웃 수]   유사도
+similarity-ids.json 은 행 순서대로의 post_id 목록입니다.
+한 글의 이웃은 offsets 두 칸과 해당 구간만 읽으면 됩니다.
+
+groups(행별 묶음 번호, near-duplicates.json 의 중복 묶음)를 주면 자기 묶음의 글은 빼고
+다른 묶음에서도 가장 비슷한 글 하나만 남깁니다. 근사 사본이 많은 글도 서로 다른 이웃 k개를 갖습니다.
+embeddings 단계는 항상 groups 를 넘기므로, 중복 묶음이 있으면 similarity-matrix.json/.bin 의
+행은 예전 top-k 와 다릅니다 (같은 묶음의 글은 서로의 이웃에 없고, 다른 묶음도 하나씩만 나옴).
+"""
+
+import json
+from pathlib import Path
+
+import numpy as np
+
+DEFAULT_K = 10
+DEFAULT_BLOCK_SIZE = 1024
+
+# 행렬곱 점수와 기존 방식 점수의 오차 허용치 (float32 반올림 차이)
+CANDIDATE_EPS = 1e-5
+
+SIMILARITY_BIN = 'similarity-matrix.bin'
+SIMILARITY_IDS_JSON = 'similarity-ids.json'
+CSR_MAGIC = b'SIMCSR01'
+CSR_HEADER_SIZE = 16
+
+
+def cosine_similarity(a, b):
+    """코사인 유사도 계산"""
+    return np.dot(a, b) / (np.linalg.norm(a) * np.linalg.norm(b))
+
+
+def normalize(embeddings):
+    """행별 L2 정규화 (0 벡터는 그대로 둠)"""
+    embeddings = np.asarray(embeddings, dtype=np.float32)
+    norms = np.linalg.norm(embeddings, axis=1, keepdims=True)
+    norms[norms == 0] = 1.0
+    return embeddings / norms
+
+
+def _select_top_k(embeddings, post_ids, row, cand_idx, approx, k, groups=None):
+    """근사 점수로 후보를 추린 뒤 정확한 점수로 Top-K 정렬
+
+    cand_idx는 오름차순 인덱스 배열이어야 기존 구현과 동점 순서가 같습니다.
+    자기 자신(row)은 cand_idx에 없거나 approx가 -inf여야 합니다.
+    groups를 주면 자기 묶음은 빼고 묶음마다 하나만 남깁니다 (모자라면 후보를 늘려 다시 고름).
+    """
+    if groups is not None:
+        keep = groups[cand_idx] != groups[row]
+        cand_idx, approx = cand_idx[keep], approx[keep]
+
+    target = embeddings[row]
+    want = k
+    while True:
+        picked = cand_idx
+        if len(cand_idx) > want:
+            kth = np.partition(approx, len(approx) - want)[len(approx) - want]
+            picked = cand_idx[approx >= kth - CANDIDATE_EPS]
+
+        scores = [
+            (int(j), float(cosine_similarity(target, embeddings[j])))
+            for j in picked if j != row
+        ]
+        # 기존 구현과 같은 안정 정렬 (동점이면 인덱스 순서 유지)
+        scores.sort(key=lambda x: x[1], reverse=True)
+        if groups is None:
+            break
+        seen = set()
+        scores = [(j, s) for j, s in scores if not (groups[j] in seen or seen.add(groups[j]))]
+        if len(scores) >= k or len(picked) == len(cand_idx):
+            break
+        want *= 2
+    return [{'id': post_ids[j], 'score': round(s, 4)} for j, s in scores[:k]]
+
+
+def duplicate_groups(post_ids, canonical):
+    """{post_id: 대표 post_id} -> 행별 묶음 번호 (묶음에 없는 글은 자기 행 번호)"""
+    index = {post_id: i for i, post_id in enumerate(post_ids)}
+    return np.array([index.get(canonical.get(post_id, post_id), i)
+                     for i, post_id in enumerate(post_ids)], dtype=np.int64)
+
+
+def top_k_similar(embeddings, post_ids, k=DEFAULT_K, block_size=DEFAULT_BLOCK_SIZE,
+                  rows=None, progress=None, groups=None):
+    """지정한 행(기본: 전체)의 Top-K 유사 글 목록
+
+    반환값은 similarity-matrix.json 항목과 같은 형태의 리스트입니다.
+    groups: duplicate_groups() 결과 (주면 중복 묶음을 접은 이웃 k개)
+    progress(done, total) 콜백으로 진행률을 받을 수 있습니다.
+    """
+    embeddings = np.asarray(embeddings)
+    normed = normalize(embeddings)
+    n = len(post_ids)
+    rows = np.arange(n) if rows is None else np.asarray(rows, dtype=np.int64)
+    all_idx = np.arange(n)
+
+    result = []
+    for start in range(0, len(rows), block_size):
+        block_rows = rows[start:start + block_size]
+        block_scores = normed[block_rows] @ normed.T
+        block_scores[np.arange(len(block_rows)), block_rows] = -np.inf
+
+        for row, approx in zip(block_rows, block_scores):
+            similar = _select_top_k(embeddings, post_ids, row, all_idx, approx, k, groups)
+            result.append({'id': post_ids[row], 'similar': similar})
+
+        if progress:
+            progress(min(start + block_size, len(rows)), len(rows))
+
+    return result
+
+
+def update_top_k_similar(previous, embeddings, post_ids, changed_ids,
+                         k=DEFAULT_K, block_size=DEFAULT_BLOCK_SIZE, progress=None, groups=None):
+    """이전 유사도 매트릭스에서 바뀐 행만 다시 계산
+
+    previous: 이전 similarity-matrix.json 리스트
+    changed_ids: 새로 추가되었거나 내용이 바뀐 post_id (중복 묶음이 바뀐 글도 포함해야 함)
+
+    - 바뀐 글, 이전 목록에 없던 글, 목록에 바뀐/삭제된 글이 있던 행은 전체 재계산
+    - 나머지 행은 (이전 Top-K ∪ 바뀐 글) 후보 안에서만 다시 고름
+
+    반환값: (similarity_matrix, 전체 재계산 행 수, 부분 갱신 행 수)
+    """
+    embeddings = np.asarray(embeddings)
+    normed = normalize(embeddings)
+    index = {post_id: i for i, post_id in enumerate(post_ids)}
+    prev_map = {entry['id']: entry['similar'] for entry in previous}
+
+    changed = set(changed_ids)
+    stale = changed | (set(prev_map) - set(index))
+    changed_idx = np.array(sorted(index[p] for p in changed if p in index), dtype=np.int64)
+
+    full_rows = []
+    merge_rows = []
+    for i, post_id in enumerate(post_ids):
+        similar = prev_map.get(post_id)
+        if post_id in changed or similar is None:
+            full_rows.append(i)
+        elif any(s['id'] in stale for s in similar):
+            full_rows.append(i)
+        else:
+            merge_rows.append(i)
+
+    rows = {}
+    for entry_row, entry in zip(full_rows, top_k_similar(
+            embeddings, post_ids, k=k, block_size=block_size,
+            rows=full_rows, progress=progress, groups=groups)):
+        rows[entry_row] = entry
+
+    if len(changed_idx) == 0:
+        for i in merge_rows:
+            rows[i] = {'id': post_ids[i], 'similar': prev_map[post_ids[i]]}
+    else:
+        for i in merge_rows:
+            prev_idx = [index[s['id']] for s in prev_map[post_ids[i]]]
+            cand_idx = np.union1d(np.array(prev_idx, dtype=np.int64), changed_idx)
+            cand_idx = cand_idx[cand_idx != i]
+            approx = normed[cand_idx] @ normed[i]
+            rows[i] = {
+                'id': post_ids[i],
+                'similar': _select_top_k(embeddings, post_ids, i, cand_idx, approx, k, groups),
+            }
+
+    return [rows[i] for i in range(len(post_ids))], len(full_rows), len(merge_rows)
+
+
+def save_similarity_csr(output_dir, similarity_matrix):
+    """similarity-matrix.json 리스트를 CSR 바이너리로 저장"""
+    output_dir = Path(output_dir)
+    post_ids = [entry['id'] for entry in similarity_matrix]
+    row_of = {post_id: i for i, post_id in enumerate(post_ids)}
+
+    counts = [len(entry['similar']) for entry in similarity_matrix]
+    offsets = np.zeros(len(post_ids) + 1, dtype='<i4')
+    np.cumsum(counts, out=offsets[1:])
+    indices = np.array(
+        [row_of[s['id']] for entry in similarity_matrix for s in entry['similar']],
+        dtype='<i4',
+    )
+    scores = np.array(
+        [s['score'] for entry in similarity_matrix for s in entry['similar']],
+        dtype='<f2',
+    )
+
+    bin_path = output_dir / SIMILARITY_BIN
+    tmp_path = bin_path.with_suffix('.bin.tmp')
+    with open(tmp_path, 'wb') as f:
+        f.write(CSR_MAGIC)
+        f.write(np.array([len(post_ids), len(indices)], dtype='<u4').tobytes())
+        f.write(offsets.tobytes())
+        f.write(indices.tobytes())
+        f.write(scores.tobytes())
+    tmp_path.replace(bin_path)
+
+    ids_path = output_dir / SIMILARITY_IDS_JSON
+    tmp_path = ids_path.with_suffix('.json.tmp')
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump(post_ids, f)
+    tmp_path.replace(ids_path)
+    return bin_path, ids_path
+
+
+class SimilarityCSR:
+    """similarity-matrix.bin 메모리 매핑 리더"""
+
+    def __init__(self, output_dir):
+        output_dir = Path(output_dir)
+        path = output_dir / SIMILARITY_BIN
+        with open(path, 'rb') as f:
+            header = f.read(CSR_HEADER_SIZE)
+        if header[:8] != CSR_MAGIC:
+            raise ValueError(f"CSR 파일 형식이 아닙니다: {path}")
+        n_rows, nnz = np.frombuffer(header[8:], dtype='<u4')
+
+        offset = CSR_HEADER_SIZE
+        self.offsets = np.memmap(path, dtype='<i4', mode='r', offset=offset, shape=(n_rows + 1,))
+        offset += 4 * (n_rows + 1)
+        self.indices = np.memmap(path, dtype='<i4', mode='r', offset=offset, shape=(nnz,)) if nnz else np.zeros(0, '<i4')
+        offset += 4 * nnz
+        self.scores = np.memmap(path, dtype='<f2', mode='r', offset=offset, shape=(nnz,)) if nnz else np.zeros(0, '<f2')
+
+        with open(output_dir / SIMILARITY_IDS_JSON, 'r', encoding='utf-8') as f:
+            self.post_ids = json.load(f)
+        self.row_of = {post_id: i for i, post_id in enumerate(self.post_ids)}
+
+    def __len__(self):
+        return len(self.post_ids)
+
+    def similar(self, post_id):
+        """[{'id': ..., 'score': ...}, ...] (없으면 빈 리스트)"""
+        row = self.row_of.get(post_id)
+        if row is None:
+            return []
+        start, end = self.offsets[row], self.offsets[row + 1]
+        return [
+            {'id': self.post_ids[j], 'score': round(float(score), 4)}
+            for j, score in zip(self.indices[start:end], self.scores[start:end])
+        ]
@@ -0,0 +1,119 @@
+"""
+정적 JSON 데이터 (posts-light / posts-meta / monthly-stats / categories / shards)
+
+글을 하나씩 받는 즉시 posts-light.json, posts-meta.json 임시 파일에 쓰고,
+월별 개수와 카테고리 계층은 같은 패스에서 누적합니다.
+글 목록을 메모리에 모으지 않으므로 메모리 사용량은 글 수와 무관합니다.
+commit() 때 모든 파일이 rename으로 한꺼번에 교체됩니다.
+월별/카테고리별 샤드(post_shards.py)는 내용이 바뀐 것만 교체됩니다.
+"""
+
+import json
+from collections import defaultdict
+from pathlib import Path
+
+from blog_data import month_key, split_category, write_json
+from json_stream import JsonArrayWriter
+from post_shards import PostShardWriter
+
+EXCERPT_LENGTH = 200
+
+
+class StaticDataBuilder:
+    """글 스트림 -> 정적 데이터 (스트리밍 쓰기)"""
+
+    def __init__(self, output_dir):
+        self.output_dir = Path(output_dir)
+        self.month_counts = defaultdict(int)
+        self.hierarchy = defaultdict(lambda: defaultdict(int))
+        self.light = JsonArrayWriter(self.output_dir / 'posts-light.json', prefix='{"posts": ')
+        self.meta = JsonArrayWriter(self.output_dir / 'posts-meta.json', indent=2)
+        self.shards = PostShardWriter(self.output_dir)
+
+    def add(self, post):
+        # 경량 목록 (pub_date 는 예전 publish_date 와 같은 날짜만 'YYYY-MM-DD')
+        light = {
+            'post_id': post.post_id,
+            'title': post.title,
+            'category': post.category,
+            'pub_date': post.pub_date[:10] if post.pub_date else post.pub_date,
+            'char_count': post.char_count,
+        }
+        self.light.write(light)
+
+        # 메타데이터 + 발췌 (본문이 있는 글만, /api/similar 등에서 사용)
+        if post.content:
+            excerpt = post.content[:EXCERPT_LENGTH].replace('\n', ' ')
+            self.meta.write({
+                'id': post.post_id,
+                'title': post.title,
+                'category': post.category,
+                'pub_date': post.pub_date,
+                'char_count': post.char_count,
+                'excerpt': excerpt,
+            })
+            self.shards.add({**light, 'excerpt': excerpt})
+        else:
+            self.shards.add(light)
+
+        # 월별 통계
+        year_month = month_key(post.pub_date)
+        if year_month:
+            self.month_counts[year_month] += 1
+
+        # 카테고리 계층
+        if post.category:
+            main, sub = split_category(post.category)
+            self.hierarchy[main][sub] += 1
+
+    def monthly_stats(self):
+        return [
+            {'yearMonth': ym, 'count': count}
+            for ym, count in sorted(self.month_counts.items())
+        ]
+
+    def categories(self):
+        """카테고리 계층 (map API 형식)"""
+        categories = []
+        for main, subs in self.hierarchy.items():
+            total = sum(subs.values())
+            sub_list = [
+                {'name': sub, 'count': count}
+                for sub, count in sorted(subs.items(), key=lambda x: -x[1])
+            ]
+            categories.append({
+                'main': main,
+                'total': total,
+                'subs': sub_list
+            })
+        categories.sort(key=lambda x: -x['total'])
+        return categories
+
+    def commit(self):
+        monthly_stats = self.monthly_stats()
+        categories = self.categories()
+
+        stats = {'totalPosts': self.light.count, 'years': 17}
+        self.light.commit(suffix=', "stats": ' + json.dumps(stats) + '}')
+        print(f"✅ posts-light.json 저장 ({self.light.count}개)")
+
+        self.meta.commit()
+        print(f"✅ posts-meta.json 저장 ({self.meta.count}개)")
+
+        write_json(self.output_dir / 'monthly-stats.json',
+                   {'monthlyStats': monthly_stats}, ensure_ascii=False)
+        print(f"✅ monthly-stats.json 저장 ({len(monthly_stats)}개월)")
+
+        write_json(self.output_dir / 'categories.json',
+                   {'categories': categories}, ensure_ascii=False)
+        print(f"✅ categories.json 저장 ({len(categories)}개 카테고리)")
+
+        written, unchanged, removed = self.shards.commit()
+        print(f"✅ shards/ 저장 (교체 {written}개, 변경 없음 {unchanged}개, 삭제 {removed}개)")
+
+    def discard(self):
+        """쓰던 임시 파일 삭제 (입력이 바뀌지 않아 건너뛸 때)"""
+        self.light.discard()
+        self.meta.discard()
+        self.shards.discard()
+
@@ -0,0 +1,246 @@
+"""
+타임라인 요약 제목 생성
+
+각 연도/분기/월별 글 제목들을 분석하여 하나의 요약 제목을 만듭니다.
+ANTHROPIC_API_KEY가 있으면 Claude API를, 없으면 가장 긴 제목을 사용합니다.
+
+API 호출은
+- 클라이언트 하나를 공유하고
+- 스레드 풀로 동시에(concurrency) 보내되 분당 요청 수(rate_limit)를 지키며
+- 기간 이름 + 제목 목록 해시로 .cache/timeline-summaries-cache.json 에 캐시해서
+  글이 바뀐 기간만 다시 요약합니다.
+StubClient를 넘기면 API 없이 같은 흐름을 시험할 수 있습니다. 스텁은 요청 수 제한을 받지 않고,
+캐시/결과도 실제 요약과 섞이지 않도록 .cache 아래 별도 파일(STUB_*_PATH)에 씁니다.
+"""
+
+import hashlib
+import json
+import os
+import threading
+import time
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+from types import SimpleNamespace
+
+from blog_data import CACHE_DIR, month_key, quarter_key, write_json
+
+# Anthropic API 사용 여부 (False면 첫 글 제목 사용)
+USE_AI = True
+
+try:
+    import anthropic
+    HAS_ANTHROPIC = True
+except ImportError:
+    HAS_ANTHROPIC = False
+
+MODEL = "claude-3-5-haiku-20241022"
+MAX_TITLES = 20
+DEFAULT_CONCURRENCY = 4
+DEFAULT_RATE_LIMIT = 50  # 분당 요청 수
+CACHE_PATH = CACHE_DIR / 'timeline-summaries-cache.json'
+STUB_CACHE_PATH = CACHE_DIR / 'timeline-summaries-stub-cache.json'
+STUB_OUTPUT_PATH = CACHE_DIR / 'timeline-summaries-stub.json'
+
+HEADERS = {
+    'year': "\n🗓️ 연도별 요약",
+    'quarter': "\n📅 분기별 요약",
+    'month': "\n📆 월별 요약",
+}
+
+
+def group_by_month(posts):
+    """(pub_date, title) 목록 -> 월별 제목 목록 (오래된 순)"""
+    monthly = defaultdict(list)
+    for pub_date, title in sorted(posts):
+        key = month_key(pub_date)
+        if key:
+            monthly[key].append(title)
+    return monthly
+
+
+def ai_enabled():
+    return USE_AI and HAS_ANTHROPIC and bool(os.getenv('ANTHROPIC_API_KEY'))
+
+
+def make_client():
+    """공유 Anthropic 클라이언트 (사용할 수 없으면 None)"""
+    if not ai_enabled():
+        return None
+    return anthropic.Anthropic(api_key=os.getenv('ANTHROPIC_API_KEY'))
+
+
+class StubClient:
+    """API 대신 쓰는 로컬 스텁 (messages.create 인터페이스만 흉내)"""
+
+    cache_namespace = 'stub'
+    rate_limited = False  # 로컬 호출이라 RateLimiter 를 거치지 않음
+
+    def __init__(self, delay=0.0):
+        self.delay = delay
+        self.calls = 0
+        self._lock = threading.Lock()
+        self.messages = self
+
+    def create(self, model, max_tokens, messages):
+        with self._lock:
+            self.calls += 1
+        time.sleep(self.delay)
+        titles = [line[2:] for line in messages[0]['content'].split('\n') if line.startswith('- ')]
+        text = f"[stub] {titles[0] if titles else ''}"
+        return SimpleNamespace(content=[SimpleNamespace(text=text)])
+
+
+class RateLimiter:
+    """분당 요청 수 제한 (요청 사이 최소 간격을 보장)"""
+
+    def __init__(self, per_minute):
+        self.interval = 60.0 / per_minute if per_minute else 0.0
+        self._lock = threading.Lock()
+        self._next = 0.0
+
+    def wait(self):
+        with self._lock:
+            now = time.monotonic()
+            start = max(now, self._next)
+            self._next = start + self.interval
+        if start > now:
+            time.sleep(start - now)
+
+
+def build_prompt(titles, period):
+    return f"""다음은 {period}에 작성된 블로그 글 제목들입니다:
+
+{chr(10).join(f'- {t}' for t in titles[:MAX_TITLES])}
+
+이 글들의 공통 주제나 분위기를 담은 짧은 요약 제목을 한 문장(10~20자)으로 만들어주세요.
+예시: "AI와 삶의 변화를 고민하다", "여행과 성찰의 시간", "글쓰기의 본질을 묻다"
+
+요약 제목만 출력하세요:"""
+
+
+def cache_key(titles, period, namespace=MODEL):
+    """프롬프트에 들어가는 내용(모델 + 기간 + 제목 목록)의 해시"""
+    payload = json.dumps([namespace, period, titles[:MAX_TITLES]], ensure_ascii=False)
+    return hashlib.sha1(payload.encode('utf-8')).hexdigest()
+
+
+def generate_summary_with_ai(client, titles: list[str], period: str) -> str | None:
+    """Claude API로 제목 요약 생성 (실패하면 None)"""
+    try:
+        response = client.messages.create(
+            model=MODEL,
+            max_tokens=100,
+            messages=[{"role": "user", "content": build_prompt(titles, period)}]
+        )
+        return response.content[0].text.strip()
+    except Exception as e:
+        print(f"⚠️ API 오류 ({period}): {e}")
+        return None
+
+
+def generate_simple_summary(titles: list[str], period: str) -> str:
+    """첫 글 제목을 요약으로 사용 (AI 없이)"""
+    if not titles:
+        return period
+    # 가장 긴 제목을 선택 (더 서술적일 가능성)
+    longest = max(titles[:5], key=len)
+    # 30자 이상이면 자르기
+    if len(longest) > 30:
+        longest = longest[:27] + "..."
+    return longest
+
+
+def collect_periods(monthly):
+    """요약할 기간 목록 [(kind, key, label, titles)] (연도 -> 분기 -> 월 순)"""
+    periods = []
+
+    # 연도별
+    yearly = defaultdict(list)
+    for period, titles in monthly.items():
+        yearly[period[:4]].extend(titles)
+    for year, titles in sorted(yearly.items()):
+        periods.append(('year', year, f"{year}년", titles))
+
+    # 분기별 (5개 이상인 분기만)
+    quarterly = defaultdict(list)
+    for period, titles in monthly.items():
+        quarterly[quarter_key(period)].extend(titles)
+    for quarter, titles in sorted(quarterly.items()):
+        if len(titles) >= 5:
+            periods.append(('quarter', quarter, quarter, titles))
+
+    # 월별 (10개 이상인 월만)
+    for period, titles in sorted(monthly.items()):
+        if len(titles) >= 10:
+            periods.append(('month', period, period, titles))
+
+    return periods
+
+
+def summarize_periods(periods, client=None, concurrency=DEFAULT_CONCURRENCY,
+                      rate_limit=DEFAULT_RATE_LIMIT, cache_path=CACHE_PATH):
+    """기간별 요약 -> {key: summary}
+
+    client가 없으면 가장 긴 제목을 사용합니다.
+    """
+    if client is None:
+        return {key: generate_simple_summary(titles, label) for _, key, label, titles in periods}
+
+    cache = {}
+    if cache_path and os.path.exists(cache_path):
+        with open(cache_path, 'r', encoding='utf-8') as f:
+            cache = json.load(f)
+
+    namespace = getattr(client, 'cache_namespace', MODEL)
+    results = {}
+    pending = []
+    for _, key, label, titles in periods:
+        digest = cache_key(titles, label, namespace)
+        if digest in cache:
+            results[key] = cache[digest]
+        else:
+            pending.append((key, label, titles, digest))
+    print(f"   캐시 {len(periods) - len(pending)}개, API 요청 {len(pending)}개")
+
+    limiter = RateLimiter(rate_limit if getattr(client, 'rate_limited', True) else 0)
+
+    def call(item):
+        key, label, titles, digest = item
+        limiter.wait()
+        return item, generate_summary_with_ai(client, titles, label)
+
+    with ThreadPoolExecutor(max_workers=max(1, concurrency)) as pool:
+        for (key, label, titles, digest), summary in pool.map(call, pending):
+            if summary is None:
+                results[key] = titles[0] if titles else label
+            else:
+                results[key] = cache[digest] = summary
+
+    if cache_path:
+        write_json(cache_path, cache, ensure_ascii=False, indent=2)
+    return results
+
+
+def build_timeline_summaries(monthly, client=None, concurrency=DEFAULT_CONCURRENCY,
+                             rate_limit=DEFAULT_RATE_LIMIT, cache_path=CACHE_PATH):
+    """월별 제목 목록 -> {기간: {'summary', 'count'}}"""
+    periods = collect_periods(monthly)
+    summaries_by_key = summarize_periods(
+        periods, client=client, concurrency=concurrency,
+        rate_limit=rate_limit, cache_path=cache_path,
+    )
+
+    summaries = {}
+    kind = None
+    for period_kind, key, label, titles in periods:
+        if period_kind != kind:
+            kind = period_kind
+            print(HEADERS[kind])
+        summary = summaries_by_key[key]
+        summaries[key] = {
+            'summary': summary,
+            'count': len(titles)
+        }
+        print(f"   {key}: {summary} ({len(titles)}개)")
+
+    return summaries
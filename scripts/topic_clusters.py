@@ -0,0 +1,283 @@
+"""
+임베딩 주제 군집 (topics.json / topic-assignments.npy / topic-centroids.npy)
+
+손으로 관리하는 category 문자열과 별개로, 임베딩을 비지도 군집으로 묶습니다.
+  - 구면(spherical) mini-batch k-means: 정규화한 벡터를 배치 단위로만 읽어 중심을 갱신하고
+    (k-means++ 초기화는 샘플에서), 할당도 블록 단위로 하므로 글 수가 10만 개를 넘어도
+    메모리는 배치/블록 크기 + 중심 행렬만큼만 씁니다 (embeddings.npy 는 메모리 매핑).
+  - 군집 이름은 제목의 c-TF-IDF 상위 단어 (군집 안에서 자주, 다른 군집에서는 드물게 나오는 단어).
+
+중심과 할당은 .cache/topics-cache.npz 에 저장됩니다. 다음 실행에서 새 글/내용이 바뀐 글이
+적으면 다시 군집하지 않고 기존 중심 중 가장 가까운 곳에 배정한 뒤 그 중심만 조금 옮깁니다.
+
+저장 파일:
+  topics.json            {'method', 'clusters', 'posts', 'topics': [{'id', 'size', 'terms', 'label',
+                          'representatives': [{'id', 'title', 'score'}], 'members': [post_id, ...]}]}
+  topic-assignments.npy  int32 (N,) 군집 번호, embeddings-ids.json 행 순서
+  topic-centroids.npy    float32 (k, D) 정규화한 중심
+"""
+
+import re
+import unicodedata
+from collections import Counter
+from pathlib import Path
+
+import numpy as np
+
+from blog_data import CACHE_DIR, write_json
+from embedding_store import _save_npy
+from similarity import normalize
+
+TOPICS_JSON = 'topics.json'
+TOPIC_ASSIGNMENTS_NPY = 'topic-assignments.npy'
+TOPIC_CENTROIDS_NPY = 'topic-centroids.npy'
+TOPICS_CACHE_FILE = 'topics-cache.npz'
+TOPICS_CACHE_PATH = CACHE_DIR / TOPICS_CACHE_FILE
+
+MIN_CLUSTERS = 2
+MAX_CLUSTERS = 150
+BATCH_SIZE = 2048
+MAX_ITER = 300
+TOLERANCE = 1e-4
+INIT_SAMPLE = 20  # k-means++ 초기화 샘플 = 군집 수 x 이 값
+BLOCK_SIZE = 8192
+MAX_NEW_FRACTION = 0.2  # 새 글이 이보다 많으면 전체 재군집
+LABEL_TERMS = 5
+REPRESENTATIVES = 3
+
+_WORD_RE = re.compile(r'[0-9a-z]+|[^\W0-9a-z_]+')
+_JOSA = ('에서', '으로', '에게', '은', '는', '이', '가', '을', '를', '의', '에', '와', '과', '로', '도')
+
+
+def default_clusters(n):
+    """글 수에 맞춘 군집 수 (sqrt(N/2), MIN_CLUSTERS ~ MAX_CLUSTERS)"""
+    return int(np.clip(round(np.sqrt(n / 2)), MIN_CLUSTERS, MAX_CLUSTERS)) if n else 0
+
+
+def _rows(X, rows):
+    """memmap 에서 행 묶음을 읽어 정규화 (읽기를 순차에 가깝게 정렬된 행으로)"""
+    return normalize(np.asarray(X[np.sort(rows)], dtype=np.float32))
+
+
+def assign(X, centroids, block_size=BLOCK_SIZE):
+    """블록 단위 최근접 중심 -> (군집 번호 int32, 코사인 유사도 float32)"""
+    labels = np.empty(len(X), dtype=np.int32)
+    scores = np.empty(len(X), dtype=np.float32)
+    for start in range(0, len(X), block_size):
+        sims = normalize(np.asarray(X[start:start + block_size], dtype=np.float32)) @ centroids.T
+        labels[start:start + block_size] = sims.argmax(axis=1)
+        scores[start:start + block_size] = sims.max(axis=1)
+    return labels, scores
+
+
+def _cluster_sums(labels, vectors, k):
+    """군집별 벡터 합 (one-hot 행렬곱, np.add.at 보다 빠름)"""
+    onehot = np.zeros((len(labels), k), dtype=np.float32)
+    onehot[np.arange(len(labels)), labels] = 1
+    return onehot.T @ vectors
+
+
+def kmeans_plus_plus(sample, k, rng):
+    """구면 k-means++ 초기 중심 (거리 = 1 - 코사인)"""
+    centroids = np.empty((k, sample.shape[1]), dtype=np.float32)
+    centroids[0] = sample[rng.integers(len(sample))]
+    distance = np.maximum(1 - sample @ centroids[0], 0)
+    for j in range(1, k):
+        total = distance.sum()
+        pick = rng.choice(len(sample), p=distance / total) if total > 0 else rng.integers(len(sample))
+        centroids[j] = sample[pick]
+        distance = np.minimum(distance, np.maximum(1 - sample @ centroids[j], 0))
+    return centroids
+
+
+def minibatch_kmeans(X, k, batch_size=BATCH_SIZE, max_iter=MAX_ITER, tol=TOLERANCE, seed=0):
+    """구면 mini-batch k-means -> (중심 (k, D) 정규화, 중심별 누적 샘플 수)
+
+    배치마다 각 중심을 배정된 점들의 평균 쪽으로 1/누적 수 만큼 옮긴 뒤 다시 정규화합니다
+    (Sculley 2010 의 갱신을 중심 단위로 묶은 형태).
+    """
+    rng = np.random.default_rng(seed)
+    n = len(X)
+    k = min(k, n)
+    sample = _rows(X, rng.choice(n, size=min(n, k * INIT_SAMPLE), replace=False))
+    centroids = kmeans_plus_plus(sample, k, rng)
+    counts = np.zeros(k, dtype=np.int64)
+
+    for _ in range(max_iter):
+        batch = _rows(X, rng.choice(n, size=min(n, batch_size), replace=False))
+        labels = (batch @ centroids.T).argmax(axis=1)
+        batch_counts = np.bincount(labels, minlength=k)
+        sums = _cluster_sums(labels, batch, k)
+
+        hit = batch_counts > 0
+        counts[hit] += batch_counts[hit]
+        previous = centroids.copy()
+        centroids[hit] += (sums[hit] - batch_counts[hit, None] * centroids[hit]) / counts[hit, None]
+        centroids = normalize(centroids)
+        if np.abs(centroids - previous).max() < tol:
+            break
+    return centroids, counts
+
+
+def title_terms(title):
+    """제목 -> 군집 이름 후보 단어 (NFKC 소문자, 두 글자 이상, 숫자만인 단어 제외, 흔한 조사 제거)"""
+    text = unicodedata.normalize('NFKC', title or '').lower()
+    terms = []
+    for word in _WORD_RE.findall(text):
+        if not word.isascii():
+            for josa in _JOSA:
+                if word.endswith(josa) and len(word) - len(josa) >= 2:
+                    word = word[:-len(josa)]
+                    break
+        if len(word) >= 2 and not word.isdigit():
+            terms.append(word)
+    return terms
+
+
+def ctfidf_labels(titles, labels, k, top=LABEL_TERMS):
+    """군집별 c-TF-IDF 상위 단어 [[단어, ...], ...]
+
+    w(t, c) = tf(t, c) / |c| * log(1 + A / f(t))
+    |c| 는 군집 c 의 단어 수, A 는 군집당 평균 단어 수, f(t) 는 전체에서 t 의 빈도
+    """
+    counts = [Counter() for _ in range(k)]
+    for title, label in zip(titles, labels):
+        counts[label].update(title_terms(title))
+    vocab = sorted({term for counter in counts for term in counter})
+    if not vocab:
+        return [[] for _ in range(k)]
+    term_id = {term: i for i, term in enumerate(vocab)}
+    tf = np.zeros((k, len(vocab)), dtype=np.float32)
+    for c, counter in enumerate(counts):
+        for term, count in counter.items():
+            tf[c, term_id[term]] = count
+
+    words = tf.sum(axis=1)
+    average = words.mean()
+    idf = np.log(1 + average / np.maximum(tf.sum(axis=0), 1))
+    weights = tf / np.maximum(words, 1)[:, None] * idf
+    result = []
+    for c in range(k):
+        best = np.argsort(-weights[c], kind='stable')[:top]
+        result.append([vocab[i] for i in best if weights[c, i] > 0])
+    return result
+
+
+class TopicCache:
+    """post_id / 내용 해시 / 군집 번호 + 중심 (새 글 배정용)"""
+
+    def __init__(self, path=TOPICS_CACHE_PATH):
+        self.path = Path(path) if path else None
+        self.assignments = {}
+        self.centroids = self.counts = None
+        if self.path and self.path.exists():
+            data = np.load(self.path, allow_pickle=False)
+            for post_id, digest, label in zip(data['post_ids'], data['hashes'], data['labels']):
+                self.assignments[str(post_id)] = (str(digest), int(label))
+            self.centroids, self.counts = data['centroids'], data['counts']
+
+    def save(self, post_ids, hashes, labels, centroids, counts):
+        if not self.path:
+            return
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = self.path.with_suffix('.tmp.npz')
+        np.savez(
+            tmp_path,
+            post_ids=np.array(post_ids, dtype=str), hashes=np.array(hashes, dtype=str),
+            labels=np.asarray(labels, dtype=np.int32),
+            centroids=np.asarray(centroids, dtype=np.float32), counts=np.asarray(counts, dtype=np.int64),
+        )
+        tmp_path.replace(self.path)
+
+
+def compute_topics(embeddings, post_ids, hashes, n_clusters=None, full=False,
+                   cache_path=TOPICS_CACHE_PATH, seed=0):
+    """임베딩 -> (군집 번호, 중심과의 유사도, 중심)
+
+    캐시의 중심이 같은 차원이고 (군집 수를 지정했다면 같은 수) 새 글이 MAX_NEW_FRACTION 이하면
+    새 글만 배정합니다. 군집 수를 지정하지 않으면 글 수가 늘어도 재군집 전까지 기존 수를 유지합니다.
+    """
+    cache = TopicCache(cache_path)
+    k = min(n_clusters or default_clusters(len(post_ids)), len(post_ids))
+
+    known = [
+        i for i, (post_id, digest) in enumerate(zip(post_ids, hashes))
+        if cache.assignments.get(post_id, (None,))[0] == digest
+    ]
+    new_count = len(post_ids) - len(known)
+    incremental = (not full and cache.centroids is not None and known
+                   and cache.centroids.shape[1] == embeddings.shape[1]
+                   and (n_clusters is None or len(cache.centroids) == k)
+                   and new_count <= MAX_NEW_FRACTION * len(post_ids))
+
+    if not incremental:
+        print(f"   전체 군집 ({len(post_ids)}개 -> {k}개 주제, mini-batch k-means)")
+        centroids, counts = minibatch_kmeans(embeddings, k, seed=seed)
+        labels, scores = assign(embeddings, centroids)
+    else:
+        print(f"   기존 배정 {len(known)}개 유지, 새로 배정 {new_count}개")
+        centroids, counts = cache.centroids.copy(), cache.counts.copy()
+        labels, _ = assign(embeddings, centroids)
+        scores = np.empty(len(post_ids), dtype=np.float32)
+        kept = np.array(known, dtype=np.int64)
+        labels[kept] = [cache.assignments[post_ids[i]][1] for i in known]
+
+        # 새 글만큼 그 중심을 옮김 (mini-batch 갱신과 같은 규칙), 이후 유사도는 다시 계산
+        new_rows = np.setdiff1d(np.arange(len(post_ids)), kept)
+        if len(new_rows):
+            vectors = _rows(embeddings, new_rows)
+            new_labels = labels[new_rows]
+            batch_counts = np.bincount(new_labels, minlength=len(centroids))
+            sums = _cluster_sums(new_labels, vectors, len(centroids))
+            hit = batch_counts > 0
+            counts[hit] += batch_counts[hit]
+            centroids[hit] += (sums[hit] - batch_counts[hit, None] * centroids[hit]) / counts[hit, None]
+            centroids = normalize(centroids)
+        for start in range(0, len(post_ids), BLOCK_SIZE):
+            block = normalize(np.asarray(embeddings[start:start + BLOCK_SIZE], dtype=np.float32))
+            scores[start:start + BLOCK_SIZE] = (block * centroids[labels[start:start + BLOCK_SIZE]]).sum(axis=1)
+
+    cache.save(post_ids, hashes, labels, centroids, counts)
+    return labels, scores, centroids
+
+
+def save_topics(output_dir, posts, labels, scores, centroids):
+    """topics.json / topic-assignments.npy / topic-centroids.npy 저장 -> 주제 수
+
+    posts: [(post_id, title)] (embeddings-ids.json 과 같은 순서)
+    """
+    output_dir = Path(output_dir)
+    k = len(centroids)
+    terms = ctfidf_labels([title for _, title in posts], labels, k)
+    members = [[] for _ in range(k)]
+    for row, label in enumerate(labels):
+        members[label].append(row)
+
+    topics = []
+    for c in range(k):
+        if not members[c]:
+            continue
+        rows = np.array(members[c])
+        best = rows[np.argsort(-scores[rows], kind='stable')[:REPRESENTATIVES]]
+        topics.append({
+            'id': c,
+            'size': len(rows),
+            'terms': terms[c],
+            'label': ' · '.join(terms[c][:3]) or f'주제 {c}',
+            'representatives': [
+                {'id': posts[r][0], 'title': posts[r][1], 'score': round(float(scores[r]), 4)}
+                for r in best
+            ],
+            'members': [posts[r][0] for r in rows],
+        })
+    topics.sort(key=lambda topic: -topic['size'])
+
+    _save_npy(output_dir / TOPIC_ASSIGNMENTS_NPY, np.asarray(labels, dtype=np.int32))
+    _save_npy(output_dir / TOPIC_CENTROIDS_NPY, np.asarray(centroids, dtype=np.float32))
+    write_json(output_dir / TOPICS_JSON, {
+        'method': 'minibatch-kmeans',
+        'clusters': len(topics),
+        'posts': len(posts),
+        'topics': topics,
+    }, ensure_ascii=False)
+    return len(topics)
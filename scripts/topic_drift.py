@@ -0,0 +1,227 @@
+"""
+주제 흐름 타임라인 (topic-drift.json)
+
+API 없이 임베딩만으로 기간별 흐름을 계산합니다 (timeline-summaries.json 의 로컬 대안).
+  - 월별 중심: 정규화한 임베딩을 월 단위로 합산 (블록마다 one-hot 행렬곱)
+    분기/연도 중심은 월 합계를 다시 더해서 구함
+  - drift:     같은 단위의 바로 전 기간 중심과의 코사인 거리 (1 - cos)
+  - novelty:   그 이전 모든 기간 중심 중 가장 가까운 것과의 거리 (처음 보는 주제일수록 큼)
+  - coherence: 단위 벡터 평균의 길이 (글들이 한 주제에 모여 있을수록 1에 가까움)
+  - 대표 글:   기간 중심과 가장 가까운 REPRESENTATIVES개, 가장 가까운 글 제목이 요약(summary)
+
+월 합계와 기간별 대표 글은 .cache/drift-cache.npz 에 월/기간 내용 해시와 함께 저장됩니다.
+다음 실행에서는 글이 바뀐 월만 임베딩을 다시 읽고, 대표 글도 그 월이 속한 분기/연도만 다시 고릅니다.
+
+저장 파일: public/data/topic-drift.json
+  {'order': {'year': [...], 'quarter': [...], 'month': [...]},
+   'periods': {'2024-03': {'kind', 'count', 'summary', 'drift', 'novelty', 'coherence',
+                           'representatives': [{'id', 'title', 'score'}]}},
+   'largestShifts': {'year': [...], 'quarter': [...], 'month': [...]}}
+periods 의 각 값은 timeline-summaries.json 과 같은 {summary, count} 를 포함합니다.
+"""
+
+import hashlib
+from collections import defaultdict
+from pathlib import Path
+
+import numpy as np
+
+from blog_data import CACHE_DIR, month_key, quarter_key, write_json
+from similarity import normalize
+
+TOPIC_DRIFT_JSON = 'topic-drift.json'
+DRIFT_CACHE_FILE = 'drift-cache.npz'
+DRIFT_CACHE_PATH = CACHE_DIR / DRIFT_CACHE_FILE
+KINDS = ('year', 'quarter', 'month')
+REPRESENTATIVES = 3
+LARGEST_SHIFTS = 5
+BLOCK_SIZE = 8192
+
+
+def period_keys(month):
+    """'YYYY-MM' -> {'year', 'quarter', 'month'} 기간 키"""
+    return {'year': month[:4], 'quarter': quarter_key(month), 'month': month}
+
+
+def _digest(parts):
+    digest = hashlib.sha1()
+    for part in parts:
+        digest.update(part.encode('utf-8'))
+        digest.update(b'\x1f')
+    return digest.hexdigest()
+
+
+def _group_sums(X, rows, groups, n_groups, block_size=BLOCK_SIZE):
+    """rows 행을 정규화해 groups 번호별로 합산 -> (n_groups, D) float64"""
+    sums = np.zeros((n_groups, X.shape[1]), dtype=np.float64)
+    for start in range(0, len(rows), block_size):
+        block = normalize(np.asarray(X[rows[start:start + block_size]], dtype=np.float32))
+        onehot = np.zeros((len(block), n_groups), dtype=np.float32)
+        onehot[np.arange(len(block)), groups[start:start + block_size]] = 1
+        sums += onehot.T @ block
+    return sums
+
+
+class DriftCache:
+    """월별 (해시, 합계, 글 수) + 기간별 (해시, 대표 글 id, 점수)"""
+
+    def __init__(self, path=DRIFT_CACHE_PATH):
+        self.path = Path(path) if path else None
+        self.months = {}
+        self.representatives = {}
+        if self.path and self.path.exists():
+            data = np.load(self.path, allow_pickle=False)
+            for month, digest, total, count in zip(data['months'], data['month_hashes'],
+                                                   data['sums'], data['counts']):
+                self.months[str(month)] = (str(digest), total, int(count))
+            for key, digest, ids, scores in zip(data['rep_keys'], data['rep_hashes'],
+                                                data['rep_ids'], data['rep_scores']):
+                kept = [str(post_id) for post_id in ids if post_id]
+                self.representatives[str(key)] = (str(digest), kept, scores[:len(kept)].tolist())
+
+    def save(self):
+        if not self.path:
+            return
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        months = sorted(self.months)
+        keys = sorted(self.representatives)
+        dim = len(next(iter(self.months.values()))[1]) if months else 0
+        rep_ids = np.full((len(keys), REPRESENTATIVES), '', dtype=object)
+        rep_scores = np.zeros((len(keys), REPRESENTATIVES), dtype=np.float32)
+        for i, key in enumerate(keys):
+            _, ids, scores = self.representatives[key]
+            rep_ids[i, :len(ids)] = ids
+            rep_scores[i, :len(scores)] = scores
+        tmp_path = self.path.with_suffix('.tmp.npz')
+        np.savez(
+            tmp_path,
+            months=np.array(months, dtype=str),
+            month_hashes=np.array([self.months[m][0] for m in months], dtype=str),
+            sums=np.array([self.months[m][1] for m in months], dtype=np.float64).reshape(-1, dim),
+            counts=np.array([self.months[m][2] for m in months], dtype=np.int64),
+            rep_keys=np.array(keys, dtype=str),
+            rep_hashes=np.array([self.representatives[k][0] for k in keys], dtype=str),
+            rep_ids=rep_ids.astype(str).reshape(len(keys), REPRESENTATIVES),
+            rep_scores=rep_scores,
+        )
+        tmp_path.replace(self.path)
+
+
+def _series(keys, centroids):
+    """같은 단위 기간들 (시간 순) -> (drift, novelty) 목록 (첫 기간은 None)"""
+    sims = centroids @ centroids.T
+    drift, novelty = [None], [None]
+    for i in range(1, len(keys)):
+        drift.append(round(float(1 - sims[i, i - 1]), 4))
+        novelty.append(round(float(1 - sims[i, :i].max()), 4))
+    return drift, novelty
+
+
+def compute_drift(embeddings, posts, hashes, full=False, cache_path=DRIFT_CACHE_PATH):
+    """임베딩 -> topic-drift.json 내용
+
+    posts: [(post_id, title, pub_date)] (embeddings-ids.json 과 같은 순서)
+    """
+    cache = DriftCache(cache_path)
+    month_rows = defaultdict(list)
+    for row, (_, _, pub_date) in enumerate(posts):
+        month = month_key(pub_date)
+        if month:
+            month_rows[month].append(row)
+    months = sorted(month_rows)
+    month_hashes = {
+        month: _digest(f"{posts[row][0]}:{hashes[row]}" for row in month_rows[month])
+        for month in months
+    }
+
+    # 1. 바뀐 월만 임베딩을 읽어 합계 갱신
+    dirty = [m for m in months if full or cache.months.get(m, (None,))[0] != month_hashes[m]]
+    print(f"   {len(months)}개 월 중 {len(dirty)}개 월 다시 계산")
+    if dirty:
+        rows = np.concatenate([month_rows[m] for m in dirty])
+        groups = np.concatenate([np.full(len(month_rows[m]), i) for i, m in enumerate(dirty)])
+        read_order = np.argsort(rows, kind='stable')  # memmap 을 순서대로 읽도록
+        sums = _group_sums(embeddings, rows[read_order], groups[read_order], len(dirty))
+        for i, month in enumerate(dirty):
+            cache.months[month] = (month_hashes[month], sums[i], len(month_rows[month]))
+    cache.months = {m: cache.months[m] for m in months}
+
+    # 2. 월 합계 -> 분기/연도 합계, 중심, drift / novelty / coherence
+    members = {kind: defaultdict(list) for kind in KINDS}
+    for month in months:
+        for kind, key in period_keys(month).items():
+            members[kind][key].append(month)
+    order = {kind: sorted(members[kind]) for kind in KINDS}
+    periods = {}
+    centroids = {}
+    for kind in KINDS:
+        sums = np.array([sum(cache.months[m][1] for m in members[kind][key]) for key in order[kind]])
+        counts = np.array([sum(cache.months[m][2] for m in members[kind][key]) for key in order[kind]])
+        norms = np.linalg.norm(sums, axis=1) if len(sums) else np.zeros(0)
+        kind_centroids = normalize(sums.astype(np.float32)) if len(sums) else sums
+        drift, novelty = _series(order[kind], kind_centroids) if len(sums) else ([], [])
+        centroids[kind] = kind_centroids
+        for i, key in enumerate(order[kind]):
+            periods[key] = {
+                'kind': kind,
+                'count': int(counts[i]),
+                'drift': drift[i],
+                'novelty': novelty[i],
+                'coherence': round(float(norms[i] / counts[i]), 4),
+            }
+
+    # 3. 대표 글: 내용이 바뀐 기간만 그 기간의 글을 중심과 비교
+    period_hashes = {
+        key: _digest(month_hashes[m] for m in members[kind][key])
+        for kind in KINDS for key in order[kind]
+    }
+    stale = {key for key, digest in period_hashes.items()
+             if full or cache.representatives.get(key, (None,))[0] != digest}
+    stale_months = sorted({m for kind in KINDS for key in order[kind] if key in stale
+                           for m in members[kind][key]})
+    if stale_months:
+        rows = np.sort(np.concatenate([month_rows[m] for m in stale_months]))
+        scores = {kind: np.empty(len(rows), dtype=np.float32) for kind in KINDS}
+        keys = {kind: [period_keys(month_key(posts[row][2]))[kind] for row in rows] for kind in KINDS}
+        index = {kind: {key: i for i, key in enumerate(order[kind])} for kind in KINDS}
+        targets = {kind: np.array([index[kind][key] for key in keys[kind]]) for kind in KINDS}
+        for start in range(0, len(rows), BLOCK_SIZE):
+            block = normalize(np.asarray(embeddings[rows[start:start + BLOCK_SIZE]], dtype=np.float32))
+            for kind in KINDS:
+                target = centroids[kind][targets[kind][start:start + BLOCK_SIZE]]
+                scores[kind][start:start + BLOCK_SIZE] = (block * target).sum(axis=1)
+        for kind in KINDS:
+            by_key = defaultdict(list)
+            for i, key in enumerate(keys[kind]):
+                if key in stale:
+                    by_key[key].append(i)
+            for key, idx in by_key.items():
+                idx = np.array(idx)
+                best = idx[np.argsort(-scores[kind][idx], kind='stable')[:REPRESENTATIVES]]
+                cache.representatives[key] = (
+                    period_hashes[key],
+                    [posts[rows[i]][0] for i in best],
+                    [float(scores[kind][i]) for i in best],
+                )
+    cache.representatives = {key: cache.representatives[key] for key in period_hashes}
+    cache.save()
+
+    titles = {post_id: title for post_id, title, _ in posts}
+    for key, period in periods.items():
+        _, ids, scores = cache.representatives[key]
+        period['representatives'] = [
+            {'id': post_id, 'title': titles.get(post_id, ''), 'score': round(score, 4)}
+            for post_id, score in zip(ids, scores)
+        ]
+        period['summary'] = period['representatives'][0]['title'] if ids else key
+
+    largest = {
+        kind: [key for key in sorted(order[kind], key=lambda k: -(periods[k]['drift'] or 0))
+               if periods[key]['drift'] is not None][:LARGEST_SHIFTS]
+        for kind in KINDS
+    }
+    return {'order': order, 'periods': periods, 'largestShifts': largest}
+
+
+def save_drift(output_dir, result):
+    write_json(Path(output_dir) / TOPIC_DRIFT_JSON, result, ensure_ascii=False)
@@ -1,9 +1,88 @@
+import { promises as fs } from 'fs';
+import path from 'path';
 import { NextResponse } from 'next/server';
 import { getAllKeywords, getPostsByKeyword } from '@/lib/firebase-db';
 
+// 키워드 통계는 scripts/pipeline.py 의 keywords 단계가 미리 만든 public/data/keywords/ 를 읽음
+// - (없음)               전체 키워드 {keywords: [{keyword, count}]}
+// - ?year=2024           연도별 상위 키워드
+// - ?category=사유        주 카테고리별 상위 키워드
+// - ?related=키워드       함께 자주 나온 키워드 {keyword, related: [{keyword, count}]}
+// - ?keyword=키워드       해당 키워드의 글 목록 (Firestore)
+// 정적 파일이 없으면 전체 통계는 예전처럼 Firestore summaries 를 훑어 세고,
+// 연도/카테고리/related 는 빈 목록과 keywords 단계를 실행하라는 error 를 돌려줍니다.
+
+type KeywordRow = [string, number];
+
+interface Cooccurrence {
+  posts: number;
+  keywords: string[];
+  counts: number[];
+  indptr: number[];
+  indices: number[];
+  values: number[];
+  pairs: [number, number, number, number][];
+}
+
+const keywordsDir = () => path.join(process.cwd(), 'public/data/keywords');
+
+const cache = new Map<string, Promise<unknown>>();
+
+function loadFile<T>(name: string): Promise<T> {
+  let promise = cache.get(name);
+  if (!promise) {
+    promise = fs
+      .readFile(path.join(keywordsDir(), name), 'utf-8')
+      .then(text => JSON.parse(text))
+      .catch(error => {
+        cache.delete(name);
+        throw error;
+      });
+    cache.set(name, promise);
+  }
+  return promise as Promise<T>;
+}
+
+const MISSING = 'Keyword files not found. Run scripts/build-all.py (keywords stage) first.';
+
+const isMissing = (error: unknown) => (error as NodeJS.ErrnoException)?.code === 'ENOENT';
+
+const toStats = (rows: KeywordRow[]) => rows.map(([keyword, count]) => ({ keyword, count }));
+
+// scripts/keyword_stats.py 의 split_keywords + normalize_keyword 와 같은 정리
+// (NFC, 공백 정리, 앞뒤 #/따옴표/마침표 제거, 대소문자 무시)
+const STRIP = '#"\'“”‘’`·.';
+
+function normalizeKeyword(keyword: string): string {
+  let text = keyword.normalize('NFC').replace(/\s+/g, ' ').trim();
+  let start = 0;
+  let end = text.length;
+  while (start < end && STRIP.includes(text[start])) start++;
+  while (end > start && STRIP.includes(text[end - 1])) end--;
+  text = text.slice(start, end).trim();
+  return text.toLowerCase();
+}
+
+async function relatedKeywords(keyword: string) {
+  const matrix = await loadFile<Cooccurrence>('cooccurrence.json');
+  const key = normalizeKeyword(keyword);
+  const row = matrix.keywords.findIndex(k => normalizeKeyword(k) === key);
+  if (row < 0) {
+    return [];
+  }
+  const related = [];
+  for (let p = matrix.indptr[row]; p < matrix.indptr[row + 1]; p++) {
+    related.push({ keyword: matrix.keywords[matrix.indices[p]], count: matrix.values[p] });
+  }
+  return related;
+}
+
 export async function GET(request: Request) {
   const { searchParams } = new URL(request.url);
   const keyword = searchParams.get('keyword');
+  const year = searchParams.get('year');
+  const category = searchParams.get('category');
+  const related = searchParams.get('related');
 
   try {
     if (keyword) {
@@ -12,9 +91,35 @@ export async function GET(request: Request) {
       return NextResponse.json({ posts });
     }
 
+    if (related) {
+      try {
+        return NextResponse.json({ keyword: related, related: await relatedKeywords(related) });
+      } catch (error) {
+        if (!isMissing(error)) throw error;
+        return NextResponse.json({ keyword: related, related: [], error: MISSING });
+      }
+    }
+
+    if (year || category) {
+      try {
+        const groups = await loadFile<Record<string, KeywordRow[]>>(
+          year ? 'by-year.json' : 'by-category.json'
+        );
+        return NextResponse.json({ keywords: toStats(groups[(year || category) as string] || []) });
+      } catch (error) {
+        if (!isMissing(error)) throw error;
+        return NextResponse.json({ keywords: [], error: MISSING });
+      }
+    }
+
     // 전체 키워드 통계
-    const keywords = await getAllKeywords();
-    return NextResponse.json({ keywords });
+    try {
+      const { keywords } = await loadFile<{ keywords: KeywordRow[] }>('global.json');
+      return NextResponse.json({ keywords: toStats(keywords) });
+    } catch {
+      const keywords = await getAllKeywords();
+      return NextResponse.json({ keywords });
+    }
   } catch (error) {
     console.error('API Error:', error);
     return NextResponse.json({ error: 'Database error' }, { status: 500 });
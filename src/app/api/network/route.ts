@@ -1,127 +1,78 @@
-import { NextResponse } from 'next/server';
-import { promises as fs } from 'fs';
+import { createReadStream, promises as fs } from 'fs';
 import path from 'path';
-
-interface Node {
-  id: string;
-  title: string;
-  category: string;
-  year: string;
-  pub_date?: string;
-  connections?: number;
-}
-
-interface Link {
-  source: string;
-  target: string;
-  weight: number;
+import { Readable } from 'stream';
+import { NextRequest, NextResponse } from 'next/server';
+
+// scripts/pipeline.py 의 network 단계가 미리 만든 그래프를 그대로 스트리밍
+// - ?window=recent (기본) | year-2024 | category-0 ... (public/data/network/index.json 참고)
+// - ?window=index 면 구간 목록을 반환
+// 노드 연결 수, 간선 중복 제거/임계값 필터링은 빌드 때 끝나 있습니다.
+
+interface NetworkWindow {
+  key: string;
+  label: string;
+  file: string;
+  posts: number;
+  connections: number;
 }
 
-interface PostMeta {
-  id: string;
-  title: string;
-  category: string;
-  pub_date: string;
-  char_count: number;
+interface NetworkIndex {
+  edges: string;
+  minScore: number;
+  windows: NetworkWindow[];
 }
 
-interface SimilarityEntry {
-  id: string;
-  similar: { id: string; score: number }[];
-}
-
-export async function GET() {
-  try {
-    // 데이터 파일 경로
-    const dataDir = path.join(process.cwd(), 'public/data');
-
-    // 메타데이터 로드
-    const metaPath = path.join(dataDir, 'posts-meta.json');
-    const metaData = await fs.readFile(metaPath, 'utf-8');
-    const posts: PostMeta[] = JSON.parse(metaData);
-
-    // 유사도 매트릭스 로드
-    const simPath = path.join(dataDir, 'similarity-matrix.json');
-    const simData = await fs.readFile(simPath, 'utf-8');
-    const similarities: SimilarityEntry[] = JSON.parse(simData);
-
-    // 유사도 맵 생성
-    const simMap = new Map<string, SimilarityEntry['similar']>();
-    for (const entry of similarities) {
-      simMap.set(entry.id, entry.similar);
-    }
-
-    // 노드 생성 (최근 1000개만 시각화, 성능 위해)
-    const recentPosts = posts.slice(0, 1000);
-    const postIdSet = new Set(recentPosts.map(p => p.id));
+const networkDir = () => path.join(process.cwd(), 'public/data/network');
 
-    const nodes: Node[] = [];
-    const connectionCount = new Map<string, number>();
+let indexPromise: Promise<NetworkIndex> | null = null;
 
-    for (const post of recentPosts) {
-      nodes.push({
-        id: post.id,
-        title: post.title,
-        category: post.category || '미분류',
-        year: post.pub_date?.slice(0, 4) || '미상',
-        pub_date: post.pub_date,
+function loadIndex(): Promise<NetworkIndex> {
+  if (!indexPromise) {
+    indexPromise = fs
+      .readFile(path.join(networkDir(), 'index.json'), 'utf-8')
+      .then(text => JSON.parse(text) as NetworkIndex)
+      .catch(error => {
+        indexPromise = null;
+        throw error;
       });
-    }
-
-    // 링크 생성 (유사도 0.5 이상인 것만)
-    const links: Link[] = [];
-    const linkSet = new Set<string>();
-
-    for (const post of recentPosts) {
-      const similar = simMap.get(post.id) || [];
-
-      for (const sim of similar) {
-        // 유사도 임계값
-        if (sim.score < 0.5) continue;
-
-        // 대상이 현재 시각화 범위 내에 있는지 확인
-        if (!postIdSet.has(sim.id)) continue;
-
-        // 중복 링크 방지
-        const linkKey = [post.id, sim.id].sort().join('-');
-        if (linkSet.has(linkKey)) continue;
-        linkSet.add(linkKey);
+  }
+  return indexPromise;
+}
 
-        links.push({
-          source: post.id,
-          target: sim.id,
-          weight: sim.score,
-        });
+export async function GET(request: NextRequest) {
+  const key = request.nextUrl.searchParams.get('window') || 'recent';
 
-        // 연결 수 카운트
-        connectionCount.set(post.id, (connectionCount.get(post.id) || 0) + 1);
-        connectionCount.set(sim.id, (connectionCount.get(sim.id) || 0) + 1);
-      }
+  try {
+    const index = await loadIndex();
+    if (key === 'index') {
+      return NextResponse.json(index);
     }
 
-    // 노드에 연결 수 추가
-    for (const node of nodes) {
-      node.connections = connectionCount.get(node.id) || 0;
+    const window = index.windows.find(w => w.key === key);
+    if (!window) {
+      return NextResponse.json(
+        { error: `Unknown window: ${key}`, windows: index.windows.map(w => w.key) },
+        { status: 404 }
+      );
     }
 
-    return NextResponse.json({
-      nodes,
-      links,
-      stats: {
-        posts: nodes.length,
-        connections: links.length,
-        totalPosts: posts.length,
+    const filePath = path.join(networkDir(), window.file);
+    const { size } = await fs.stat(filePath);
+    const body = Readable.toWeb(createReadStream(filePath)) as ReadableStream<Uint8Array>;
+    return new Response(body, {
+      headers: {
+        'Content-Type': 'application/json; charset=utf-8',
+        'Content-Length': String(size),
       },
     });
   } catch (error) {
     console.error('Network API Error:', error);
 
-    // 파일이 없으면 기존 키워드 기반으로 폴백
     return NextResponse.json({
       nodes: [],
       links: [],
       stats: { posts: 0, connections: 0, totalPosts: 0 },
-      error: 'Data files not found. Run generate-local-embeddings.py first.',
+      error: 'Data files not found. Run scripts/build-all.py (network stage) first.',
     });
   }
 }
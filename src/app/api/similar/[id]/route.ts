@@ -1,18 +1,5 @@
 import { NextRequest, NextResponse } from 'next/server';
-import { promises as fs } from 'fs';
-import path from 'path';
-
-interface PostMeta {
-  id: string;
-  title: string;
-  category: string;
-  pub_date: string;
-}
-
-interface SimilarityEntry {
-  id: string;
-  similar: { id: string; score: number }[];
-}
+import { getPostMeta, getSimilar } from '@/lib/similarity-store';
 
 export async function GET(
   request: NextRequest,
@@ -20,32 +7,18 @@ export async function GET(
 ) {
   try {
     const { id } = await params;
-    const dataDir = path.join(process.cwd(), 'public/data');
 
-    // 유사도 매트릭스 로드
-    const simPath = path.join(dataDir, 'similarity-matrix.json');
-    const simData = await fs.readFile(simPath, 'utf-8');
-    const similarities: SimilarityEntry[] = JSON.parse(simData);
-
-    // 해당 글의 유사 글 찾기
-    const entry = similarities.find(s => s.id === id);
-    if (!entry) {
+    // 해당 글의 유사 글 찾기 (CSR 바이너리에서 해당 행만 읽음)
+    const similar = await getSimilar(id);
+    if (!similar) {
       return NextResponse.json({ similar: [] });
     }
 
-    // 메타데이터 로드
-    const metaPath = path.join(dataDir, 'posts-meta.json');
-    const metaData = await fs.readFile(metaPath, 'utf-8');
-    const posts: PostMeta[] = JSON.parse(metaData);
-
-    // 메타데이터 맵 생성
-    const postMap = new Map<string, PostMeta>();
-    for (const post of posts) {
-      postMap.set(post.id, post);
-    }
+    // 메타데이터 맵 (프로세스당 한 번 로드)
+    const { byId: postMap } = await getPostMeta();
 
     // 유사 글 정보 조합
-    const similarPosts = entry.similar
+    const similarPosts = similar
       .filter(s => s.score >= 0.4) // 유사도 0.4 이상
       .slice(0, 10)
       .map(s => {
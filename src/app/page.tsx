@@ -14,6 +14,46 @@ const cache: {
   categories: null,
 };
 
+// 월별/카테고리별 샤드 (scripts/post_shards.py)
+// 월 하나, 카테고리 하나를 볼 때는 posts-light.json 전체 대신 해당 샤드만 받습니다.
+interface ShardEntry {
+  key: string;
+  file: string;
+  count: number;
+  bytes: number;
+}
+
+interface ShardManifest {
+  total: number;
+  months: ShardEntry[];
+  categories: ShardEntry[];
+}
+
+let shardManifest: Promise<ShardManifest> | null = null;
+const shardCache = new Map<string, Promise<Post[]>>();
+
+function loadShard(kind: 'months' | 'categories', key: string): Promise<Post[]> {
+  const cacheKey = `${kind}:${key}`;
+  let promise = shardCache.get(cacheKey);
+  if (!promise) {
+    if (!shardManifest) {
+      shardManifest = fetch('/data/shards/manifest.json').then(r => r.json());
+    }
+    promise = shardManifest
+      .then(manifest => {
+        const entry = manifest[kind].find(e => e.key === key);
+        return entry ? fetch(`/data/shards/${entry.file}`).then(r => r.json()) : [];
+      })
+      .catch(error => {
+        shardManifest = null;
+        shardCache.delete(cacheKey);
+        throw error;
+      });
+    shardCache.set(cacheKey, promise);
+  }
+  return promise;
+}
+
 // 타입 정의
 interface Post {
   id: number;
@@ -85,9 +125,15 @@ export default function BrainExplorer() {
 
   // 초기 데이터 로드
   useEffect(() => {
-    // 타임라인 요약 데이터 로드
+    // 타임라인 요약 데이터 로드 (없으면 임베딩 기반 topic-drift.json 의 기간별 대표 글 제목)
     fetch('/data/timeline-summaries.json')
-      .then(r => r.json())
+      .then(r => {
+        if (!r.ok) throw new Error(String(r.status));
+        return r.json();
+      })
+      .catch(() => fetch('/data/topic-drift.json')
+        .then(r => r.json())
+        .then(data => data.periods as TimelineSummaries))
       .then(data => setTimelineSummaries(data))
       .catch(() => console.log('타임라인 요약 데이터 없음'));
 
@@ -176,14 +222,12 @@ export default function BrainExplorer() {
         setPosts(filterPosts(cache.posts));
       } else {
         setLoading(true);
-        fetch('/data/posts-light.json')
-          .then(r => r.json())
-          .then(data => {
-            const allPosts = data.posts || [];
-            cache.posts = allPosts;
-            setPosts(filterPosts(allPosts));
+        loadShard('categories', selectedMapCategory)
+          .then(shardPosts => {
+            setPosts(filterPosts(shardPosts));
             setLoading(false);
-          });
+          })
+          .catch(() => setLoading(false));
       }
     }
   }, [selectedSubCategory, selectedMapCategory, mapZoom]);
@@ -197,15 +241,12 @@ export default function BrainExplorer() {
         setLoading(false);
       } else {
         setLoading(true);
-        fetch('/data/posts-light.json')
-          .then(r => r.json())
-          .then(data => {
-            const allPosts = data.posts || [];
-            cache.posts = allPosts;
-            const filtered = allPosts.filter((p: Post) => p.pub_date?.startsWith(selectedMonth));
-            setPosts(filtered);
+        loadShard('months', selectedMonth)
+          .then(shardPosts => {
+            setPosts(shardPosts);
             setLoading(false);
-          });
+          })
+          .catch(() => setLoading(false));
       }
     }
   }, [selectedMonth, timelineZoom]);
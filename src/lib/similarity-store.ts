@@ -0,0 +1,193 @@
+import { promises as fs } from 'fs';
+import path from 'path';
+import { float16ToFloat32 } from './npy';
+
+// generate-local-embeddings.py 가 만든 유사도 데이터 조회
+// - similarity-matrix.bin: CSR (header 16B + int32 offsets + int32 indices + float16 scores)
+// - similarity-ids.json: 행 순서대로의 post_id
+// .bin 파일이 없으면 예전 similarity-matrix.json 으로 폴백합니다.
+// near-duplicates.json (pipeline.py 의 dedupe 단계)이 있으면 중복 묶음을 대표 글 하나로 접습니다.
+// id -> 행 번호 표와 메타데이터는 프로세스당 한 번만 읽습니다.
+
+export interface SimilarItem {
+  id: string;
+  score: number;
+}
+
+export interface PostMeta {
+  id: string;
+  title: string;
+  category: string;
+  pub_date: string;
+  char_count: number;
+}
+
+interface SimilarityEntry {
+  id: string;
+  similar: SimilarItem[];
+}
+
+interface CsrIndex {
+  kind: 'csr';
+  binPath: string;
+  ids: string[];
+  rowOf: Map<string, number>;
+  nRows: number;
+  nnz: number;
+}
+
+interface JsonIndex {
+  kind: 'json';
+  simMap: Map<string, SimilarItem[]>;
+}
+
+const HEADER_SIZE = 16;
+const MAGIC = 'SIMCSR01';
+
+const dataDir = () => path.join(process.cwd(), 'public/data');
+
+let indexPromise: Promise<CsrIndex | JsonIndex> | null = null;
+let metaPromise: Promise<{ posts: PostMeta[]; byId: Map<string, PostMeta> }> | null = null;
+let canonicalPromise: Promise<Map<string, string>> | null = null;
+
+function once<T>(get: () => Promise<T> | null, set: (p: Promise<T> | null) => void, load: () => Promise<T>): Promise<T> {
+  let promise = get();
+  if (!promise) {
+    promise = load().catch(error => {
+      set(null);
+      throw error;
+    });
+    set(promise);
+  }
+  return promise;
+}
+
+async function loadIndex(): Promise<CsrIndex | JsonIndex> {
+  const binPath = path.join(dataDir(), 'similarity-matrix.bin');
+  try {
+    const file = await fs.open(binPath, 'r');
+    try {
+      const header = Buffer.alloc(HEADER_SIZE);
+      await file.read(header, 0, HEADER_SIZE, 0);
+      if (header.toString('latin1', 0, 8) !== MAGIC) throw new Error('Invalid similarity-matrix.bin');
+      const ids: string[] = JSON.parse(
+        await fs.readFile(path.join(dataDir(), 'similarity-ids.json'), 'utf-8')
+      );
+      const rowOf = new Map<string, number>();
+      ids.forEach((id, i) => rowOf.set(id, i));
+      return {
+        kind: 'csr',
+        binPath,
+        ids,
+        rowOf,
+        nRows: header.readUInt32LE(8),
+        nnz: header.readUInt32LE(12),
+      };
+    } finally {
+      await file.close();
+    }
+  } catch (error) {
+    if ((error as NodeJS.ErrnoException).code !== 'ENOENT') throw error;
+  }
+
+  // 호환용: JSON 전체를 한 번 파싱해서 맵으로 보관
+  const simData = await fs.readFile(path.join(dataDir(), 'similarity-matrix.json'), 'utf-8');
+  const entries: SimilarityEntry[] = JSON.parse(simData);
+  return { kind: 'json', simMap: new Map<string, SimilarItem[]>(entries.map(e => [e.id, e.similar])) };
+}
+
+function getIndex() {
+  return once(() => indexPromise, p => { indexPromise = p; }, loadIndex);
+}
+
+function decodeRow(index: CsrIndex, indices: Buffer, scores: Buffer, count: number): SimilarItem[] {
+  const items: SimilarItem[] = [];
+  for (let i = 0; i < count; i++) {
+    items.push({
+      id: index.ids[indices.readInt32LE(i * 4)],
+      score: Math.round(float16ToFloat32(scores.readUInt16LE(i * 2)) * 1e4) / 1e4,
+    });
+  }
+  return items;
+}
+
+// post_id -> 중복 묶음의 대표 post_id (묶음에 든 글만)
+function getCanonical(): Promise<Map<string, string>> {
+  return once(() => canonicalPromise, p => { canonicalPromise = p; }, async () => {
+    const canonical = new Map<string, string>();
+    try {
+      const data = JSON.parse(
+        await fs.readFile(path.join(dataDir(), 'near-duplicates.json'), 'utf-8')
+      ) as { duplicates: { ids: string[] }[] };
+      for (const group of data.duplicates) {
+        group.ids.forEach(member => canonical.set(member, group.ids[0]));
+      }
+    } catch (error) {
+      if ((error as NodeJS.ErrnoException).code !== 'ENOENT') throw error;
+    }
+    return canonical;
+  });
+}
+
+// 이웃을 대표 글로 바꾸고, 자기 묶음은 빼고, 묶음마다 가장 높은 점수 하나만 남김
+// (빌드 때 이미 묶음마다 하나씩 k개를 저장하므로 여기서는 id를 대표로 바꾸는 것이 주 역할)
+function collapseDuplicates(id: string, items: SimilarItem[], canonical: Map<string, string>): SimilarItem[] {
+  if (canonical.size === 0) return items;
+  const seen = new Set([canonical.get(id) ?? id]);
+  const result: SimilarItem[] = [];
+  for (const item of items) {
+    const target = canonical.get(item.id) ?? item.id;
+    if (!seen.has(target)) {
+      seen.add(target);
+      result.push({ ...item, id: target });
+    }
+  }
+  return result;
+}
+
+// 한 글의 유사 글 목록 (중복 묶음은 대표 글 하나로)
+export async function getSimilar(id: string): Promise<SimilarItem[] | null> {
+  const [items, canonical] = await Promise.all([readSimilar(id), getCanonical()]);
+  return items && collapseDuplicates(id, items, canonical);
+}
+
+// 한 글의 유사 글 목록 (해당 행만 읽음)
+async function readSimilar(id: string): Promise<SimilarItem[] | null> {
+  const index = await getIndex();
+  if (index.kind === 'json') return index.simMap.get(id) ?? null;
+
+  const row = index.rowOf.get(id);
+  if (row === undefined) return null;
+
+  const offsetsStart = HEADER_SIZE;
+  const indicesStart = offsetsStart + 4 * (index.nRows + 1);
+  const scoresStart = indicesStart + 4 * index.nnz;
+
+  const file = await fs.open(index.binPath, 'r');
+  try {
+    const bounds = Buffer.alloc(8);
+    await file.read(bounds, 0, 8, offsetsStart + 4 * row);
+    const start = bounds.readInt32LE(0);
+    const count = bounds.readInt32LE(4) - start;
+    if (count <= 0) return [];
+
+    const indices = Buffer.alloc(4 * count);
+    const scores = Buffer.alloc(2 * count);
+    await Promise.all([
+      file.read(indices, 0, indices.length, indicesStart + 4 * start),
+      file.read(scores, 0, scores.length, scoresStart + 2 * start),
+    ]);
+    return decodeRow(index, indices, scores, count);
+  } finally {
+    await file.close();
+  }
+}
+
+// posts-meta.json (id -> 메타데이터)
+export function getPostMeta(): Promise<{ posts: PostMeta[]; byId: Map<string, PostMeta> }> {
+  return once(() => metaPromise, p => { metaPromise = p; }, async () => {
+    const metaData = await fs.readFile(path.join(dataDir(), 'posts-meta.json'), 'utf-8');
+    const posts: PostMeta[] = JSON.parse(metaData);
+    return { posts, byId: new Map<string, PostMeta>(posts.map(p => [p.id, p])) };
+  });
+}